@@ -1,5 +1,71 @@
+import threading
 from PyQt6 import QtWidgets, QtCore
 from styles import COMMON_STYLES
+from data_loader import clear_layout, show_loading
+from user_list_view import UserListView, UserListPager
+from bulk_import import import_users, write_error_report
+
+# Users fetched per page of the admin lists
+USER_PAGE_SIZE = 50
+
+
+def escape_like(text):
+    """Escapes LIKE wildcards so text is matched literally"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def fetch_users_page(supabase, user_type, search='', after=None, limit=USER_PAGE_SIZE):
+    """
+    Fetches one page of users of a type, in username order
+
+    Pages are keyset-paginated: pass the last username of the previous page
+    as after. The (user_type, username) and trigram indexes from
+    migrations/004_users_search_indexes.sql serve these queries.
+
+    Args:
+        supabase: Supabase client
+        user_type (str): 'Student' or 'Teacher'
+        search (str): Only users whose username contains this, ignoring case
+        after (str): Username the page starts after; None for the first page
+        limit (int): Page size
+
+    Returns:
+        tuple: (list of user dicts, estimated number of matching users; the
+        count is only requested for the first page and is None otherwise)
+    """
+    query = supabase.table('users') \
+        .select('username', count='estimated' if after is None else None) \
+        .eq('user_type', user_type)
+    if search:
+        query = query.ilike('username', f"%{escape_like(search)}%")
+    if after is not None:
+        query = query.gt('username', after)
+    response = query.order('username').limit(limit).execute()
+    return response.data, response.count
+
+
+class ImportProgress(QtCore.QObject):
+    """Relays a bulk import's progress from its worker thread to a progress dialog"""
+    progressed = QtCore.pyqtSignal(int, int, float)  # users added, rows rejected, fraction read
+
+    def __init__(self, dialog):
+        super().__init__(dialog)
+        self.dialog = dialog
+        self.stop = threading.Event()
+        dialog.canceled.connect(self.stop.set)
+        # Queued, since it is emitted from the worker thread
+        self.progressed.connect(self.show_progress)
+
+    def report(self, report, fraction):
+        """Progress callback for import_users(); runs on the worker thread"""
+        self.progressed.emit(report.added, len(report.errors), fraction)
+
+    @QtCore.pyqtSlot(int, int, float)
+    def show_progress(self, added, rejected, fraction):
+        # Stay below the maximum, which would close the dialog before the import ends
+        self.dialog.setValue(min(int(fraction * self.dialog.maximum()), self.dialog.maximum() - 1))
+        self.dialog.setLabelText(f"Added {added} users, {rejected} rows rejected")
+
 
 class AdminDashboard(QtWidgets.QWidget):
     def __init__(self, main_window):
@@ -55,8 +121,20 @@ class AdminDashboard(QtWidgets.QWidget):
 
     def logout(self):
         self.main_window.stackedWidget.setCurrentWidget(self.main_window.login_page)
+        # Free this dashboard; the next user to log in gets a fresh one
+        self.main_window.evict_page(self)
+    
+    def show_load_error(self, layout, message):
+        # Replace the loading placeholder with the error
+        clear_layout(layout)
+        error_label = QtWidgets.QLabel(message)
+        error_label.setStyleSheet("font-size: 14px; color: red; margin: 20px;")
+        layout.addWidget(error_label)
         
     def manage_students(self):
+        self.main_window.navigation.show_subpage(self, 'students', self.build_students_page, self.load_students)
+
+    def build_students_page(self):
         # Create a new widget to display all students
         self.students_widget = QtWidgets.QWidget()
         students_layout = QtWidgets.QVBoxLayout(self.students_widget)
@@ -80,171 +158,102 @@ class AdminDashboard(QtWidgets.QWidget):
         self.students_container_layout = QtWidgets.QVBoxLayout(self.students_container)
         students_layout.addWidget(self.students_container)
         
+        # Add "Add Student" button at the bottom; outside the container, so it
+        # is there even while the list is empty or reloading
+        add_student_btn = QtWidgets.QPushButton("+ Add New Student")
+        add_student_btn.setStyleSheet(COMMON_STYLES['primary_button'])
+        add_student_btn.setMinimumHeight(40)
+        add_student_btn.clicked.connect(self.add_new_student)
+        students_layout.addWidget(add_student_btn)
+        
+        import_students_btn = QtWidgets.QPushButton("Import Students from File...")
+        import_students_btn.setStyleSheet(COMMON_STYLES['secondary_button'])
+        import_students_btn.setMinimumHeight(40)
+        import_students_btn.clicked.connect(lambda: self.import_users_from_file('Student', self.load_students))
+        students_layout.addWidget(import_students_btn)
+        
         # Load students
         self.load_students()
         
         students_layout.addStretch()
-        self.main_window.stackedWidget.addWidget(self.students_widget)
-        self.main_window.stackedWidget.setCurrentWidget(self.students_widget)
+        return self.students_widget
     
     def load_students(self):
-        # Clear any existing content
-        while self.students_container_layout.count():
-            item = self.students_container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        try:
-            from supabase_connection import create_connection
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-            
-            # Fetch all students
-            response = supabase.table('users') \
-                .select('username') \
-                .eq('user_type', 'Student') \
-                .execute()
-            
-            data = response.data
-            if not data:
-                no_students_label = QtWidgets.QLabel("No students found in the system.")
-                no_students_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_students_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.students_container_layout.addWidget(no_students_label)
-                return
-            
-            # Add search
-            search_layout = QtWidgets.QHBoxLayout()
-            search_box = QtWidgets.QLineEdit()
-            search_box.setPlaceholderText("Search students...")
-            search_box.setStyleSheet("padding: 8px; border: 1px solid #ccc; border-radius: 4px;")
-            search_box.textChanged.connect(lambda text: self.filter_students(text, data))
-            
-            search_layout.addWidget(search_box)
-            self.students_container_layout.addLayout(search_layout)
-            
-            # Stats section
-            stats_widget = QtWidgets.QWidget()
-            stats_widget.setStyleSheet("background: #F8F9FA; border-radius: 8px; padding: 15px; margin-top: 10px;")
-            stats_layout = QtWidgets.QHBoxLayout(stats_widget)
-            
-            total_students = len(data)
-            
-            students_count = QtWidgets.QLabel(f"Total Students: {total_students}")
-            students_count.setStyleSheet("font-size: 14px; font-weight: bold;")
-            
-            stats_layout.addWidget(students_count)
-            stats_layout.addStretch()
-            
-            self.students_container_layout.addWidget(stats_widget)
-            
-            # Create a scroll area for the students
-            scroll_area = QtWidgets.QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_widget = QtWidgets.QWidget()
-            scroll_layout = QtWidgets.QVBoxLayout(scroll_widget)
-            scroll_layout.setSpacing(10)
-            
-            # Store the scroll layout and data for filtering
-            self.students_scroll_layout = scroll_layout
-            self.students_data = data
-            
-            self.display_students(data, scroll_layout)
-            
-            scroll_area.setWidget(scroll_widget)
-            self.students_container_layout.addWidget(scroll_area)
-            
-        except Exception as e:
-            error_label = QtWidgets.QLabel(f"Failed to fetch students: {str(e)}")
-            error_label.setStyleSheet("font-size: 14px; color: red; margin: 20px;")
-            self.students_container_layout.addWidget(error_label)
+        # Show a placeholder while the students are fetched in the background
+        show_loading(self.students_container_layout, "Loading students...")
+        self.main_window.data_loader.load(
+            self.students_container,
+            self.fetch_students,
+            self.render_students,
+            lambda e: self.show_load_error(self.students_container_layout, f"Failed to fetch students: {str(e)}")
+        )
     
-    def display_students(self, students_data, layout):
-        """Display the student cards in the layout"""
-        # Clear the layout first
-        while layout.count():
-            item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        for student in students_data:
-            student_card = QtWidgets.QWidget()
-            student_card.setStyleSheet('''
-                QWidget {
-                    background: white;
-                    border-radius: 10px;
-                    padding: 15px;
-                    margin: 5px;
-                    border: 1px solid #E0E0E0;
-                }
-                QWidget:hover {
-                    background: #F5F5F5;
-                }
-            ''')
-            card_layout = QtWidgets.QHBoxLayout(student_card)
-            
-            # Student info
-            info_layout = QtWidgets.QVBoxLayout()
-            username_label = QtWidgets.QLabel(f"Username: {student['username']}")
-            username_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
-            info_layout.addWidget(username_label)
-            
-            # Action buttons
-            buttons_layout = QtWidgets.QHBoxLayout()
-            
-            edit_btn = QtWidgets.QPushButton("Edit")
-            edit_btn.setStyleSheet(COMMON_STYLES['secondary_button'])
-            edit_btn.clicked.connect(lambda checked, s=student: self.edit_student(s))
-            
-            remove_btn = QtWidgets.QPushButton("Remove")
-            remove_btn.setStyleSheet('''
-                QPushButton {
-                    background-color: #FF5252;
-                    color: white;
-                    border: none;
-                    padding: 5px 10px;
-                    border-radius: 4px;
-                }
-                QPushButton:hover {
-                    background-color: #FF0000;
-                }
-            ''')
-            remove_btn.clicked.connect(lambda checked, s=student: self.remove_student(s))
-            
-            buttons_layout.addWidget(edit_btn)
-            buttons_layout.addWidget(remove_btn)
-            
-            card_layout.addLayout(info_layout)
-            card_layout.addStretch()
-            card_layout.addLayout(buttons_layout)
-            
-            layout.addWidget(student_card)
-        
-        # Add "Add Student" button at the bottom
-        add_student_btn = QtWidgets.QPushButton("+ Add New Student")
-        add_student_btn.setStyleSheet(COMMON_STYLES['primary_button'])
-        add_student_btn.setMinimumHeight(40)
-        add_student_btn.clicked.connect(self.add_new_student)
-        layout.addWidget(add_student_btn)
+    def fetch_students(self, search='', after=None, limit=USER_PAGE_SIZE):
+        """Fetches a page of student accounts. Runs on a worker thread."""
+        from supabase_connection import create_connection
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+        
+        return fetch_users_page(supabase, 'Student', search, after, limit)
     
-    def filter_students(self, search_text, students_data):
-        """Filter students based on search text"""
-        if not search_text:
-            # If search text is empty, show all students
-            self.display_students(students_data, self.students_scroll_layout)
+    def render_students(self, first_page):
+        clear_layout(self.students_container_layout)
+        data, _ = first_page
+        
+        if not data:
+            no_students_label = QtWidgets.QLabel("No students found in the system.")
+            no_students_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_students_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.students_container_layout.addWidget(no_students_label)
             return
         
-        # Filter students based on search text
-        filtered_students = []
-        search_text = search_text.lower()
-        
-        for student in students_data:
-            if search_text in student['username'].lower():
-                filtered_students.append(student)
-        
-        # Display filtered students
-        self.display_students(filtered_students, self.students_scroll_layout)
+        # Add search
+        search_layout = QtWidgets.QHBoxLayout()
+        search_box = QtWidgets.QLineEdit()
+        search_box.setPlaceholderText("Search students...")
+        search_box.setStyleSheet("padding: 8px; border: 1px solid #ccc; border-radius: 4px;")
+        search_box.textChanged.connect(self.filter_students)
+        
+        search_layout.addWidget(search_box)
+        self.students_container_layout.addLayout(search_layout)
+        
+        # Stats section
+        stats_widget = QtWidgets.QWidget()
+        stats_widget.setStyleSheet("background: #F8F9FA; border-radius: 8px; padding: 15px; margin-top: 10px;")
+        stats_layout = QtWidgets.QHBoxLayout(stats_widget)
+        
+        self.students_count_label = QtWidgets.QLabel()
+        self.students_count_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        
+        stats_layout.addWidget(self.students_count_label)
+        stats_layout.addStretch()
+        
+        self.students_container_layout.addWidget(stats_widget)
+        
+        # Only the rows in view are painted, and further pages are fetched
+        # as the list is scrolled, however many students there are
+        self.students_list = UserListView()
+        self.students_list.edit_requested.connect(self.edit_student)
+        self.students_list.remove_requested.connect(self.remove_student)
+        self.students_pager = UserListPager(self.students_list, self.main_window.data_loader,
+                                            self.fetch_students, USER_PAGE_SIZE)
+        self.students_pager.count_changed.connect(self.show_student_count)
+        self.students_pager.show_first_page(first_page)
+        self.students_container_layout.addWidget(self.students_list)
+    
+    def filter_students(self, search_text):
+        """Narrow the loaded students at once, then search the server once typing pauses"""
+        self.students_list.set_filter(search_text)
+        self.students_pager.search(search_text)
+    
+    def show_student_count(self, count):
+        # Estimated by the server, so large counts are approximate
+        count = "?" if count is None else count
+        if self.students_pager.search_text:
+            self.students_count_label.setText(f"Matching Students: {count}")
+        else:
+            self.students_count_label.setText(f"Total Students: {count}")
     
     def add_new_student(self):
         """Add a new student to the system"""
@@ -472,7 +481,79 @@ class AdminDashboard(QtWidgets.QWidget):
                 error.setStyleSheet("color: black;")  # Ensure text is visible
                 error.exec()
     
+    def import_users_from_file(self, user_type, reload):
+        """
+        Adds the users listed in a CSV or JSONL file, in the background
+
+        Args:
+            user_type (str): 'Student' or 'Teacher', for rows without a user_type
+            reload (callable): Reloads the page's list once the import ends
+        """
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, f"Import {user_type}s", "",
+            "User files (*.csv *.jsonl);;All files (*)")
+        if not path:
+            return
+        
+        dialog = QtWidgets.QProgressDialog(f"Importing {user_type.lower()}s...", "Stop", 0, 1000, self)
+        dialog.setWindowTitle(f"Import {user_type}s")
+        dialog.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.setStyleSheet("color: black;")  # Ensure text is visible
+        dialog.setValue(0)
+        relay = ImportProgress(dialog)
+        
+        def run_import():
+            from supabase_connection import create_connection
+            supabase = create_connection()
+            if not supabase:
+                raise Exception("Failed to connect to Supabase")
+            return import_users(supabase, path, user_type,
+                                progress=relay.report, cancelled=relay.stop.is_set)
+        
+        def finished(report):
+            dialog.close()
+            self.show_import_report(report)
+            reload()
+        
+        def failed(e):
+            dialog.close()
+            error = QtWidgets.QMessageBox(self)
+            error.setWindowTitle("Error")
+            error.setText(f"Failed to import {user_type.lower()}s: {str(e)}")
+            error.setIcon(QtWidgets.QMessageBox.Icon.Critical)
+            error.setStyleSheet("color: black;")  # Ensure text is visible
+            error.exec()
+            reload()
+        
+        # Never restarted like a page load, which would import the file twice
+        self.main_window.data_loader.run_once(run_import, finished, failed, owner=self)
+    
+    def show_import_report(self, report):
+        """Shows how an import went, with every rejected row and a way to save them"""
+        message = QtWidgets.QMessageBox(self)
+        message.setWindowTitle("Import Finished")
+        message.setText(report.summary())
+        message.setIcon(QtWidgets.QMessageBox.Icon.Warning if report.errors else QtWidgets.QMessageBox.Icon.Information)
+        message.setStyleSheet("color: black;")  # Ensure text is visible
+        save_btn = None
+        if report.errors:
+            message.setDetailedText("\n".join(f"Line {line}: {username or '(no username)'}: {error}"
+                                              for line, username, error in report.errors))
+            save_btn = message.addButton("Save Error Report...", QtWidgets.QMessageBox.ButtonRole.ActionRole)
+        message.addButton(QtWidgets.QMessageBox.StandardButton.Ok)
+        message.exec()
+        
+        if save_btn is not None and message.clickedButton() is save_btn:
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Error Report", "import_errors.csv",
+                                                            "CSV files (*.csv)")
+            if path:
+                write_error_report(path, report.errors)
+    
     def manage_teachers(self):
+        self.main_window.navigation.show_subpage(self, 'teachers', self.build_teachers_page, self.load_teachers)
+
+    def build_teachers_page(self):
         # Create a new widget to display teachers
         self.teachers_widget = QtWidgets.QWidget()
         teachers_layout = QtWidgets.QVBoxLayout(self.teachers_widget)
@@ -496,176 +577,108 @@ class AdminDashboard(QtWidgets.QWidget):
         self.teachers_container_layout = QtWidgets.QVBoxLayout(self.teachers_container)
         teachers_layout.addWidget(self.teachers_container)
         
+        # Add "Add Teacher" button at the bottom; outside the container, so it
+        # is there even while the list is empty or reloading
+        add_teacher_btn = QtWidgets.QPushButton("+ Add New Teacher")
+        add_teacher_btn.setStyleSheet(COMMON_STYLES['primary_button'])
+        add_teacher_btn.setMinimumHeight(40)
+        add_teacher_btn.clicked.connect(self.add_new_teacher)
+        teachers_layout.addWidget(add_teacher_btn)
+        
+        import_teachers_btn = QtWidgets.QPushButton("Import Teachers from File...")
+        import_teachers_btn.setStyleSheet(COMMON_STYLES['secondary_button'])
+        import_teachers_btn.setMinimumHeight(40)
+        import_teachers_btn.clicked.connect(lambda: self.import_users_from_file('Teacher', self.load_teachers))
+        teachers_layout.addWidget(import_teachers_btn)
+        
         # Load teachers
         self.load_teachers()
         
         teachers_layout.addStretch()
-        self.main_window.stackedWidget.addWidget(self.teachers_widget)
-        self.main_window.stackedWidget.setCurrentWidget(self.teachers_widget)
+        return self.teachers_widget
     
     def load_teachers(self):
-        # Clear any existing content
-        while self.teachers_container_layout.count():
-            item = self.teachers_container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        try:
-            from supabase_connection import create_connection
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-            
-            # Fetch only teachers
-            response = supabase.table('users') \
-                .select('username') \
-                .eq('user_type', 'Teacher') \
-                .execute()
-            
-            data = response.data
-            if not data:
-                no_teachers_label = QtWidgets.QLabel("No teachers found in the system.")
-                no_teachers_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_teachers_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.teachers_container_layout.addWidget(no_teachers_label)
-                return
-            
-            # Add search
-            search_layout = QtWidgets.QHBoxLayout()
-            search_box = QtWidgets.QLineEdit()
-            search_box.setPlaceholderText("Search teachers...")
-            search_box.setStyleSheet("padding: 8px; border: 1px solid #ccc; border-radius: 4px;")
-            search_box.textChanged.connect(lambda text: self.filter_teachers(text, data))
-            
-            search_layout.addWidget(search_box)
-            self.teachers_container_layout.addLayout(search_layout)
-            
-            # Stats section
-            stats_widget = QtWidgets.QWidget()
-            stats_widget.setStyleSheet("background: #F8F9FA; border-radius: 8px; padding: 15px; margin-top: 10px;")
-            stats_layout = QtWidgets.QHBoxLayout(stats_widget)
-            
-            total_teachers = len(data)
-            active_exams = 0  # Would need additional query to get real data
-            
-            teachers_count = QtWidgets.QLabel(f"Total Teachers: {total_teachers}")
-            teachers_count.setStyleSheet("font-size: 14px; font-weight: bold;")
-            
-            exams_count = QtWidgets.QLabel(f"Active Exams: {active_exams}")
-            exams_count.setStyleSheet("font-size: 14px; font-weight: bold;")
-            
-            stats_layout.addWidget(teachers_count)
-            stats_layout.addStretch()
-            stats_layout.addWidget(exams_count)
-            
-            self.teachers_container_layout.addWidget(stats_widget)
-            
-            # Create a scroll area for the teachers
-            scroll_area = QtWidgets.QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_widget = QtWidgets.QWidget()
-            scroll_layout = QtWidgets.QVBoxLayout(scroll_widget)
-            scroll_layout.setSpacing(10)
-            
-            # Store the scroll layout and data for filtering
-            self.teachers_scroll_layout = scroll_layout
-            self.teachers_data = data
-            
-            self.display_teachers(data, scroll_layout)
-            
-            scroll_area.setWidget(scroll_widget)
-            self.teachers_container_layout.addWidget(scroll_area)
-            
-        except Exception as e:
-            error_label = QtWidgets.QLabel(f"Failed to fetch teachers: {str(e)}")
-            error_label.setStyleSheet("font-size: 14px; color: red; margin: 20px;")
-            self.teachers_container_layout.addWidget(error_label)
+        # Show a placeholder while the teachers are fetched in the background
+        show_loading(self.teachers_container_layout, "Loading teachers...")
+        self.main_window.data_loader.load(
+            self.teachers_container,
+            self.fetch_teachers,
+            self.render_teachers,
+            lambda e: self.show_load_error(self.teachers_container_layout, f"Failed to fetch teachers: {str(e)}")
+        )
     
-    def display_teachers(self, teachers_data, layout):
-        """Display the teacher cards in the layout"""
-        # Clear the layout first
-        while layout.count():
-            item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        for teacher in teachers_data:
-            teacher_card = QtWidgets.QWidget()
-            teacher_card.setStyleSheet('''
-                QWidget {
-                    background: white;
-                    border-radius: 10px;
-                    padding: 15px;
-                    margin: 5px;
-                    border: 1px solid #E0E0E0;
-                }
-                QWidget:hover {
-                    background: #F5F5F5;
-                }
-            ''')
-            card_layout = QtWidgets.QHBoxLayout(teacher_card)
-            
-            # Teacher info
-            info_layout = QtWidgets.QVBoxLayout()
-            username_label = QtWidgets.QLabel(f"Username: {teacher['username']}")
-            username_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
-            info_layout.addWidget(username_label)
-            
-            # Action buttons
-            buttons_layout = QtWidgets.QHBoxLayout()
-            
-            edit_btn = QtWidgets.QPushButton("Edit")
-            edit_btn.setStyleSheet(COMMON_STYLES['secondary_button'])
-            edit_btn.clicked.connect(lambda checked, t=teacher: self.edit_teacher(t))
-            
-            remove_btn = QtWidgets.QPushButton("Remove")
-            remove_btn.setStyleSheet('''
-                QPushButton {
-                    background-color: #FF5252;
-                    color: white;
-                    border: none;
-                    padding: 5px 10px;
-                    border-radius: 4px;
-                }
-                QPushButton:hover {
-                    background-color: #FF0000;
-                }
-            ''')
-            remove_btn.clicked.connect(lambda checked, t=teacher: self.remove_teacher(t))
-            
-            buttons_layout.addWidget(edit_btn)
-            buttons_layout.addWidget(remove_btn)
-            
-            card_layout.addLayout(info_layout)
-            card_layout.addStretch()
-            card_layout.addLayout(buttons_layout)
-            
-            layout.addWidget(teacher_card)
-        
-        # Add "Add Teacher" button at the bottom
-        add_teacher_btn = QtWidgets.QPushButton("+ Add New Teacher")
-        add_teacher_btn.setStyleSheet(COMMON_STYLES['primary_button'])
-        add_teacher_btn.setMinimumHeight(40)
-        add_teacher_btn.clicked.connect(self.add_new_teacher)
-        layout.addWidget(add_teacher_btn)
+    def fetch_teachers(self, search='', after=None, limit=USER_PAGE_SIZE):
+        """Fetches a page of teacher accounts. Runs on a worker thread."""
+        from supabase_connection import create_connection
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+        
+        return fetch_users_page(supabase, 'Teacher', search, after, limit)
     
-    def filter_teachers(self, search_text, teachers_data):
-        """Filter teachers based on search text"""
-        if not search_text:
-            # If search text is empty, show all teachers
-            self.display_teachers(teachers_data, self.teachers_scroll_layout)
+    def render_teachers(self, first_page):
+        clear_layout(self.teachers_container_layout)
+        data, _ = first_page
+        
+        if not data:
+            no_teachers_label = QtWidgets.QLabel("No teachers found in the system.")
+            no_teachers_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_teachers_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.teachers_container_layout.addWidget(no_teachers_label)
             return
         
-        # Filter teachers based on search text
-        filtered_teachers = []
-        search_text = search_text.lower()
-        
-        for teacher in teachers_data:
-            if search_text in teacher['username'].lower():
-                filtered_teachers.append(teacher)
-        
-        # Display filtered teachers
-        self.display_teachers(filtered_teachers, self.teachers_scroll_layout)
+        # Add search
+        search_layout = QtWidgets.QHBoxLayout()
+        search_box = QtWidgets.QLineEdit()
+        search_box.setPlaceholderText("Search teachers...")
+        search_box.setStyleSheet("padding: 8px; border: 1px solid #ccc; border-radius: 4px;")
+        search_box.textChanged.connect(self.filter_teachers)
+        
+        search_layout.addWidget(search_box)
+        self.teachers_container_layout.addLayout(search_layout)
+        
+        # Stats section
+        stats_widget = QtWidgets.QWidget()
+        stats_widget.setStyleSheet("background: #F8F9FA; border-radius: 8px; padding: 15px; margin-top: 10px;")
+        stats_layout = QtWidgets.QHBoxLayout(stats_widget)
+        
+        active_exams = 0  # Would need additional query to get real data
+        
+        self.teachers_count_label = QtWidgets.QLabel()
+        self.teachers_count_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        
+        exams_count = QtWidgets.QLabel(f"Active Exams: {active_exams}")
+        exams_count.setStyleSheet("font-size: 14px; font-weight: bold;")
+        
+        stats_layout.addWidget(self.teachers_count_label)
+        stats_layout.addStretch()
+        stats_layout.addWidget(exams_count)
+        
+        self.teachers_container_layout.addWidget(stats_widget)
+        
+        # Only the rows in view are painted, and further pages are fetched
+        # as the list is scrolled, however many teachers there are
+        self.teachers_list = UserListView()
+        self.teachers_list.edit_requested.connect(self.edit_teacher)
+        self.teachers_list.remove_requested.connect(self.remove_teacher)
+        self.teachers_pager = UserListPager(self.teachers_list, self.main_window.data_loader,
+                                            self.fetch_teachers, USER_PAGE_SIZE)
+        self.teachers_pager.count_changed.connect(self.show_teacher_count)
+        self.teachers_pager.show_first_page(first_page)
+        self.teachers_container_layout.addWidget(self.teachers_list)
+    
+    def filter_teachers(self, search_text):
+        """Narrow the loaded teachers at once, then search the server once typing pauses"""
+        self.teachers_list.set_filter(search_text)
+        self.teachers_pager.search(search_text)
+    
+    def show_teacher_count(self, count):
+        # Estimated by the server, so large counts are approximate
+        count = "?" if count is None else count
+        if self.teachers_pager.search_text:
+            self.teachers_count_label.setText(f"Matching Teachers: {count}")
+        else:
+            self.teachers_count_label.setText(f"Total Teachers: {count}")
     
     def add_new_teacher(self):
         """Add a new teacher to the system"""
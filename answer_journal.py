@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from supabase_connection import create_connection, record_answers, is_missing_rpc_error
+from grading import fetch_answer_key, is_correct_answer
+
+class AnswerJournal:
+    """
+    Write-behind buffer for one student's answers to one exam.
+
+    Selections are recorded locally and written to student_answers by a
+    background thread in coalesced batches: only the latest selection per
+    question is kept, and a batch is flushed once no new selection has
+    arrived for debounce_seconds, max_delay_seconds after the oldest
+    unflushed selection, or whenever flush() is called.
+
+    Each batch is saved with the record_answers() database function, which
+    also keeps the running score in exam_results. If that function has not
+    been deployed yet the journal falls back to grading and upserting the
+    rows itself.
+
+    clock and writer exist for tests: clock replaces time.monotonic, and
+    writer(batch), returning True once the batch is saved, replaces the
+    database writes.
+    """
+
+    def __init__(self, exam_id, student_username, debounce_seconds=1.5, max_delay_seconds=10.0,
+                 clock=time.monotonic, writer=None):
+        self.exam_id = exam_id
+        self.student_username = student_username
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._clock = clock
+        self._writer = writer or self._write
+
+        self._pending = {}  # question_id -> selected option text
+        self._answer_key = None  # question_id -> question row, fetched once
+        self._result_marked = False
+        self._use_rpc = True
+        self.last_score = None
+        self._in_flight = False
+        self._flush_requested = False
+        self._closed = False
+        self._cancelled = False  # Set by close(flush=False); no more writes
+        self._last_change = None
+        self._first_change = None
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, name=f"AnswerJournal-{exam_id}")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def record(self, question_id, selected_option):
+        """Record a selection; returns immediately without touching the network"""
+        with self._condition:
+            if self._closed:
+                logging.warning(f"Answer journal closed, dropping answer for question {question_id}")
+                return
+            now = self._clock()
+            self._pending[question_id] = selected_option
+            self._last_change = now
+            if self._first_change is None:
+                self._first_change = now
+            self._condition.notify()
+
+    def flush(self, wait=False, timeout=10.0):
+        """
+        Ask the worker to write pending answers now
+
+        Args:
+            wait (bool): Block until the pending answers have been written
+            timeout (float): Maximum seconds to wait when wait is True
+
+        Returns:
+            bool: True if nothing is left pending (always True when not waiting)
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify()
+            if not wait:
+                return True
+            deadline = time.monotonic() + timeout
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._thread.is_alive():
+                    break
+                self._condition.wait(remaining)
+            return not (self._pending or self._in_flight)
+
+    def close(self, flush=True, wait=True, timeout=10.0):
+        """
+        Stop the worker; closing an already closed journal does nothing
+
+        Args:
+            flush (bool): Write pending answers before stopping. If False they
+                are dropped, and a batch already being written is the last
+                write; close() then never blocks
+            wait (bool): When flushing, block until the answers are written
+                and the worker has stopped. If False the worker writes them
+                and stops on its own
+            timeout (float): Maximum seconds to wait
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            if not flush:
+                self._pending.clear()
+                self._cancelled = True
+            self._condition.notify_all()
+        if flush and wait:
+            self._thread.join(timeout=timeout)
+
+    @property
+    def pending_count(self):
+        with self._condition:
+            return len(self._pending)
+
+    def _next_flush_delay(self, now):
+        if self._flush_requested or self._closed:
+            return 0
+        debounce_at = self._last_change + self.debounce_seconds
+        max_delay_at = self._first_change + self.max_delay_seconds
+        return max(0, min(debounce_at, max_delay_at) - now)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed and not self._pending:
+                        return
+                    if not self._pending:
+                        self._flush_requested = False
+                        self._condition.wait()
+                        continue
+                    delay = self._next_flush_delay(self._clock())
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+
+                batch = self._pending
+                self._pending = {}
+                self._first_change = None
+                self._flush_requested = False
+                self._in_flight = True
+
+            written = self._writer(batch)
+
+            with self._condition:
+                self._in_flight = False
+                if not written and not self._cancelled:
+                    # Put the batch back without clobbering newer selections
+                    for question_id, selected_option in batch.items():
+                        self._pending.setdefault(question_id, selected_option)
+                    if self._pending and self._first_change is None:
+                        self._first_change = self._clock()
+                self._condition.notify_all()
+
+                if not written:
+                    if self._closed:
+                        if not self._cancelled:
+                            logging.error(f"Answer journal closed with {len(self._pending)} unsaved answers "
+                                          f"for exam {self.exam_id}")
+                        return
+                    # Retry later; close() cuts the pause short
+                    self._condition.wait(min(self.max_delay_seconds, 5.0))
+
+    def get_answer_key(self, supabase):
+        """Return the exam's answer key, fetching it on first use"""
+        if self._answer_key is None:
+            self._answer_key = fetch_answer_key(supabase, self.exam_id)
+        return self._answer_key
+
+    def _write(self, batch):
+        if self._cancelled:
+            return False
+        if self._use_rpc:
+            try:
+                self.last_score = record_answers(self.exam_id, self.student_username, batch)
+                logging.debug(f"Recorded {len(batch)} answers for exam {self.exam_id}, score {self.last_score}")
+                return True
+            except Exception as e:
+                if not is_missing_rpc_error(e):
+                    logging.error(f"Error flushing answer journal: {e}")
+                    return False
+                logging.warning("record_answers() is not deployed, saving answers with table upserts")
+                self._use_rpc = False
+        return self._write_rows(batch)
+
+    def _write_rows(self, batch):
+        try:
+            supabase = create_connection()
+            if not supabase:
+                raise Exception("Failed to connect to Supabase")
+
+            answer_key = self.get_answer_key(supabase)
+            rows = []
+            for question_id, selected_option in batch.items():
+                question = answer_key.get(question_id)
+                if question is None:
+                    logging.warning(f"Question {question_id} not found in exam {self.exam_id}")
+                    continue
+                rows.append({
+                    'exam_id': self.exam_id,
+                    'question_id': question_id,
+                    'student_username': self.student_username,
+                    'selected_answer': selected_option,
+                    'is_correct': is_correct_answer(question, selected_option)
+                })
+
+            if self._cancelled:
+                return False
+            if rows:
+                supabase.table('student_answers') \
+                    .upsert(rows, on_conflict='exam_id,question_id,student_username') \
+                    .execute()
+
+            if not self._result_marked:
+                # Record the attempt once; the score is finalised on submit
+                supabase.table('exam_results') \
+                    .upsert({
+                        'exam_id': self.exam_id,
+                        'student_username': self.student_username,
+                        'score': 0,
+                        # Not completed until submitted
+                        'completed_at': None
+                    }, on_conflict='exam_id,student_username', ignore_duplicates=True) \
+                    .execute()
+                self._result_marked = True
+
+            logging.debug(f"Flushed {len(rows)} answers for exam {self.exam_id}")
+            return True
+        except Exception as e:
+            logging.error(f"Error flushing answer journal: {e}")
+            return False
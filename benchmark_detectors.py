@@ -0,0 +1,152 @@
+"""
+Compares the gaze face detectors on recorded video.
+
+Replays each video through every selected detector and reports per-frame
+latency percentiles, CPU usage and, when a labels file is given, how often
+the detector agrees with the labels. Use it to pick the cheapest detector
+that is accurate enough on the machines the exam runs on:
+
+    python benchmark_detectors.py session1.mp4 session2.mp4 --labels labels.csv
+
+The labels file is a CSV with the columns video, frame, face_detected and
+facing_camera (1/0; facing_camera may be left empty). video is the file
+name without its directory and frame is the 0-based frame index.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+
+from face_detectors import DETECTORS, create_detector
+from gaze_detection import GazeDetection
+from gaze_replay import read_frames
+
+
+def load_labels(path):
+    """
+    Reads ground truth labels
+
+    Returns:
+        dict: (video name, frame index) -> (face_detected, facing_camera or None)
+    """
+    labels = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            facing = row.get('facing_camera', '').strip()
+            labels[(row['video'], int(row['frame']))] = (
+                row['face_detected'].strip() == '1',
+                facing == '1' if facing else None,
+            )
+    return labels
+
+
+def benchmark_detector(detector, videos, labels=None, warmup=5):
+    """
+    Runs one detector over a set of videos
+
+    Args:
+        detector (FaceDetector): Detector to measure
+        videos (dict): Video name -> iterable of frames
+        labels (dict): Ground truth from load_labels(), optional
+        warmup (int): Frames at the start of each video left out of the
+            latency figures (model loading, caches)
+
+    Returns:
+        dict: Latency percentiles in milliseconds, CPU usage and agreement
+    """
+    labels = labels or {}
+    gaze = GazeDetection(detector=detector)
+    latencies = []
+    face_matches = face_total = facing_matches = facing_total = 0
+    frames = 0
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for video, video_frames in videos.items():
+        detector.reset()
+        for index, frame in enumerate(video_frames):
+            start = time.perf_counter()
+            gaze.detect_face_and_gaze(frame)
+            elapsed = time.perf_counter() - start
+            frames += 1
+            if index >= warmup:
+                latencies.append(elapsed * 1000)
+
+            label = labels.get((video, index))
+            if label is None:
+                continue
+            face_detected, facing_camera = label
+            face_total += 1
+            face_matches += gaze.is_face_detected == face_detected
+            if facing_camera is not None:
+                facing_total += 1
+                facing_matches += gaze.is_facing_camera == facing_camera
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) if latencies else (None, None, None)
+    return {
+        'detector': detector.name,
+        'frames': frames,
+        'p50_ms': p50,
+        'p90_ms': p90,
+        'p99_ms': p99,
+        # Process CPU time over wall time; above 100% when OpenCV uses several cores
+        'cpu_percent': 100 * cpu / wall if wall > 0 else None,
+        'face_accuracy': face_matches / face_total if face_total else None,
+        'facing_accuracy': facing_matches / facing_total if facing_total else None,
+        'labeled_frames': face_total,
+    }
+
+
+def format_report(results):
+    """Formats benchmark results as a text table"""
+    def cell(value, fmt):
+        return fmt.format(value) if value is not None else '-'
+
+    lines = [f"{'detector':<10} {'frames':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+             f"{'cpu %':>7} {'face acc':>9} {'facing acc':>11}"]
+    for r in results:
+        lines.append(
+            f"{r['detector']:<10} {r['frames']:>7} {cell(r['p50_ms'], '{:.1f}'):>8} "
+            f"{cell(r['p90_ms'], '{:.1f}'):>8} {cell(r['p99_ms'], '{:.1f}'):>8} "
+            f"{cell(r['cpu_percent'], '{:.0f}'):>7} {cell(r['face_accuracy'], '{:.1%}'):>9} "
+            f"{cell(r['facing_accuracy'], '{:.1%}'):>11}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the gaze face detectors on recorded video")
+    parser.add_argument('videos', nargs='+', help="Video files or image directories to replay")
+    parser.add_argument('--detectors', default=','.join(DETECTORS),
+                        help="Comma-separated detectors to compare (default: all)")
+    parser.add_argument('--labels', help="CSV of ground truth labels")
+    parser.add_argument('--max-frames', type=int, help="Frames to use from each video")
+    parser.add_argument('--warmup', type=int, default=5, help="Frames per video left out of latency figures")
+    args = parser.parse_args(argv)
+
+    labels = load_labels(args.labels) if args.labels else None
+    results = []
+    for name in args.detectors.split(','):
+        try:
+            detector = create_detector(name.strip())
+        except (ImportError, FileNotFoundError, ValueError) as e:
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+            continue
+        try:
+            # Decode lazily so only one frame is held in memory at a time
+            videos = {os.path.basename(path): read_frames(path, args.max_frames) for path in args.videos}
+            results.append(benchmark_detector(detector, videos, labels, args.warmup))
+        finally:
+            detector.close()
+
+    print(format_report(results))
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
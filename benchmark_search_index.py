@@ -0,0 +1,76 @@
+"""
+Measures per-keystroke latency of SearchIndex against a linear scan.
+
+Generates synthetic usernames, builds the index and types a few queries
+one character at a time, timing each keystroke through
+SearchIndex.search() and through the lowercase `in` scan the admin lists
+used to do:
+
+    python benchmark_search_index.py --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from search_index import SearchIndex
+
+NAMES = ("aarav", "aditi", "alice", "arjun", "bob", "chen", "diya", "emma", "fatima", "ishaan",
+         "john", "kavya", "li", "maria", "mohammed", "noah", "olivia", "priya", "rahul", "sara")
+
+QUERIES = ("priya2", "john_1", "student0", "zzz")
+
+
+def make_usernames(count, seed=0):
+    """Usernames like priya_2041 or student004213, with duplicates of common names"""
+    rng = random.Random(seed)
+    usernames = []
+    for i in range(count):
+        if rng.random() < 0.3:
+            usernames.append(f"student{i:06d}")
+        else:
+            usernames.append(f"{rng.choice(NAMES)}{rng.choice(('', '_', '.'))}{rng.randrange(10000)}")
+    return usernames
+
+
+def time_keystrokes(search, queries):
+    """Times search() on every prefix of every query; returns milliseconds per keystroke"""
+    timings = []
+    for query in queries:
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            search(query[:end])
+            timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def linear_scan(usernames):
+    def search(query):
+        query = query.lower()
+        return [i for i, username in enumerate(usernames) if query in username.lower()]
+    return search
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark SearchIndex per-keystroke latency")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args(argv)
+
+    print(f"{'users':>9} {'build s':>8} {'index p50':>10} {'index max':>10} {'scan p50':>9} {'scan max':>9}  (ms)")
+    for size in args.sizes:
+        usernames = make_usernames(size)
+        start = time.perf_counter()
+        index = SearchIndex(usernames)
+        build = time.perf_counter() - start
+
+        indexed = time_keystrokes(index.search, QUERIES)
+        scanned = time_keystrokes(linear_scan(usernames), QUERIES)
+        print(f"{size:>9} {build:>8.2f} {np.median(indexed):>10.3f} {indexed.max():>10.3f} "
+              f"{np.median(scanned):>9.3f} {scanned.max():>9.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Rows per lookup and insert; keeps the in_() filter's URL well under PostgREST's limit
+CHUNK_SIZE = 250
+
+# Chunks sent at once, each over its own connection from the client's pool
+MAX_CHUNKS_IN_FLIGHT = 4
+
+USER_TYPES = ('Student', 'Teacher')
+MIN_PASSWORD_LENGTH = 8
+MAX_USERNAME_LENGTH = 50  # users.username is VARCHAR(50)
+
+
+class ImportReport:
+    """What an import did so far: rows read, users added and rows rejected"""
+
+    def __init__(self):
+        self.rows = 0
+        self.added = 0
+        self.errors = []  # (line number, username, message)
+        self.cancelled = False
+
+    def summary(self):
+        text = f"Added {self.added} of {self.rows} users"
+        if self.errors:
+            text += f", {len(self.errors)} rows rejected"
+        if self.cancelled:
+            text += " (stopped before the end of the file)"
+        return text
+
+
+def read_rows(file, jsonl=False):
+    """
+    Streams the rows of a CSV file with a header row, or of a JSONL file
+
+    Args:
+        file: Text file object
+        jsonl (bool): One JSON object per line instead of CSV
+
+    Yields:
+        tuple: (line number, dict with lowercased keys, or None for a line
+        that isn't a JSON object)
+    """
+    if jsonl:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                row = None
+            if not isinstance(row, dict):
+                yield line_number, None
+                continue
+            yield line_number, {str(key).strip().lower(): value for key, value in row.items()}
+    else:
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, {str(key).strip().lower(): value for key, value in row.items() if key}
+
+
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def validate_row(row, default_user_type='Student'):
+    """
+    Checks one row with the rules of the Add Student/Teacher dialogs
+
+    Args:
+        row (dict): username, password and optionally user_type
+        default_user_type (str): Used when the row has no user_type
+
+    Returns:
+        tuple: (users row with the password hashed, None) or (None, error message)
+    """
+    if row is None:
+        return None, "Not a JSON object"
+    username = str(row.get('username') or '').strip()
+    password = str(row.get('password') or '').strip()
+    user_type = str(row.get('user_type') or default_user_type).strip().capitalize()
+
+    if not username or not password:
+        return None, "Username and password are required"
+    if len(username) > MAX_USERNAME_LENGTH:
+        return None, f"Username must be at most {MAX_USERNAME_LENGTH} characters"
+    if len(password) < MIN_PASSWORD_LENGTH:
+        return None, f"Password must be at least {MIN_PASSWORD_LENGTH} characters"
+    if user_type not in USER_TYPES:
+        return None, f"User type must be one of {', '.join(USER_TYPES)}"
+
+    return {'username': username, 'password': hash_password(password), 'user_type': user_type}, None
+
+
+def insert_chunk(supabase, chunk):
+    """
+    Adds a chunk of validated users with one lookup and one insert
+
+    Args:
+        supabase: Supabase client
+        chunk (list): (line number, users row) pairs with distinct usernames
+
+    Returns:
+        tuple: (number of users added, list of (line number, username, message))
+    """
+    usernames = [user['username'] for _, user in chunk]
+    response = supabase.table('users').select('username').in_('username', usernames).execute()
+    existing = {row['username'] for row in response.data}
+
+    errors = [(line, user['username'], "Username already exists")
+              for line, user in chunk if user['username'] in existing]
+    new = [(line, user) for line, user in chunk if user['username'] not in existing]
+    if not new:
+        return 0, errors
+
+    # Usernames taken since the lookup are skipped rather than failing the chunk;
+    # only the rows actually inserted come back
+    response = supabase.table('users') \
+        .upsert([user for _, user in new], on_conflict='username', ignore_duplicates=True) \
+        .execute()
+    inserted = {row['username'] for row in response.data}
+    errors.extend((line, user['username'], "Username already exists")
+                  for line, user in new if user['username'] not in inserted)
+    return len(inserted), errors
+
+
+def import_users(supabase, path, default_user_type='Student', chunk_size=CHUNK_SIZE,
+                 max_in_flight=MAX_CHUNKS_IN_FLIGHT, progress=None, cancelled=None):
+    """
+    Adds the users in a CSV or JSONL file
+
+    The file is streamed and validated row by row. Valid rows are sent in
+    chunks, several at a time: each chunk costs one query for the usernames
+    that already exist and one bulk insert. Rows that can't be added are
+    reported with their line number instead of stopping the import. Blocks;
+    run it off the GUI thread.
+
+    Args:
+        supabase: Supabase client; must be usable from several threads
+        path (str): .csv file with username,password[,user_type] columns,
+            or .jsonl file with objects with those keys
+        default_user_type (str): For rows without a user_type
+        chunk_size (int): Rows per lookup and insert
+        max_in_flight (int): Chunks sent at once
+        progress (callable): Called with the ImportReport and the fraction
+            of the file read after each chunk
+        cancelled (callable): Returns True to stop. It is checked before
+            each chunk is sent; chunks already sent are still finished
+
+    Returns:
+        ImportReport: Users added and the rejected rows, in file order
+    """
+    report = ImportReport()
+    seen = set()
+    chunk = []
+    in_flight = deque()
+
+    def collect(future):
+        try:
+            added, errors = future.result()
+        except Exception as e:
+            logging.error(f"Bulk import chunk failed: {e}")
+            added, errors = 0, [(line, user['username'], f"Error: {e}") for line, user in future.chunk]
+        report.added += added
+        report.errors.extend(errors)
+
+    def send(executor):
+        future = executor.submit(insert_chunk, supabase, chunk)
+        future.chunk = chunk
+        in_flight.append(future)
+
+    with open(path, 'rb') as raw, ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        size = os.fstat(raw.fileno()).st_size or 1
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        jsonl = path.lower().endswith(('.jsonl', '.ndjson'))
+
+        for line_number, row in read_rows(text, jsonl):
+            report.rows += 1
+            user, error = validate_row(row, default_user_type)
+            if user is not None and user['username'] in seen:
+                error = "Username appears earlier in the file"
+            if error is not None:
+                username = str(row.get('username') or '').strip() if row else ''
+                report.errors.append((line_number, username, error))
+                continue
+            seen.add(user['username'])
+            chunk.append((line_number, user))
+            if len(chunk) < chunk_size:
+                continue
+
+            if cancelled is not None and cancelled():
+                report.cancelled = True
+                break
+            send(executor)
+            chunk = []
+            if len(in_flight) >= max_in_flight:
+                collect(in_flight.popleft())
+                if progress is not None:
+                    progress(report, min(raw.tell() / size, 1.0))
+
+        if chunk and not report.cancelled:
+            if cancelled is not None and cancelled():
+                report.cancelled = True
+            else:
+                send(executor)
+        if report.cancelled:
+            # The chunk that was never sent isn't part of the import
+            report.rows -= len(chunk)
+        while in_flight:
+            collect(in_flight.popleft())
+
+    report.errors.sort(key=lambda error: error[0])
+    if progress is not None:
+        progress(report, 1.0)
+    logging.info(f"Bulk import of {path}: {report.summary()}")
+    return report
+
+
+def write_error_report(path, errors):
+    """Saves rejected rows as CSV: line, username, error"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['line', 'username', 'error'])
+        writer.writerows(errors)
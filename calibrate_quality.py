@@ -0,0 +1,120 @@
+"""
+Calibrates the fast image quality mode of GazeDetection against the full one.
+
+Replays recordings, measures every frame both ways and picks the fast
+clarity threshold whose clear/unclear verdicts agree best with the full
+measurement at its threshold. Also reports how often the frame-difference
+gate would reuse a measurement and how well the complete fast path
+(subsample plus gate) agrees with the full verdicts:
+
+    python calibrate_quality.py session1.mp4 session2.mp4
+
+Put the suggested threshold in .env as GAZE_FAST_CLARITY_THRESHOLD and set
+GAZE_QUALITY_MODE=fast to use it.
+"""
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from face_detectors import FaceDetector
+from gaze_detection import GazeDetection, fast_quality_metrics, quality_metrics
+from gaze_replay import read_frames
+
+
+def calibrate_threshold(reference_verdicts, fast_clarity):
+    """
+    Finds the fast clarity threshold that best reproduces a set of verdicts
+
+    Args:
+        reference_verdicts (numpy.ndarray): bool per frame, the full measurement's verdict
+        fast_clarity (numpy.ndarray): Fast clarity per frame
+
+    Returns:
+        tuple: (threshold, fraction of frames whose verdict it reproduces)
+    """
+    order = np.argsort(fast_clarity)
+    values = fast_clarity[order]
+    verdicts = reference_verdicts[order]
+    count = len(values)
+
+    # A threshold just below values[k] calls frames k.. clear and the rest unclear
+    clear_from = np.concatenate(([0], np.cumsum(verdicts[::-1])))[::-1]  # clear frames in k..
+    unclear_below = np.concatenate(([0], np.cumsum(~verdicts)))  # unclear frames in ..k-1
+    agreement = clear_from + unclear_below
+    best = int(np.argmax(agreement))
+
+    if best == 0:
+        threshold = values[0] - 1
+    elif best == count:
+        threshold = values[-1]
+    else:
+        threshold = (values[best - 1] + values[best]) / 2
+    return float(threshold), agreement[best] / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate the fast image quality mode")
+    parser.add_argument('sources', nargs='+', help="Video files or image directories")
+    parser.add_argument('--stride', type=int, default=2, help="Subsampling step of the fast measurement")
+    parser.add_argument('--change-threshold', type=float, default=2.0,
+                        help="Frame-difference gate threshold to evaluate")
+    parser.add_argument('--max-frames', type=int, help="Frames to use from each source")
+    args = parser.parse_args(argv)
+
+    # Only prepare_frame() and the quality settings are used, not face detection
+    gaze = GazeDetection(detector=FaceDetector(), quality_mode='fast', quality_stride=args.stride,
+                         quality_change_threshold=args.change_threshold)
+    full_clarity, full_brightness, fast_clarity, fast_brightness = [], [], [], []
+    gated_clarity, gated_brightness = [], []
+    full_seconds = fast_seconds = 0.0
+
+    for source in args.sources:
+        gaze.reset()
+        for frame in read_frames(source, args.max_frames):
+            gray, _ = gaze.prepare_frame(frame)
+            # The full check measures the camera-resolution frame
+            full_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+            start = time.perf_counter()
+            clarity, brightness = quality_metrics(full_gray)
+            full_seconds += time.perf_counter() - start
+            full_clarity.append(clarity)
+            full_brightness.append(brightness)
+
+            start = time.perf_counter()
+            clarity, brightness = gaze.measure_quality(gray)
+            fast_seconds += time.perf_counter() - start
+            gated_clarity.append(clarity)
+            gated_brightness.append(brightness)
+
+            clarity, brightness = fast_quality_metrics(gray, args.stride)
+            fast_clarity.append(clarity)
+            fast_brightness.append(brightness)
+
+    count = len(full_clarity)
+    if not count:
+        print("No frames to calibrate on", file=sys.stderr)
+        return 1
+
+    full_clear = np.array(full_clarity) > gaze.clarity_threshold
+    full_bright = np.array(full_brightness) > gaze.brightness_threshold
+    threshold, clarity_agreement = calibrate_threshold(full_clear, np.array(fast_clarity))
+    brightness_agreement = np.mean((np.array(fast_brightness) > gaze.brightness_threshold) == full_bright)
+    gated_verdicts = ((np.array(gated_clarity) > threshold)
+                      & (np.array(gated_brightness) > gaze.brightness_threshold))
+
+    print(f"Frames: {count}")
+    print(f"Suggested GAZE_FAST_CLARITY_THRESHOLD={threshold:.1f} "
+          f"(full threshold {gaze.clarity_threshold}, clarity verdict agreement {clarity_agreement:.1%})")
+    print(f"Brightness verdict agreement: {brightness_agreement:.1%}")
+    print(f"Frame-difference gate: {gaze.quality_cache_hits / count:.1%} of frames reused, "
+          f"overall verdict agreement {np.mean(gated_verdicts == (full_clear & full_bright)):.1%}")
+    print(f"Time per frame: full {full_seconds / count * 1e6:.0f} us, fast {fast_seconds / count * 1e6:.0f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import time
+import threading
+import cv2
+import numpy as np
+from PyQt6 import QtGui
+
+# Preview refresh rate, independent of how often frames are analysed
+PREVIEW_FPS = 10
+
+
+class CameraPreview:
+    """
+    Turns camera frames into preview thumbnails on the camera thread.
+
+    Frames are shrunk straight into a preallocated BGR buffer and wrapped in
+    a QImage without converting colours or copying. Because the buffer is
+    reused, only one thumbnail may be in flight: render() returns None until
+    the GUI thread has called frame_shown(), which it does after copying the
+    image into a QPixmap.
+    """
+
+    def __init__(self, width, height, max_fps=PREVIEW_FPS, clock=time.monotonic):
+        """
+        Args:
+            width (int): Thumbnail width in pixels
+            height (int): Thumbnail height in pixels
+            max_fps (float): Most thumbnails produced per second
+            clock (callable): Monotonic clock, injectable for tests
+        """
+        self.width = width
+        self.height = height
+        self.interval = 1.0 / max_fps
+        self.clock = clock
+        self.rendered = 0
+        self.skipped = 0
+        self._buffer = np.empty((height, width, 3), dtype=np.uint8)
+        self._last_render = None
+        self._pending = threading.Event()
+
+    def render(self, frame, visible=True):
+        """
+        Builds a thumbnail of the frame if one is due
+
+        Args:
+            frame (numpy.ndarray): BGR camera frame
+            visible (bool): Whether the preview widget is showing; hidden
+                previews are never rendered
+
+        Returns:
+            QtGui.QImage: Thumbnail backed by the shared buffer, or None if
+            the preview is hidden, throttled or still showing the last one
+        """
+        now = self.clock()
+        if (not visible or self._pending.is_set()
+                or (self._last_render is not None and now - self._last_render < self.interval)):
+            self.skipped += 1
+            return None
+
+        cv2.resize(frame, (self.width, self.height), dst=self._buffer, interpolation=cv2.INTER_AREA)
+        self._last_render = now
+        self._pending.set()
+        self.rendered += 1
+        return QtGui.QImage(self._buffer.data, self.width, self.height, self._buffer.strides[0],
+                            QtGui.QImage.Format.Format_BGR888)
+
+    def next_render_at(self):
+        """Clock time at which the frame rate limit allows the next thumbnail"""
+        if self._last_render is None:
+            return self.clock()
+        return self._last_render + self.interval
+
+    def frame_shown(self):
+        """Call on the GUI thread once the last thumbnail has been copied"""
+        self._pending.clear()
@@ -0,0 +1,58 @@
+"""
+Deletes draft exams that were never finished, with their questions.
+
+Exams used to be inserted as drafts before their questions were written,
+so every exam abandoned halfway left a draft behind. Run this once after
+applying migrations/006_delete_orphaned_draft_exams.sql, or on a schedule:
+
+    SUPABASE_SERVICE_KEY=... python cleanup_draft_exams.py --older-than-hours 24
+
+Only the service role may delete exams, so this connects with the service
+key from SUPABASE_SERVICE_KEY rather than the app's SUPABASE_KEY. Set it in
+the environment of whatever runs the cleanup, never in the app's .env.
+"""
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+from supabase import create_client
+
+from exam_draft import ORPHANED_DRAFT_HOURS, delete_orphaned_drafts
+
+SERVICE_KEY_ENV = "SUPABASE_SERVICE_KEY"
+
+
+def create_service_connection():
+    """
+    Returns a Supabase client using the service role key, or None if
+    SUPABASE_URL or SUPABASE_SERVICE_KEY is not set.
+    """
+    load_dotenv()
+    supabase_url = os.getenv("SUPABASE_URL")
+    service_key = os.getenv(SERVICE_KEY_ENV)
+
+    if not supabase_url or not service_key:
+        print(f"Error: SUPABASE_URL or {SERVICE_KEY_ENV} not found in environment variables")
+        print(f"Set {SERVICE_KEY_ENV} to the project's service_role key to delete draft exams")
+        return None
+
+    return create_client(supabase_url, service_key)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delete orphaned draft exams")
+    parser.add_argument('--older-than-hours', type=int, default=ORPHANED_DRAFT_HOURS,
+                        help="Only delete drafts created at least this long ago")
+    args = parser.parse_args(argv)
+
+    supabase = create_service_connection()
+    if not supabase:
+        return 1
+    deleted = delete_orphaned_drafts(supabase, args.older_than_hours)
+    print(f"Deleted {deleted} orphaned draft exams")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
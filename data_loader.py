@@ -0,0 +1,228 @@
+import logging
+import threading
+from PyQt6 import QtCore, QtWidgets, sip
+
+# Worker threads shared by every dashboard; Supabase calls are I/O bound
+MAX_LOADER_THREADS = 4
+
+
+def clear_layout(layout):
+    """Removes and deletes every widget and nested layout in a layout"""
+    while layout.count():
+        item = layout.takeAt(0)
+        if item.widget():
+            item.widget().deleteLater()
+        elif item.layout():
+            clear_layout(item.layout())
+
+
+def show_loading(layout, text="Loading..."):
+    """Replaces the contents of a container layout with a loading placeholder"""
+    clear_layout(layout)
+    loading_label = QtWidgets.QLabel(text)
+    loading_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+    loading_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+    layout.addWidget(loading_label)
+    return loading_label
+
+
+class _WorkerSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal(object, object)  # request, result
+    failed = QtCore.pyqtSignal(object, object)  # request, exception
+
+
+class _Request:
+    """One load: what to fetch, where the result goes and whether it is still wanted"""
+
+    def __init__(self, owner, fetch, on_result, on_error):
+        self.owner = owner
+        self.fetch = fetch
+        self.on_result = on_result
+        self.on_error = on_error
+        self.cancelled = False
+        self.worker = None
+
+
+class _FetchWorker(QtCore.QRunnable):
+    def __init__(self, request, signals):
+        super().__init__()
+        self.request = request
+        self.signals = signals
+
+    def run(self):
+        # Skip requests that went stale while waiting in the queue
+        if self.request.cancelled:
+            return
+        try:
+            result = self.request.fetch()
+        except Exception as e:
+            self.signals.failed.emit(self.request, e)
+        else:
+            self.signals.finished.emit(self.request, result)
+
+
+class DataLoader(QtCore.QObject):
+    """
+    Runs blocking data fetches on a thread pool and hands the results back
+    to the GUI thread.
+
+    Each request belongs to an owner widget (normally the container the
+    results are rendered into) and an owner has at most one request in
+    flight: loading again supersedes the previous request, whose result is
+    then dropped. When attached to a QStackedWidget, requests whose owner is
+    not on the page being shown are cancelled and restarted if the user
+    navigates back to that page.
+
+    Jobs that must not run twice, such as imports, go through run_once()
+    instead, which is never superseded, cancelled or restarted.
+    """
+
+    def __init__(self, parent=None, max_threads=MAX_LOADER_THREADS):
+        super().__init__(parent)
+        self.thread_pool = QtCore.QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        self._signals = _WorkerSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._requests = {}  # owner -> active _Request
+        self._suspended = {}  # owner -> _Request cancelled by navigation
+        self._one_shot = {}  # _Request -> thread running it, for run_once()
+        self._stacked_widget = None
+
+    def load(self, owner, fetch, on_result, on_error=None):
+        """
+        Starts a fetch in the background
+
+        Args:
+            owner (QWidget): Widget the result is for; results are dropped
+                if it has been deleted or superseded by a newer load
+            fetch (callable): Called with no arguments on a worker thread;
+                must not touch widgets
+            on_result (callable): Called on the GUI thread with fetch()'s result
+            on_error (callable): Called on the GUI thread with the exception
+                if fetch() raised; errors are only logged when omitted
+
+        Returns:
+            _Request: Handle that can be passed to cancel()
+        """
+        self.cancel(owner)
+        request = _Request(owner, fetch, on_result, on_error)
+        self._start(request)
+        return request
+
+    def run_once(self, task, on_result, on_error=None, owner=None):
+        """
+        Runs a job that must happen exactly once, e.g. an import, on its own thread
+
+        Unlike load(), the job has a thread to itself rather than a slot in
+        the shared pool, and navigation never cancels or restarts it.
+
+        Args:
+            task (callable): Called with no arguments on the job's thread;
+                must not touch widgets
+            on_result (callable): Called on the GUI thread with task()'s result
+            on_error (callable): Called on the GUI thread with the exception
+                if task() raised; errors are only logged when omitted
+            owner (QWidget): If given, results are dropped once it is deleted
+
+        Returns:
+            threading.Thread: The job's thread
+        """
+        request = _Request(owner, task, on_result, on_error)
+        thread = threading.Thread(target=_FetchWorker(request, self._signals).run, name="DataLoaderJob")
+        thread.daemon = True
+        self._one_shot[request] = thread
+        thread.start()
+        return thread
+
+    def cancel(self, owner):
+        """Cancels the owner's in-flight request, if any"""
+        self._suspended.pop(owner, None)
+        request = self._requests.pop(owner, None)
+        if request is not None:
+            self._cancel_request(request)
+
+    def cancel_all(self):
+        for owner in list(self._requests):
+            self.cancel(owner)
+        self._suspended.clear()
+
+    def pending_count(self):
+        return len(self._requests)
+
+    def wait(self, timeout_ms=-1):
+        """
+        Blocks until every started fetch has finished and delivers the results.
+        Intended for tests and shutdown; never call this from a UI handler.
+        """
+        done = self.thread_pool.waitForDone(timeout_ms)
+        for thread in list(self._one_shot.values()):
+            thread.join(None if timeout_ms < 0 else timeout_ms / 1000)
+            done = done and not thread.is_alive()
+        QtCore.QCoreApplication.sendPostedEvents()
+        QtCore.QCoreApplication.processEvents()
+        return done
+
+    def attach(self, stacked_widget):
+        """Cancels loads for pages the stacked widget navigates away from"""
+        self._stacked_widget = stacked_widget
+        stacked_widget.currentChanged.connect(self._on_page_changed)
+
+    def _start(self, request):
+        request.worker = _FetchWorker(request, self._signals)
+        # The request keeps the worker alive, so it can still be cancelled
+        # after the pool has run it and before its result is handled
+        request.worker.setAutoDelete(False)
+        self._requests[request.owner] = request
+        self.thread_pool.start(request.worker)
+
+    def _cancel_request(self, request):
+        request.cancelled = True
+        # Drop it from the queue if no worker has picked it up yet
+        if request.worker is not None:
+            self.thread_pool.tryTake(request.worker)
+
+    def _is_on_page(self, owner, page):
+        return page is not None and (owner is page or page.isAncestorOf(owner))
+
+    def _on_page_changed(self, _index):
+        page = self._stacked_widget.currentWidget()
+
+        for owner, request in list(self._requests.items()):
+            if sip.isdeleted(owner):
+                self._requests.pop(owner)
+                self._cancel_request(request)
+            elif not self._is_on_page(owner, page):
+                logging.debug(f"Navigated away, cancelling load for {type(owner).__name__}")
+                self._requests.pop(owner)
+                self._cancel_request(request)
+                self._suspended[owner] = request
+
+        for owner, request in list(self._suspended.items()):
+            if sip.isdeleted(owner):
+                self._suspended.pop(owner)
+            elif self._is_on_page(owner, page):
+                self._suspended.pop(owner)
+                self._start(_Request(owner, request.fetch, request.on_result, request.on_error))
+
+    def _take_current(self, request):
+        """Returns True if the request is still the one its owner is waiting for"""
+        if self._one_shot.pop(request, None) is not None:
+            return request.owner is None or not sip.isdeleted(request.owner)
+        if request.cancelled or self._requests.get(request.owner) is not request:
+            return False
+        del self._requests[request.owner]
+        return not sip.isdeleted(request.owner)
+
+    @QtCore.pyqtSlot(object, object)
+    def _on_finished(self, request, result):
+        if self._take_current(request):
+            request.on_result(result)
+
+    @QtCore.pyqtSlot(object, object)
+    def _on_failed(self, request, error):
+        if not self._take_current(request):
+            return
+        logging.error(f"Background load failed: {error}")
+        if request.on_error is not None:
+            request.on_error(error)
@@ -1,6 +1,7 @@
 # This file is maintained for backwards compatibility
 # It now redirects all database connections to use Supabase
 from supabase_connection import create_connection as supabase_create_connection
+from supabase_connection import get_connection_stats, reset_connection
 
 def create_connection():
     """
@@ -10,7 +11,7 @@ def create_connection():
     was written for MySQL but has been migrated to Supabase.
     
     Returns:
-        A Supabase client connection instead of a MySQL connection
+        The shared, pooled Supabase client instead of a MySQL connection
     """
     return supabase_create_connection()
 
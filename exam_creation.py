@@ -1,17 +1,33 @@
+import logging
 from PyQt6 import QtWidgets, QtCore, QtGui
-from db_connection import create_connection
 from PyQt6.QtCore import QDate, QTime
+from question_bank import parse_question_file, save_exam_with_questions
+from exam_draft import ExamDraft
+
+# Milliseconds after the last edit before the current question is saved to the draft
+AUTOSAVE_DELAY_MS = 1000
 
 class ExamCreation(QtWidgets.QWidget):
-    def __init__(self, main_window, teacher_username):
+    def __init__(self, main_window, teacher_username, draft=None):
+        """
+        Args:
+            main_window: Main application window
+            teacher_username (str): Teacher creating the exam
+            draft (ExamDraft): Where the exam is kept until it is finished;
+                an unfinished exam in it is continued. Defaults to the
+                teacher's draft file, started afresh
+        """
         super().__init__()
         self.main_window = main_window
         self.teacher_username = teacher_username
         self.exam_id = None
-        self.questions = []
         self.current_question = 1
         self.total_questions = 0
+        # Questions are kept here, and on disk, until the exam is finished
+        self.draft = draft or ExamDraft(teacher_username)
         self.initUI()
+        if self.draft.exam is not None:
+            self.restore_draft()
 
     def initUI(self):
         # Main layout
@@ -870,6 +886,24 @@ class ExamCreation(QtWidgets.QWidget):
         start_btn.clicked.connect(self.start_questions)
         setup_layout.addWidget(start_btn)
         
+        import_btn = QtWidgets.QPushButton("Import Questions from File...")
+        import_btn.setStyleSheet('''
+            QPushButton {
+                background-color: white;
+                border: 1px solid #6C63FF;
+                border-radius: 5px;
+                color: #6C63FF;
+                padding: 10px;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #6C63FF;
+                color: white;
+            }
+        ''')
+        import_btn.clicked.connect(self.import_questions)
+        setup_layout.addWidget(import_btn)
+        
         # Question page
         self.question_page = QtWidgets.QWidget()
         question_layout = QtWidgets.QVBoxLayout(self.question_page)
@@ -936,7 +970,40 @@ class ExamCreation(QtWidgets.QWidget):
         self.correct_answer.addItems(["Select correct answer", "Option 1", "Option 2", "Option 3", "Option 4"])
         question_layout.addWidget(self.correct_answer)
         
+        # Save the question being typed to the draft once typing pauses,
+        # so a crash loses at most the last second
+        self.autosave_timer = QtCore.QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.autosave_question)
+        self.question_input.textChanged.connect(self.autosave_timer.start)
+        for option in [self.option1, self.option2, self.option3, self.option4]:
+            option.textChanged.connect(self.autosave_timer.start)
+        self.correct_answer.currentIndexChanged.connect(self.autosave_timer.start)
+        
         buttons_layout = QtWidgets.QHBoxLayout()
+        self.previous_btn = QtWidgets.QPushButton("Previous Question")
+        self.previous_btn.setStyleSheet('''
+            QPushButton {
+                background-color: white;
+                border: 1px solid #6C63FF;
+                border-radius: 5px;
+                color: #6C63FF;
+                padding: 8px 15px;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #6C63FF;
+                color: white;
+            }
+            QPushButton:disabled {
+                border-color: #ccc;
+                color: #ccc;
+            }
+        ''')
+        self.previous_btn.clicked.connect(self.previous_question)
+        self.previous_btn.setEnabled(False)
+        
         next_btn = QtWidgets.QPushButton("Next Question")
         next_btn.setStyleSheet('''
             QPushButton {
@@ -971,6 +1038,7 @@ class ExamCreation(QtWidgets.QWidget):
         self.finish_btn.clicked.connect(self.finish_exam)
         self.finish_btn.hide()  # Hide initially
         
+        buttons_layout.addWidget(self.previous_btn)
         buttons_layout.addWidget(next_btn)
         buttons_layout.addWidget(self.finish_btn)
         question_layout.addStretch()
@@ -1006,63 +1074,176 @@ class ExamCreation(QtWidgets.QWidget):
         end_time = QTime(hours, minutes, seconds)
         self.end_time.setTime(end_time)
 
-    def start_questions(self):
+    def exam_details(self):
+        """
+        Validates the exam details form
+
+        Returns:
+            dict: exams columns for the new exam, without status; None after
+            showing an error if the form is incomplete
+        """
         exam_name = self.exam_name.text().strip()
         
         if not exam_name:
             self.show_error("Please enter an exam name")
-            return
+            return None
             
         # Validate start and end times
         start_time = self.start_time.time()
         end_time = self.end_time.time()
         if end_time <= start_time:
             self.show_error("End time must be after start time")
+            return None
+        
+        # Calculate total duration in seconds instead of decimal minutes
+        total_duration_seconds = (self.duration_hours.value() * 3600) + (self.duration_minutes.value() * 60) + self.duration_seconds.value()
+        
+        # Convert date and times to format Supabase expects
+        return {
+            'name': exam_name,
+            'teacher_username': self.teacher_username,
+            'duration': total_duration_seconds,
+            'exam_date': self.exam_date.date().toPyDate().isoformat(),
+            'start_time': start_time.toPyTime().strftime('%H:%M:%S'),
+            'end_time': end_time.toPyTime().strftime('%H:%M:%S')
+        }
+
+    def start_questions(self):
+        exam = self.exam_details()
+        if exam is None:
             return
             
         self.total_questions = self.question_count.value()
-        self.current_question = 1
-        self.update_progress_label()
         
-        # If there's only one question, show the finish button right away
-        if self.total_questions == 1:
-            self.finish_btn.show()
+        # Nothing is written to the database until the exam is finished
+        try:
+            self.draft.start(exam, self.total_questions)
+        except OSError as e:
+            self.show_error(f"Error saving draft: {str(e)}")
+            return
         
-        # Calculate total duration in seconds instead of decimal minutes
-        total_duration_seconds = (self.duration_hours.value() * 3600) + (self.duration_minutes.value() * 60) + self.duration_seconds.value()
+        self.content_stack.setCurrentWidget(self.question_page)
+        self.show_question(1)
+
+    def restore_draft(self):
+        """Fills the form from the unfinished exam in self.draft and shows its current question"""
+        exam = self.draft.exam
+        self.exam_name.setText(exam['name'])
+        self.exam_date.setDate(QDate.fromString(exam['exam_date'], QtCore.Qt.DateFormat.ISODate))
+        self.duration_hours.setValue(exam['duration'] // 3600)
+        self.duration_minutes.setValue(exam['duration'] % 3600 // 60)
+        self.duration_seconds.setValue(exam['duration'] % 60)
+        self.start_time.setTime(QTime.fromString(exam['start_time'], 'HH:mm:ss'))
+        # Changing the duration or start time moves the end time, so set it last
+        self.end_time.setTime(QTime.fromString(exam['end_time'], 'HH:mm:ss'))
+        self.question_count.setValue(self.draft.total_questions)
         
+        self.total_questions = self.draft.total_questions
+        self.content_stack.setCurrentWidget(self.question_page)
+        self.show_question(min(max(self.draft.current_question, 1), self.total_questions))
+
+    def question_fields(self):
+        """Returns what is in the question form, as questions columns"""
+        return {
+            'question_text': self.question_input.toPlainText().strip(),
+            'option1': self.option1.text().strip(),
+            'option2': self.option2.text().strip(),
+            'option3': self.option3.text().strip(),
+            'option4': self.option4.text().strip(),
+            'correct_answer': self.correct_answer.currentText()
+        }
+
+    def show_question(self, number):
+        """Shows question number (from 1), with whatever the draft has for it"""
+        self.current_question = number
+        # Remember where the teacher is, to continue from here after a restart
+        self.draft.current_question = number
         try:
-            # Connect to Supabase
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-                
-            # Convert date and times to format Supabase expects
-            exam_date = self.exam_date.date().toPyDate().isoformat()
-            start_time_str = self.start_time.time().toPyTime().strftime('%H:%M:%S')
-            end_time_str = self.end_time.time().toPyTime().strftime('%H:%M:%S')
+            self.draft.save()
+        except OSError as e:
+            logging.warning(f"Failed to save exam draft: {e}")
+        fields = self.draft.question(number)
+        if fields is None:
+            self.clear_fields()
+        else:
+            self.question_input.setPlainText(fields['question_text'])
+            for option, field in zip([self.option1, self.option2, self.option3, self.option4],
+                                     ['option1', 'option2', 'option3', 'option4']):
+                option.setText(fields[field])
+            self.correct_answer.setCurrentIndex(max(self.correct_answer.findText(fields['correct_answer']), 0))
+        
+        self.autosave_timer.stop()  # Nothing was typed yet
+        self.update_progress_label()
+        self.previous_btn.setEnabled(number > 1)
+        # Show finish button on last question
+        self.finish_btn.setVisible(number == self.total_questions)
+
+    def import_questions(self):
+        """Creates the exam with every question from a CSV, JSONL or GIFT file in one go"""
+        exam = self.exam_details()
+        if exam is None:
+            return
+        
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Import Questions", "",
+            "Question files (*.csv *.jsonl *.gift *.txt);;All files (*)")
+        if not path:
+            return
+        
+        # The file is read and the exam saved in the background; the form
+        # stays locked until that is done, so the import can't start twice
+        dialog = QtWidgets.QProgressDialog("Reading questions...", None, 0, 0, self)
+        dialog.setWindowTitle("Import Questions")
+        dialog.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.setStyleSheet("color: black;")  # Ensure text is visible
+        dialog.show()
+        self.setup_page.setEnabled(False)
+        
+        def stop(message=None):
+            dialog.close()
+            self.setup_page.setEnabled(True)
+            if message:
+                self.show_error(message)
+        
+        def parsed(result):
+            questions, errors = result
+            # Nothing is saved unless every question is valid
+            if errors:
+                details = "\n".join(f"Line {line}: {error}" for line, error in errors[:10])
+                more = f"\n...and {len(errors) - 10} more" if len(errors) > 10 else ""
+                stop(f"{len(errors)} questions in the file are invalid:\n{details}{more}")
+                return
+            if not questions:
+                stop("The file has no questions")
+                return
             
-            # Insert the new exam - using seconds for duration
-            response = supabase.table('exams').insert({
-                'name': exam_name,
-                'teacher_username': self.teacher_username,
-                'duration': total_duration_seconds,
-                'status': 'draft',
-                'created_at': 'now()', # Use Supabase's now() function
-                'exam_date': exam_date,
-                'start_time': start_time_str,
-                'end_time': end_time_str
-            }).execute()
+            dialog.setLabelText(f"Creating exam with {len(questions)} questions...")
+            self.main_window.data_loader.run_once(
+                lambda: save_exam_with_questions(dict(exam, status='active'), questions),
+                lambda exam_id: saved(exam_id, len(questions)),
+                lambda e: stop(f"Error creating exam: {str(e)}"),
+                owner=self)
+        
+        def saved(exam_id, question_count):
+            stop()
+            self.exam_id = exam_id
             
-            # Get the exam ID from the response
-            if response.data and len(response.data) > 0:
-                self.exam_id = response.data[0]['id']
-                self.content_stack.setCurrentWidget(self.question_page)
-            else:
-                raise Exception("Failed to get exam ID after creation")
-                
-        except Exception as e:
-            self.show_error(f"Error creating exam: {str(e)}")
+            msg = QtWidgets.QMessageBox()
+            msg.setWindowTitle("Success")
+            msg.setText(f"Exam created and scheduled with {question_count} questions!")
+            msg.setInformativeText(f"Exam Date: {self.exam_date.date().toString('yyyy-MM-dd')}\nTime: {self.start_time.time().toString('hh:mm:ss')} - {self.end_time.time().toString('hh:mm:ss')}")
+            msg.setIcon(QtWidgets.QMessageBox.Icon.Information)
+            msg.exec()
+            
+            self.go_back()
+        
+        # One-shot jobs, so navigating away never saves the exam twice
+        self.main_window.data_loader.run_once(
+            lambda: parse_question_file(path),
+            parsed,
+            lambda e: stop(f"Error reading questions: {str(e)}"),
+            owner=self)
 
     def update_progress_label(self):
         self.progress_label.setText(f"Question {self.current_question} of {self.total_questions}")
@@ -1071,19 +1252,33 @@ class ExamCreation(QtWidgets.QWidget):
     def next_question(self):
         if self.save_question():
             if self.current_question < self.total_questions:
-                self.current_question += 1
-                self.update_progress_label()
-                self.clear_fields()
-            if self.current_question == self.total_questions:
-                self.finish_btn.show()  # Show finish button on last question
+                self.show_question(self.current_question + 1)
+
+    def autosave_question(self):
+        if self.draft.exam is None:
+            return  # Finished, or not started
+        try:
+            self.draft.set_question(self.current_question, self.question_fields())
+        except OSError as e:
+            logging.warning(f"Failed to save exam draft: {e}")
+
+    def previous_question(self):
+        # Keep what was typed, even if incomplete; it is checked again on the way forward
+        try:
+            self.draft.set_question(self.current_question, self.question_fields())
+        except OSError as e:
+            self.show_error(f"Error saving draft: {str(e)}")
+            return
+        self.show_question(self.current_question - 1)
 
     def save_question(self):
-        question_text = self.question_input.toPlainText().strip()
-        option1 = self.option1.text().strip()
-        option2 = self.option2.text().strip()
-        option3 = self.option3.text().strip()
-        option4 = self.option4.text().strip()
-        correct_answer = self.correct_answer.currentText()
+        fields = self.question_fields()
+        question_text = fields['question_text']
+        option1 = fields['option1']
+        option2 = fields['option2']
+        option3 = fields['option3']
+        option4 = fields['option4']
+        correct_answer = fields['correct_answer']
 
         if not question_text:
             self.show_error("Question cannot be empty")
@@ -1098,40 +1293,27 @@ class ExamCreation(QtWidgets.QWidget):
             return False
 
         try:
-            # Connect to Supabase
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-                
-            # Insert the question
-            supabase.table('questions').insert({
-                'exam_id': self.exam_id,
-                'question_text': question_text,
-                'option1': option1,
-                'option2': option2,
-                'option3': option3,
-                'option4': option4,
-                'correct_answer': correct_answer
-            }).execute()
-            
+            # Saved to the draft on disk; the database is only written on finish
+            self.autosave_timer.stop()
+            self.draft.set_question(self.current_question, fields)
             return True
-        except Exception as e:
+        except OSError as e:
             self.show_error(f"Error saving question: {str(e)}")
             return False
 
     def finish_exam(self):
         if self.save_question():
+            # Questions skipped with Previous may still be incomplete
+            invalid = self.draft.first_invalid_question()
+            if invalid is not None:
+                number, error = invalid
+                self.show_question(number)
+                self.show_error(f"Question {number}: {error}")
+                return
+            
             try:
-                # Connect to Supabase
-                supabase = create_connection()
-                if not supabase:
-                    raise Exception("Failed to connect to Supabase")
-                    
-                # Update the exam status
-                supabase.table('exams') \
-                    .update({'status': 'active'}) \
-                    .eq('id', self.exam_id) \
-                    .execute()
+                # The exam and all of its questions in one call
+                self.exam_id = self.draft.commit()
                 
                 msg = QtWidgets.QMessageBox()
                 msg.setWindowTitle("Success")
@@ -1153,6 +1335,10 @@ class ExamCreation(QtWidgets.QWidget):
         self.correct_answer.setCurrentIndex(0)
 
     def go_back(self):
+        # An unfinished exam stays in its draft, to be continued from Create Exam
+        self.autosave_timer.stop()
+        if self.content_stack.currentWidget() is self.question_page:
+            self.autosave_question()
         self.main_window.stackedWidget.setCurrentWidget(self.main_window.teacher_dashboard)
 
     def show_error(self, message):
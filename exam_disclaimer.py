@@ -1,5 +1,6 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 from styles import COMMON_STYLES
+from proctoring_loader import load_proctoring, prewarm_proctoring
 
 class ExamDisclaimerPage(QtWidgets.QWidget):
     def __init__(self, main_window, exam_id):
@@ -7,6 +8,8 @@ class ExamDisclaimerPage(QtWidgets.QWidget):
         self.main_window = main_window
         self.exam_id = exam_id
         self.initUI()
+        # Load OpenCV and gaze detection while the student reads the disclaimer
+        prewarm_proctoring()
         
     def initUI(self):
         # Main layout
@@ -127,10 +130,11 @@ class ExamDisclaimerPage(QtWidgets.QWidget):
         
     def continue_to_exam(self):
         try:
-            # Import here to avoid circular import
+            # Imported lazily: it pulls in OpenCV, which only proctored exams need.
+            # Usually already loaded in the background by prewarm_proctoring()
             print("Attempting to import ProctoredExamTaking...")
             
-            import exam_taking_proctored
+            exam_taking_proctored = load_proctoring()
             ProctoredExamTaking = exam_taking_proctored.ProctoredExamTaking
             print("Successfully imported ProctoredExamTaking")
             
@@ -152,13 +156,9 @@ class ExamDisclaimerPage(QtWidgets.QWidget):
             exam_taking_widget = ProctoredExamTaking(self.main_window, self.exam_id)
             print("Successfully created ProctoredExamTaking instance")
             
-            # Add widget to stacked widget
-            print("Adding widget to stacked widget...")
-            self.main_window.stackedWidget.addWidget(exam_taking_widget)
-            
-            # Switch to the exam taking widget
+            # Switch to the exam taking widget; this disclaimer page is deleted
             print("Switching to exam taking widget...")
-            self.main_window.stackedWidget.setCurrentWidget(exam_taking_widget)
+            self.main_window.navigation.show_transient(exam_taking_widget)
             print("Successfully navigated to exam")
             
         except ImportError as e:
@@ -180,8 +180,7 @@ class ExamDisclaimerPage(QtWidgets.QWidget):
             print("Falling back to standard exam taking")
             from exam_taking import ExamTaking
             exam_taking_widget = ExamTaking(self.main_window, self.exam_id)
-            self.main_window.stackedWidget.addWidget(exam_taking_widget)
-            self.main_window.stackedWidget.setCurrentWidget(exam_taking_widget)
+            self.main_window.navigation.show_transient(exam_taking_widget)
             
         except Exception as e:
             # General exception handling
@@ -203,8 +202,7 @@ class ExamDisclaimerPage(QtWidgets.QWidget):
                 print("Attempting fallback to standard exam taking")
                 from exam_taking import ExamTaking
                 exam_taking_widget = ExamTaking(self.main_window, self.exam_id)
-                self.main_window.stackedWidget.addWidget(exam_taking_widget)
-                self.main_window.stackedWidget.setCurrentWidget(exam_taking_widget)
+                self.main_window.navigation.show_transient(exam_taking_widget)
                 print("Successfully switched to non-proctored exam")
             except Exception as fallback_error:
                 print(f"Fallback also failed: {fallback_error}")
@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from question_bank import QUESTION_FIELDS, validate_question, save_exam_with_questions
+from supabase_connection import is_missing_rpc_error
+
+# Where unfinished exams are kept, one file per teacher
+DRAFTS_DIR = os.getenv("EXAM_DRAFTS_DIR", os.path.join(os.path.expanduser("~"), ".online_exam_system", "drafts"))
+
+# Draft exams in the database older than this are left over from the old
+# create-as-you-go flow (or an interrupted import) and can be deleted
+ORPHANED_DRAFT_HOURS = 24
+
+
+def _file_name(teacher_username):
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', teacher_username) + ".json"
+
+
+class ExamDraft:
+    """
+    An exam being written, kept on disk until it is finished.
+
+    The exam details and the questions typed so far are rewritten to a
+    JSON file on every change (via a temporary file, so a crash never
+    leaves half a file), and nothing touches the database until commit(),
+    which saves the exam with all of its questions in one call. Abandoning
+    an exam halfway leaves only the local file, which the next Create Exam
+    offers to continue.
+    """
+
+    def __init__(self, teacher_username, directory=None):
+        self.teacher_username = teacher_username
+        self.path = os.path.join(directory or DRAFTS_DIR, _file_name(teacher_username))
+        self.exam = None  # exams columns from the details form, without status
+        self.total_questions = 0
+        self.current_question = 1
+        self.questions = []  # Form fields of each question, None if not reached yet
+
+    @classmethod
+    def load(cls, teacher_username, directory=None):
+        """
+        Returns:
+            ExamDraft: The teacher's unfinished exam, or None if there isn't
+            one or its file can't be read
+        """
+        draft = cls(teacher_username, directory)
+        try:
+            with open(draft.path, encoding='utf-8') as f:
+                data = json.load(f)
+            draft.exam = data['exam']
+            draft.total_questions = data['total_questions']
+            draft.current_question = data.get('current_question', 1)
+            draft.questions = data.get('questions', [])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable exam draft {draft.path}: {e}")
+            return None
+        return draft
+
+    def start(self, exam, total_questions):
+        """Begins a new exam, replacing anything in the draft"""
+        self.exam = exam
+        self.total_questions = total_questions
+        self.current_question = 1
+        self.questions = []
+        self.save()
+
+    def question(self, number):
+        """Returns the fields saved for question number (from 1), or None"""
+        if number <= len(self.questions):
+            return self.questions[number - 1]
+        return None
+
+    def set_question(self, number, fields):
+        """Saves the form fields of question number (from 1) and makes it the current one"""
+        while len(self.questions) < number:
+            self.questions.append(None)
+        self.questions[number - 1] = {field: fields.get(field, '') for field in QUESTION_FIELDS}
+        self.current_question = number
+        self.save()
+
+    def written_count(self):
+        """Number of questions filled in completely"""
+        return sum(1 for question in self.questions if validate_question(question)[1] is None)
+
+    def first_invalid_question(self):
+        """
+        Returns:
+            tuple: (question number, error message) of the first question
+            that is missing or incomplete, or None if all of them are valid
+        """
+        for number in range(1, self.total_questions + 1):
+            _, error = validate_question(self.question(number))
+            if error is not None:
+                return number, error
+        return None
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'teacher_username': self.teacher_username,
+                'exam': self.exam,
+                'total_questions': self.total_questions,
+                'current_question': self.current_question,
+                'questions': self.questions,
+                'saved_at': datetime.now().isoformat(timespec='seconds'),
+            }, f)
+        os.replace(temporary_path, self.path)
+
+    def discard(self):
+        """Deletes the draft file and forgets the exam"""
+        self.exam = None
+        self.questions = []
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def commit(self):
+        """
+        Saves the exam and every question to the database in one call and
+        deletes the draft
+
+        Returns:
+            int: ID of the new exam
+
+        Raises:
+            ValueError: If a question is missing or incomplete
+        """
+        invalid = self.first_invalid_question()
+        if invalid is not None:
+            raise ValueError(f"Question {invalid[0]}: {invalid[1]}")
+
+        questions = [validate_question(self.question(number))[0] for number in range(1, self.total_questions + 1)]
+        exam_id = save_exam_with_questions(dict(self.exam, status='active'), questions)
+        self.discard()
+        return exam_id
+
+
+def delete_orphaned_drafts(supabase, older_than_hours=ORPHANED_DRAFT_HOURS):
+    """
+    Deletes draft exams, and their questions, that were never finished
+
+    Only drafts created more than older_than_hours ago and without any
+    results or answers are deleted. Uses the delete_orphaned_draft_exams()
+    database function, so the deletes happen in one transaction; falls back
+    to table queries if it hasn't been deployed yet.
+
+    Returns:
+        int: Number of exams deleted
+    """
+    try:
+        response = supabase.rpc('delete_orphaned_draft_exams', {
+            'p_older_than': f"{older_than_hours} hours"
+        }).execute()
+        return response.data
+    except Exception as e:
+        if not is_missing_rpc_error(e):
+            raise
+    logging.warning("delete_orphaned_draft_exams() is not deployed, deleting drafts with table queries")
+
+    # created_at is stored without a time zone, in the database's (UTC)
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=older_than_hours)).replace(tzinfo=None)
+    response = supabase.table('exams') \
+        .select('id') \
+        .eq('status', 'draft') \
+        .lt('created_at', cutoff.isoformat()) \
+        .execute()
+    exam_ids = {row['id'] for row in response.data}
+    for table in ('exam_results', 'student_answers'):
+        if exam_ids:
+            response = supabase.table(table).select('exam_id').in_('exam_id', list(exam_ids)).execute()
+            exam_ids -= {row['exam_id'] for row in response.data}
+    if not exam_ids:
+        return 0
+
+    exam_ids = sorted(exam_ids)
+    supabase.table('questions').delete().in_('exam_id', exam_ids).execute()
+    supabase.table('exams').delete().in_('id', exam_ids).eq('status', 'draft').execute()
+    return len(exam_ids)
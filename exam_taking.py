@@ -1,5 +1,7 @@
 from PyQt6 import QtWidgets, QtCore
-from supabase_connection import create_connection
+from supabase_connection import create_connection, record_answers, is_missing_rpc_error
+from answer_journal import AnswerJournal
+from grading import fetch_answer_key, grade_answers, build_answer_rows
 import logging
 import datetime
 
@@ -16,6 +18,7 @@ class ExamTaking(QtWidgets.QWidget):
         self.answers = {}
         self.exam_duration = 0  # Duration in minutes
         self.remaining_time = 0  # Remaining time in seconds
+        self.answer_journal = None  # Created on the first selected answer
         
         # Initialize timer
         self.timer = QtCore.QTimer()
@@ -345,116 +348,89 @@ class ExamTaking(QtWidgets.QWidget):
         else:
             logging.warning(f"Invalid question index: {index}")
 
+    def get_answer_journal(self):
+        """Return the write-behind journal for this attempt, creating it on first use"""
+        if self.answer_journal is None:
+            journal = AnswerJournal(self.exam_id, self.main_window.current_user)
+            # The page is deleted when navigated away from, possibly without
+            # a submit; write what is buffered and stop the worker then, in
+            # the background. Does nothing if the attempt was already closed.
+            self.destroyed.connect(lambda: journal.close(wait=False))
+            self.answer_journal = journal
+        return self.answer_journal
+
     def save_answer(self, question_id, option_index):
         self.answers[question_id] = option_index
         logging.debug(f"Saved answer for question {question_id}: option {option_index}")
         
-        # Update exam_results in real-time
-        try:
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-            
-            # Get the correct answer to check if this response is correct
-            response = supabase.table('questions') \
-                .select('correct_answer, option1, option2, option3, option4') \
-                .eq('id', question_id) \
-                .execute()
-            
-            if response.data:
-                question = response.data[0]
-                correct_answer = question['correct_answer']
-                options = [question['option1'], question['option2'], question['option3'], question['option4']]
-                selected_option = options[option_index]
-                
-                # Fixed correct answer comparison logic - compare with the actual option text
-                # The correct_answer field stores the text, like "Option X", but we need to match with actual content
-                
-                # Convert from "Option X" format to index
-                option_index_map = {"Option 1": 0, "Option 2": 1, "Option 3": 2, "Option 4": 3}
-                if correct_answer in option_index_map:
-                    correct_index = option_index_map[correct_answer]
-                    correct_option_text = options[correct_index]
-                    is_correct = (selected_option == correct_option_text)
-                else:
-                    # Fallback to direct match (if correct_answer is stored as the actual text)
-                    is_correct = (selected_option == correct_answer)
-                
-                # Log comparison details to help debug
-                logging.debug(f"Answer comparison: selected='{selected_option}', correct='{correct_answer}', is_correct={is_correct}")
-                
-                # Check if this student has already answered this question
-                existing_answer = supabase.table('student_answers') \
-                    .select('id') \
-                    .eq('exam_id', self.exam_id) \
-                    .eq('question_id', question_id) \
-                    .eq('student_username', self.main_window.current_user) \
-                    .execute()
-                
-                if existing_answer.data:
-                    # Update existing answer
-                    supabase.table('student_answers') \
-                        .update({
-                            'selected_answer': selected_option,
-                            'is_correct': is_correct
-                        }) \
-                        .eq('id', existing_answer.data[0]['id']) \
-                        .execute()
-                else:
-                    # Create new answer
-                    supabase.table('student_answers').insert({
-                        'exam_id': self.exam_id,
-                        'question_id': question_id,
-                        'student_username': self.main_window.current_user,
-                        'selected_answer': selected_option,
-                        'is_correct': is_correct
-                    }).execute()
-                
-                # Count all correct answers so far to update the score
-                correct_count_response = supabase.table('student_answers') \
-                    .select('id') \
-                    .eq('exam_id', self.exam_id) \
-                    .eq('student_username', self.main_window.current_user) \
-                    .eq('is_correct', True) \
-                    .execute()
-                
-                correct_count = len(correct_count_response.data)
-                
-                # Check if there's an existing exam result
-                result_response = supabase.table('exam_results') \
-                    .select('id') \
-                    .eq('exam_id', self.exam_id) \
-                    .eq('student_username', self.main_window.current_user) \
-                    .execute()
-                
-                if result_response.data:
-                    # Update existing result with current score
-                    supabase.table('exam_results') \
-                        .update({'score': correct_count}) \
-                        .eq('id', result_response.data[0]['id']) \
-                        .execute()
-                else:
-                    # Create new result entry with initial score
-                    supabase.table('exam_results').insert({
-                        'exam_id': self.exam_id,
-                        'student_username': self.main_window.current_user,
-                        'score': correct_count
-                        # Don't set completed_at until the exam is fully submitted
-                    }).execute()
-        except Exception as e:
-            logging.error(f"Error updating exam result in real-time: {e}")
-            # Don't show error to user to avoid interrupting the exam experience
+        # Record the selection locally; the journal writes it to student_answers
+        # in the background so the click never waits on the network
+        for q_id, _, option1, option2, option3, option4 in self.questions:
+            if q_id == question_id:
+                selected_option = [option1, option2, option3, option4][option_index]
+                self.get_answer_journal().record(question_id, selected_option)
+                break
+
+    def close_answer_journal(self, flush=True):
+        """Stop the journal for this attempt; buffered answers are dropped unless flush is True"""
+        journal = self.answer_journal
+        if journal is not None:
+            journal.close(flush=flush)
+            self.answer_journal = None
+        return journal
+
+    def flush_answers(self, wait=False):
+        if self.answer_journal is not None:
+            self.answer_journal.flush(wait=wait)
+
+    def hideEvent(self, event):
+        # Don't leave answers sitting in the journal when the exam is left
+        self.flush_answers()
+        super().hideEvent(event)
 
     def prev_question(self):
+        self.flush_answers()
         if self.current_question_index > 0:
             self.current_question_index -= 1
             self.display_question(self.current_question_index)
 
     def next_question(self):
+        self.flush_answers()
         if self.current_question_index < len(self.questions) - 1:
             self.current_question_index += 1
             self.display_question(self.current_question_index)
 
+    def selected_answer_texts(self):
+        """Returns question_id -> selected option text for every answered question"""
+        selected = {}
+        for q_id, _, option1, option2, option3, option4 in self.questions:
+            if q_id in self.answers:
+                selected[q_id] = [option1, option2, option3, option4][self.answers[q_id]]
+        return selected
+
+    def save_graded_answers(self, supabase, answer_key):
+        """Grades the attempt in memory and saves it with plain upserts; returns the score"""
+        graded = grade_answers(answer_key, self.answers)
+        correct_count = sum(1 for _, is_correct in graded.values() if is_correct)
+        
+        # Ensure every answer is saved with one bulk upsert
+        answer_rows = build_answer_rows(self.exam_id, self.main_window.current_user, graded)
+        if answer_rows:
+            supabase.table('student_answers') \
+                .upsert(answer_rows, on_conflict='exam_id,question_id,student_username') \
+                .execute()
+        
+        # Create or update the result with the accurate score
+        supabase.table('exam_results') \
+            .upsert({
+                'exam_id': self.exam_id,
+                'student_username': self.main_window.current_user,
+                'score': correct_count,
+                'completed_at': datetime.datetime.now().isoformat()
+            }, on_conflict='exam_id,student_username') \
+            .execute()
+        return correct_count
+
     def submit_exam(self):
         try:
             # Get current score from the database
@@ -462,85 +438,29 @@ class ExamTaking(QtWidgets.QWidget):
             if not supabase:
                 raise Exception("Failed to connect to Supabase")
             
-            # Process any unanswered questions and ensure accurate score calculation
             total_questions = len(self.questions)
-            correct_count = 0
             
-            # Check all questions and answers
-            for question_id, _, _, _, _, _ in self.questions:
-                if question_id in self.answers:
-                    # Get the correct answer
-                    response = supabase.table('questions') \
-                        .select('correct_answer, option1, option2, option3, option4') \
-                        .eq('id', question_id) \
-                        .execute()
-                    
-                    if response.data:
-                        question = response.data[0]
-                        correct_answer = question['correct_answer']
-                        options = [question['option1'], question['option2'], question['option3'], question['option4']]
-                        selected_option = options[self.answers[question_id]]
-                        
-                        # Fixed correct answer comparison logic
-                        option_index_map = {"Option 1": 0, "Option 2": 1, "Option 3": 2, "Option 4": 3}
-                        if correct_answer in option_index_map:
-                            correct_index = option_index_map[correct_answer]
-                            correct_option_text = options[correct_index]
-                            is_correct = (selected_option == correct_option_text)
-                        else:
-                            # Fallback to direct match (if correct_answer is stored as the actual text)
-                            is_correct = (selected_option == correct_answer)
-                        
-                        if is_correct:
-                            correct_count += 1
-                        
-                        # Log comparison details to help debug
-                        logging.debug(f"Submit check: selected='{selected_option}', correct='{correct_answer}', is_correct={is_correct}")
-                        
-                        # Ensure student's answer is saved
-                        # Check if this answer already exists
-                        existing_answer = supabase.table('student_answers') \
-                            .select('id') \
-                            .eq('exam_id', self.exam_id) \
-                            .eq('question_id', question_id) \
-                            .eq('student_username', self.main_window.current_user) \
-                            .execute()
-                        
-                        if not existing_answer.data:
-                            # Save only if not already saved
-                            supabase.table('student_answers').insert({
-                                'exam_id': self.exam_id,
-                                'question_id': question_id,
-                                'student_username': self.main_window.current_user,
-                                'selected_answer': selected_option,
-                                'is_correct': is_correct
-                            }).execute()
+            # The submission below covers anything still buffered. A write
+            # already in flight can't undo it: record_answers() leaves
+            # completed attempts alone.
+            journal = self.close_answer_journal(flush=False)
             
-            # Get existing result or create a new one
-            result_response = supabase.table('exam_results') \
-                .select('id') \
-                .eq('exam_id', self.exam_id) \
-                .eq('student_username', self.main_window.current_user) \
-                .execute()
-            
-            if result_response.data:
-                # Update existing result with accurate score
-                result_id = result_response.data[0]['id']
-                supabase.table('exam_results') \
-                    .update({
-                        'score': correct_count,
-                        'completed_at': datetime.datetime.now().isoformat()
-                    }) \
-                    .eq('id', result_id) \
-                    .execute()
-            else:
-                # Create a new result entry
-                supabase.table('exam_results').insert({
-                    'exam_id': self.exam_id,
-                    'student_username': self.main_window.current_user,
-                    'score': correct_count,
-                    'completed_at': datetime.datetime.now().isoformat()
-                }).execute()
+            try:
+                # Save every answer and finalise the score in one call
+                correct_count = record_answers(
+                    self.exam_id,
+                    self.main_window.current_user,
+                    self.selected_answer_texts(),
+                    completed=True
+                )
+            except Exception as e:
+                if not is_missing_rpc_error(e):
+                    raise
+                logging.warning("record_answers() is not deployed, grading the exam locally")
+                answer_key = journal.get_answer_key(supabase) if journal is not None \
+                    else fetch_answer_key(supabase, self.exam_id)
+                correct_count = self.save_graded_answers(supabase, answer_key)
+            logging.debug(f"Submit check: {correct_count}/{total_questions} correct")
             
             # Show result with additional info about where to view results
             msg = QtWidgets.QMessageBox()
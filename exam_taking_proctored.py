@@ -11,19 +11,29 @@ GAZE_DETECTION_AVAILABLE = False
 # Import gaze detection with error handling
 try:
     from gaze_detection import GazeDetection
+    from frame_scheduler import AdaptiveFrameScheduler, read_latest_frame
+    from camera_preview import CameraPreview
+    from gaze_process import GazeProcess, GazeProcessError
+    from face_detectors import HaarFaceDetector, detector_name
     import cv2
     import numpy as np
     import os
     
-    # Verify OpenCV Haar cascade files exist
+    # Verify OpenCV Haar cascade files exist; only the Haar detector needs them,
+    # the other detectors check for their model files when they are created
     face_cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
     eye_cascade_path = cv2.data.haarcascades + 'haarcascade_eye.xml'
     
-    if not os.path.exists(face_cascade_path) or not os.path.exists(eye_cascade_path):
+    if detector_name() != HaarFaceDetector.name:
+        GAZE_DETECTION_AVAILABLE = True
+    elif not os.path.exists(face_cascade_path) or not os.path.exists(eye_cascade_path):
         logging.error(f"Required OpenCV Haar cascade files not found")
         GAZE_DETECTION_AVAILABLE = False
     else:
         GAZE_DETECTION_AVAILABLE = True
+    
+    # Set PROCTOR_GAZE_PROCESS=1 to run gaze detection in a separate process
+    USE_GAZE_PROCESS = os.getenv("PROCTOR_GAZE_PROCESS", "0") == "1"
         
 except ImportError as e:
     logging.error(f"Failed to import gaze detection modules: {e}")
@@ -32,6 +42,8 @@ except ImportError as e:
 class ProctoredExamTaking(QtWidgets.QWidget):
     # Signal for gaze status updates
     gaze_status_signal = QtCore.pyqtSignal(dict)
+    # Signal carrying camera preview thumbnails
+    camera_frame_signal = QtCore.pyqtSignal(QtGui.QImage)
     
     def __init__(self, main_window, exam_id):
         global GAZE_DETECTION_AVAILABLE
@@ -50,10 +62,14 @@ class ProctoredExamTaking(QtWidgets.QWidget):
                 try:
                     self.gaze_detector = GazeDetection(timeout_seconds=15)  # 15 seconds of looking away is a violation
                     self.camera_thread = None
+                    self.camera_stop = None  # Stop flag of the current camera thread
                     self.is_camera_running = False
+                    # Set on the GUI thread; the camera thread only reads it
+                    self.preview_visible = False
                     
                     # Connect the gaze status signal to the update function
                     self.gaze_status_signal.connect(self.update_gaze_status)
+                    self.camera_frame_signal.connect(self.set_camera_preview)
                     logging.info("Gaze detection initialized successfully")
                 except Exception as init_error:
                     logging.error(f"Failed to initialize gaze detection: {init_error}")
@@ -115,7 +131,9 @@ class ProctoredExamTaking(QtWidgets.QWidget):
                 self.camera_preview.setFixedSize(120, 90)
                 self.camera_preview.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
                 self.camera_preview.setStyleSheet("border: 1px solid #666; background-color: #222;")
+                self.camera_preview.setScaledContents(True)
                 status_layout.addWidget(self.camera_preview)
+                self.preview_renderer = CameraPreview(self.camera_preview.width(), self.camera_preview.height())
                 
                 # Status information
                 status_info = QtWidgets.QVBoxLayout()
@@ -189,6 +207,7 @@ class ProctoredExamTaking(QtWidgets.QWidget):
         # Start in fullscreen and enable camera if available
         global GAZE_DETECTION_AVAILABLE
         if GAZE_DETECTION_AVAILABLE:
+            self.preview_visible = True
             QtCore.QTimer.singleShot(500, self.enter_fullscreen)
             QtCore.QTimer.singleShot(1000, self.start_camera)
     
@@ -196,6 +215,7 @@ class ProctoredExamTaking(QtWidgets.QWidget):
         """Called when the widget is hidden"""
         global GAZE_DETECTION_AVAILABLE
         if GAZE_DETECTION_AVAILABLE:
+            self.preview_visible = False
             self.stop_camera()
             self.exit_fullscreen()
         super().hideEvent(event)
@@ -228,7 +248,12 @@ class ProctoredExamTaking(QtWidgets.QWidget):
         
         if not self.is_camera_running:
             self.is_camera_running = True
-            self.camera_thread = threading.Thread(target=self.camera_worker)
+            # Each camera thread gets its own stop flag and gaze worker process,
+            # so one still winding down after stop_camera() can't touch the next
+            self.camera_stop = threading.Event()
+            # Started by the camera thread once the frame size is known
+            gaze_process = GazeProcess(timeout_seconds=15) if USE_GAZE_PROCESS else None
+            self.camera_thread = threading.Thread(target=self.camera_worker, args=(self.camera_stop, gaze_process))
             self.camera_thread.daemon = True
             self.camera_thread.start()
     
@@ -240,11 +265,21 @@ class ProctoredExamTaking(QtWidgets.QWidget):
             
         self.is_camera_running = False
         if self.camera_thread:
+            self.camera_stop.set()
+            # Stopping the thread's gaze worker process may take longer; the
+            # thread finishes that on its own
             self.camera_thread.join(timeout=1.0)
             self.camera_thread = None
     
-    def camera_worker(self):
-        """Worker function that runs in a separate thread to process camera frames"""
+    def camera_worker(self, stop, gaze_process=None):
+        """
+        Worker function that runs in a separate thread to process camera frames
+
+        Args:
+            stop (threading.Event): Set by stop_camera() to end this thread
+            gaze_process (GazeProcess): Worker process to analyse frames in,
+                owned and stopped by this thread; None to analyse in-process
+        """
         global GAZE_DETECTION_AVAILABLE
         if not GAZE_DETECTION_AVAILABLE:
             return
@@ -264,33 +299,63 @@ class ProctoredExamTaking(QtWidgets.QWidget):
                 })
                 return
                 
+            # Keep the driver's queue short; anything still buffered is skipped below
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.frame_scheduler = AdaptiveFrameScheduler()
+            next_analysis = time.monotonic()
+            
             try:
-                while self.is_camera_running:
-                    # Read frame
-                    ret, frame = cap.read()
+                while not stop.is_set():
+                    # Read the newest frame rather than working through a backlog
+                    captured_at = time.monotonic()
+                    ret, frame, dropped = read_latest_frame(cap)
                     if not ret:
                         logging.error("Failed to capture frame")
+                        time.sleep(self.frame_scheduler.idle_delay())
                         continue
                     
-                    # Process frame with gaze detection
-                    result = self.gaze_detector.process_frame(frame)
-                    
-                    # Emit the status to the main thread
-                    self.gaze_status_signal.emit(result)
-                    
-                    # Update the camera preview
+                    # The preview follows every captured frame, at its own rate
                     self.update_camera_preview(frame)
                     
-                    # Check if we need to record a violation
-                    if result["is_timeout"]:
-                        self.record_violation("Looking away for too long")
+                    if time.monotonic() >= next_analysis:
+                        # Process frame with gaze detection
+                        self.frame_scheduler.frame_started(dropped)
+                        if gaze_process is not None:
+                            try:
+                                result = self.analyze_frame(frame, gaze_process)
+                            except (GazeProcessError, ValueError) as e:
+                                logging.error(f"Gaze worker process failed, continuing in-process: {e}")
+                                gaze_process.stop()
+                                gaze_process = None
+                        if gaze_process is None:
+                            result = self.analyze_frame(frame)
+                        if result is None:
+                            # The gaze worker process didn't answer in time
+                            next_analysis = time.monotonic() + self.frame_scheduler.idle_delay()
+                        else:
+                            # Emit the status to the main thread; violations are
+                            # recorded there since they update the UI
+                            self.gaze_status_signal.emit(result)
+                            
+                            # Wait according to how busy the scene is and how long this frame took
+                            next_analysis = time.monotonic() + self.frame_scheduler.frame_finished(result)
                     
-                    # Sleep for a bit to reduce CPU usage
-                    time.sleep(0.1)
+                    # Wake for the next preview frame, or only for the next analysis while the
+                    # preview is hidden
+                    wake_at = next_analysis
+                    if self.preview_visible:
+                        next_preview = self.preview_renderer.next_render_at()
+                        if next_preview <= time.monotonic():
+                            # Still waiting for the GUI to show the last one
+                            next_preview = captured_at + self.preview_renderer.interval
+                        wake_at = min(wake_at, next_preview)
+                    time.sleep(max(0.0, wake_at - time.monotonic()))
                     
             finally:
-                # Make sure we release the camera
+                # Make sure we release the camera and stop the gaze worker process
                 cap.release()
+                if gaze_process is not None:
+                    gaze_process.stop()
         except Exception as e:
             logging.error(f"Camera worker error: {e}")
             self.gaze_status_signal.emit({
@@ -302,40 +367,30 @@ class ProctoredExamTaking(QtWidgets.QWidget):
                 "is_timeout": False
             })
     
+    def analyze_frame(self, frame, gaze_process=None):
+        """Run gaze detection on a frame, in gaze_process if given (called in camera thread)"""
+        if gaze_process is not None:
+            if not gaze_process.is_running():
+                gaze_process.start(frame.shape)
+            return gaze_process.process_frame(frame)
+        
+        return self.gaze_detector.process_frame(frame)
+    
     def update_camera_preview(self, frame):
-        """Update the camera preview with the current frame"""
+        """Send a preview thumbnail of the frame to the main thread (called in camera thread)"""
         try:
-            # Convert the OpenCV BGR image to RGB for Qt
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Resize the frame to fit the preview
-            preview_width = self.camera_preview.width()
-            preview_height = self.camera_preview.height()
-            resized_frame = cv2.resize(rgb_frame, (preview_width, preview_height))
-            
-            # Convert to QImage
-            h, w, c = resized_frame.shape
-            bytes_per_line = c * w
-            q_img = QtGui.QImage(resized_frame.data, w, h, bytes_per_line, QtGui.QImage.Format.Format_RGB888)
-            
-            # Convert to QPixmap and set to label
-            pixmap = QtGui.QPixmap.fromImage(q_img)
-            
-            # Use signal to update UI in main thread
-            QtCore.QMetaObject.invokeMethod(
-                self, 
-                "set_camera_preview", 
-                QtCore.Qt.ConnectionType.QueuedConnection,
-                QtCore.Q_ARG(QtGui.QPixmap, pixmap)
-            )
+            # Throttled to the preview rate and skipped while the preview can't be seen
+            image = self.preview_renderer.render(frame, visible=self.preview_visible)
+            if image is not None:
+                self.camera_frame_signal.emit(image)
         except Exception as e:
             logging.error(f"Error updating camera preview: {e}")
     
-    @QtCore.pyqtSlot(QtGui.QPixmap)
-    def set_camera_preview(self, pixmap):
-        """Set the camera preview pixmap (called in main thread)"""
-        self.camera_preview.setPixmap(pixmap)
-        self.camera_preview.setScaledContents(True)
+    def set_camera_preview(self, image):
+        """Set the camera preview image (called in main thread)"""
+        # fromImage copies the pixels, after which the renderer may reuse its buffer
+        self.camera_preview.setPixmap(QtGui.QPixmap.fromImage(image))
+        self.preview_renderer.frame_shown()
     
     def update_gaze_status(self, result):
         """Update the UI with the current gaze status (called in main thread)"""
@@ -388,8 +443,7 @@ class ProctoredExamTaking(QtWidgets.QWidget):
         # Check for timeout
         if result["is_timeout"]:
             # This is a long-term timeout (e.g., not facing camera for 60 seconds)
-            # We may want to handle this differently than the 10-second violations
-            pass
+            self.record_violation("Looking away for too long")
     
     def record_violation(self, reason):
         """Record a proctoring violation"""
@@ -465,11 +519,8 @@ class ProctoredExamTaking(QtWidgets.QWidget):
         # Submit a zero score for the exam
         self.submit_zero_score()
         
-        # Return to the dashboard
-        from student_dashboard import StudentDashboard
-        dashboard = StudentDashboard(self.main_window)
-        self.main_window.stackedWidget.addWidget(dashboard)
-        self.main_window.stackedWidget.setCurrentWidget(dashboard)
+        # Return to the dashboard; this exam page is deleted once it is left
+        self.main_window.stackedWidget.setCurrentWidget(self.main_window.student_dashboard)
     
     def submit_zero_score(self):
         """Submit a score of zero for the exam due to proctoring violations"""
@@ -480,13 +531,18 @@ class ProctoredExamTaking(QtWidgets.QWidget):
             # Get the current user
             student_username = self.main_window.current_user
             
-            # Submit a zero score using the existing schema
-            response = supabase.table('exam_results').insert({
+            # Drop any buffered answers first; writing them would recount
+            # the score over the zero below
+            self.exam_widget.close_answer_journal(flush=False)
+            
+            # The result row usually exists already, created by the first
+            # saved answer, so overwrite its score
+            response = supabase.table('exam_results').upsert({
                 'exam_id': self.exam_id,
                 'student_username': student_username,
                 'score': 0,
                 'completed_at': datetime.datetime.now().isoformat()
-            }).execute()
+            }, on_conflict='exam_id,student_username').execute()
             
             logging.info(f"Submitted zero score for {student_username} due to proctoring violations")
             
@@ -0,0 +1,373 @@
+import os
+import logging
+from abc import ABC, abstractmethod
+import cv2
+
+# Default detector, overridable with the GAZE_DETECTOR environment variable
+DEFAULT_DETECTOR = "haar"
+
+# Model files for the detectors that need one; see the README for downloads
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+DNN_MODEL_PATH = os.path.join(MODELS_DIR, "face_detection_yunet_2023mar.onnx")
+MEDIAPIPE_MODEL_PATH = os.path.join(MODELS_DIR, "face_landmarker.task")
+
+# Smallest face the Haar detector looks for, in camera pixels
+MIN_FACE_SIZE = 30
+
+
+def detector_name(name=None):
+    """Resolves the detector to use: the given name, else GAZE_DETECTOR, else the default"""
+    return (name or os.getenv("GAZE_DETECTOR") or DEFAULT_DETECTOR).lower()
+
+
+def landmarks_facing(left_eye, right_eye, nose, face_height):
+    """
+    Decides from three facial landmarks whether a face is turned to the camera
+
+    The eyes have to be level (within 10% of the face height, like the Haar
+    eye check) and the nose has to sit roughly midway between them; a turned
+    head pushes the nose towards one eye.
+
+    Args:
+        left_eye, right_eye, nose: (x, y) points in the same coordinates
+        face_height (float): Height of the face box
+
+    Returns:
+        bool: True if the face looks straight at the camera
+    """
+    eye_distance = abs(right_eye[0] - left_eye[0])
+    if eye_distance == 0:
+        return False
+    if abs(left_eye[1] - right_eye[1]) >= 0.1 * face_height:
+        return False
+    eye_mid_x = (left_eye[0] + right_eye[0]) / 2
+    return abs(nose[0] - eye_mid_x) < 0.25 * eye_distance
+
+
+class FaceDetector(ABC):
+    """
+    Interface for the face detectors GazeDetection can use.
+
+    detect() gets the full-resolution BGR frame together with the grayscale
+    working frame from GazeDetection.prepare_frame() and the scale between
+    them, and returns the face in full-resolution coordinates and whether it
+    is facing the camera.
+    """
+
+    name = None
+
+    @abstractmethod
+    def detect(self, frame, gray, scale):
+        """
+        Args:
+            frame: OpenCV BGR image frame
+            gray: Downscaled grayscale frame
+            scale (float): Scale from frame to gray coordinates
+
+        Returns:
+            tuple: ((x, y, w, h) or None, is_facing_camera)
+        """
+
+    def reset(self):
+        """Forget any state carried between frames"""
+
+    def close(self):
+        """Release native resources"""
+
+
+class HaarFaceDetector(FaceDetector):
+    """
+    Haar cascade face detection with an eye check for facing the camera.
+
+    The face is found on the downscaled working frame, searching a padded
+    window around the previous face when there is one; eyes are then looked
+    for in the full-resolution face region. The eye check is the expensive
+    part, so while the face holds still its last answer is reused for up to
+    eye_check_interval frames.
+    """
+
+    name = "haar"
+
+    def __init__(self, roi_padding=0.5, full_search_interval=15, eye_check_interval=5, eye_recheck_motion=0.15):
+        """
+        Args:
+            roi_padding (float): Padding around the last face, as a fraction of its
+                size, that is searched before falling back to the whole frame
+            full_search_interval (int): Search the whole frame at least every this
+                many frames even while the face is being tracked
+            eye_check_interval (int): Run eye detection at least every this many
+                frames; 1 checks every frame
+            eye_recheck_motion (float): Check the eyes straight away when the face
+                moves or resizes by more than this fraction of its size
+        """
+        face_cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        eye_cascade_path = cv2.data.haarcascades + 'haarcascade_eye.xml'
+
+        # Verify that the cascade files exist
+        if not os.path.exists(face_cascade_path):
+            raise FileNotFoundError(f"Face cascade file not found: {face_cascade_path}")
+        if not os.path.exists(eye_cascade_path):
+            raise FileNotFoundError(f"Eye cascade file not found: {eye_cascade_path}")
+
+        # Load the cascades
+        self.face_cascade = cv2.CascadeClassifier(face_cascade_path)
+        self.eye_cascade = cv2.CascadeClassifier(eye_cascade_path)
+
+        self.roi_padding = roi_padding
+        self.full_search_interval = full_search_interval
+
+        # Face tracking state, in working-resolution coordinates
+        self.last_face = None
+        self.frames_since_full_search = 0
+        self.last_search = None  # 'roi' or 'full'
+
+        # Eye check state, in full-resolution coordinates
+        self.eye_check_interval = eye_check_interval
+        self.eye_recheck_motion = eye_recheck_motion
+        self.eye_checked_face = None
+        self.eye_checked_facing = False
+        self.frames_since_eye_check = 0
+        self.eye_checks = 0
+
+    def _search_window(self, gray):
+        """Returns the padded window around the last face, or None for a full search"""
+        if self.last_face is None or self.frames_since_full_search >= self.full_search_interval:
+            return None
+
+        x, y, w, h = self.last_face
+        pad_x = int(w * self.roi_padding)
+        pad_y = int(h * self.roi_padding)
+        x0 = max(0, x - pad_x)
+        y0 = max(0, y - pad_y)
+        x1 = min(gray.shape[1], x + w + pad_x)
+        y1 = min(gray.shape[0], y + h + pad_y)
+        return x0, y0, x1, y1
+
+    def _find_face(self, gray, scale):
+        """Finds the largest face, searching around the last one first"""
+        # The same smallest face as at camera resolution, in working pixels
+        min_face = max(1, round(MIN_FACE_SIZE * scale))
+
+        window = self._search_window(gray)
+        if window is not None:
+            x0, y0, x1, y1 = window
+            # The face can't have shrunk much between consecutive frames
+            min_size = max(min_face, int(min(self.last_face[2], self.last_face[3]) * 0.5))
+            faces = self.face_cascade.detectMultiScale(
+                gray[y0:y1, x0:x1],
+                scaleFactor=1.1,
+                minNeighbors=5,
+                minSize=(min_size, min_size)
+            )
+            self.frames_since_full_search += 1
+            if len(faces) > 0:
+                self.last_search = 'roi'
+                x, y, w, h = max(faces, key=lambda face: face[2] * face[3])
+                return x + x0, y + y0, w, h
+
+        # Lost the face (or due for a refresh): search the whole frame
+        faces = self.face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=1.1,
+            minNeighbors=5,
+            minSize=(min_face, min_face)
+        )
+        self.frames_since_full_search = 0
+        self.last_search = 'full'
+        if len(faces) == 0:
+            return None
+
+        # Get the largest face (assuming it's the user)
+        return max(faces, key=lambda face: face[2] * face[3])
+
+    def detect(self, frame, gray, scale):
+        face = self._find_face(gray, scale)
+        self.last_face = tuple(int(v) for v in face) if face is not None else None
+        if face is None:
+            self.eye_checked_face = None
+            return None, False
+
+        # Map the face back to full-resolution coordinates
+        face = tuple(int(round(v / scale)) for v in face)
+        self.frames_since_eye_check += 1
+        if self._eyes_due(face):
+            self.eye_checked_facing = self._check_eyes(frame, face)
+            self.eye_checked_face = face
+            self.frames_since_eye_check = 0
+            self.eye_checks += 1
+        return face, self.eye_checked_facing
+
+    def _eyes_due(self, face):
+        """True if the eyes need checking again for this face"""
+        if self.eye_checked_face is None or self.frames_since_eye_check >= self.eye_check_interval:
+            return True
+        x, y, w, h = face
+        last_x, last_y, last_w, last_h = self.eye_checked_face
+        limit = self.eye_recheck_motion * max(last_w, last_h)
+        return (abs(x - last_x) > limit or abs(y - last_y) > limit
+                or abs(w - last_w) > limit or abs(h - last_h) > limit)
+
+    def _check_eyes(self, frame, face):
+        """Runs the eye cascade on a full-resolution face region"""
+        x, y, w, h = face
+
+        # Extract face region and detect eyes at full resolution;
+        # only the face is converted to grayscale
+        roi_gray = cv2.cvtColor(frame[y:y+h, x:x+w], cv2.COLOR_BGR2GRAY)
+        eyes = self.eye_cascade.detectMultiScale(
+            roi_gray,
+            scaleFactor=1.1,
+            minNeighbors=5,
+            minSize=(20, 20)
+        )
+
+        # If we have at least two eyes and they're roughly at the same height
+        # (within 10% of face height), consider the user to be facing the camera
+        if len(eyes) < 2:
+            return False
+        eyes = sorted(eyes, key=lambda e: e[0])
+        eye1_y = eyes[0][1] + eyes[0][3]/2
+        eye2_y = eyes[1][1] + eyes[1][3]/2
+        return bool(abs(eye1_y - eye2_y) < 0.1 * h)
+
+    def reset(self):
+        self.last_face = None
+        self.frames_since_full_search = 0
+        self.eye_checked_face = None
+        self.frames_since_eye_check = 0
+
+
+class DnnFaceDetector(FaceDetector):
+    """
+    OpenCV's YuNet DNN face detector (cv2.FaceDetectorYN).
+
+    More robust than the Haar cascades to lighting and head angle, and its
+    eye and nose landmarks replace the eye cascade for the facing check.
+    Runs on the downscaled working frame.
+    """
+
+    name = "dnn"
+
+    def __init__(self, model_path=None, score_threshold=0.7):
+        """
+        Args:
+            model_path (str): YuNet ONNX model; defaults to GAZE_DNN_MODEL or
+                models/face_detection_yunet_2023mar.onnx
+            score_threshold (float): Minimum detection confidence
+        """
+        model_path = model_path or os.getenv("GAZE_DNN_MODEL", DNN_MODEL_PATH)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"YuNet face detection model not found: {model_path}")
+        self.detector = cv2.FaceDetectorYN.create(model_path, "", (320, 240), score_threshold)
+        self.input_size = (320, 240)
+
+    def detect(self, frame, gray, scale):
+        height, width = gray.shape[:2]
+        small = frame
+        if scale != 1.0:
+            small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        if self.input_size != (width, height):
+            self.input_size = (width, height)
+            self.detector.setInputSize(self.input_size)
+
+        _, faces = self.detector.detect(small)
+        if faces is None or len(faces) == 0:
+            return None, False
+
+        # Each row: box (4), right eye, left eye, nose, mouth corners (2 each), score
+        face = max(faces, key=lambda f: f[2] * f[3])
+        x, y, w, h = (int(round(v / scale)) for v in face[:4])
+        right_eye, left_eye, nose = face[4:6], face[6:8], face[8:10]
+        return (x, y, w, h), landmarks_facing(left_eye, right_eye, nose, face[3])
+
+
+class MediaPipeFaceDetector(FaceDetector):
+    """
+    MediaPipe face landmarker (face mesh).
+
+    The heaviest of the detectors, but its dense landmarks give the most
+    reliable facing check. mediapipe is only imported when this detector
+    is created.
+    """
+
+    name = "mediapipe"
+
+    # Face mesh landmark indices
+    LEFT_EYE = 263
+    RIGHT_EYE = 33
+    NOSE_TIP = 1
+
+    def __init__(self, model_path=None, min_confidence=0.5):
+        """
+        Args:
+            model_path (str): Face landmarker .task model; defaults to
+                GAZE_MEDIAPIPE_MODEL or models/face_landmarker.task
+            min_confidence (float): Minimum face detection confidence
+        """
+        import mediapipe as mp
+
+        model_path = model_path or os.getenv("GAZE_MEDIAPIPE_MODEL", MEDIAPIPE_MODEL_PATH)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"MediaPipe face landmarker model not found: {model_path}")
+
+        self.mp = mp
+        options = mp.tasks.vision.FaceLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=mp.tasks.vision.RunningMode.IMAGE,
+            num_faces=1,
+            min_face_detection_confidence=min_confidence,
+        )
+        self.landmarker = mp.tasks.vision.FaceLandmarker.create_from_options(options)
+
+    def detect(self, frame, gray, scale):
+        height, width = gray.shape[:2]
+        small = frame
+        if scale != 1.0:
+            small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+
+        result = self.landmarker.detect(self.mp.Image(image_format=self.mp.ImageFormat.SRGB, data=rgb))
+        if not result.face_landmarks:
+            return None, False
+
+        # Landmarks are normalised to the image size
+        frame_height, frame_width = frame.shape[:2]
+        points = [(p.x * frame_width, p.y * frame_height) for p in result.face_landmarks[0]]
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        x0, y0 = max(0, int(min(xs))), max(0, int(min(ys)))
+        w, h = int(max(xs)) - x0, int(max(ys)) - y0
+        is_facing = landmarks_facing(points[self.LEFT_EYE], points[self.RIGHT_EYE], points[self.NOSE_TIP], h)
+        return (x0, y0, w, h), is_facing
+
+    def close(self):
+        self.landmarker.close()
+
+
+DETECTORS = {
+    HaarFaceDetector.name: HaarFaceDetector,
+    DnnFaceDetector.name: DnnFaceDetector,
+    MediaPipeFaceDetector.name: MediaPipeFaceDetector,
+}
+
+
+def create_detector(name=None, **options):
+    """
+    Creates a face detector by name
+
+    Args:
+        name (str): 'haar', 'dnn' or 'mediapipe'; defaults to the GAZE_DETECTOR
+            environment variable, then 'haar'
+        **options: Passed to the detector's constructor
+
+    Returns:
+        FaceDetector: The detector
+
+    Raises:
+        ValueError: For an unknown name
+    """
+    name = detector_name(name)
+    if name not in DETECTORS:
+        raise ValueError(f"Unknown face detector '{name}', expected one of {', '.join(DETECTORS)}")
+    logging.info(f"Using {name} face detector")
+    return DETECTORS[name](**options)
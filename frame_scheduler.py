@@ -0,0 +1,123 @@
+import time
+
+
+def read_latest_frame(cap, max_drop=5, fresh_frame_seconds=0.005, clock=time.monotonic):
+    """
+    Read the newest frame from a cv2.VideoCapture, skipping any backlog
+
+    Frames that were already buffered are returned by grab() immediately,
+    while a fresh frame makes grab() wait for the camera. Frames are grabbed
+    until one takes longer than fresh_frame_seconds (or max_drop frames have
+    been skipped) and only that one is decoded.
+
+    Args:
+        cap: Opened cv2.VideoCapture
+        max_drop (int): Most buffered frames to skip per read
+        fresh_frame_seconds (float): A grab slower than this is a new frame
+        clock (callable): Monotonic clock, injectable for tests
+
+    Returns:
+        tuple: (ok, frame, dropped) where dropped is the number of skipped frames
+    """
+    dropped = 0
+    while True:
+        start = clock()
+        if not cap.grab():
+            return False, None, dropped
+        if clock() - start >= fresh_frame_seconds or dropped >= max_drop:
+            break
+        dropped += 1
+
+    ok, frame = cap.retrieve()
+    return ok, frame, dropped
+
+
+class AdaptiveFrameScheduler:
+    """
+    Decides how long the camera worker waits between analysed frames.
+
+    Runs at target_fps normally, at max_fps while something is wrong (so a
+    violation timer is tracked closely) and backs off towards min_fps once
+    the student has been compliant for calm_seconds. The rate is never set
+    above what the measured per-frame processing cost allows.
+    """
+
+    def __init__(self, target_fps=10, min_fps=2, max_fps=15, calm_seconds=5.0, backoff=0.8,
+                 cost_smoothing=0.2, clock=time.monotonic):
+        """
+        Args:
+            target_fps (float): Analysis rate while nothing notable is happening
+            min_fps (float): Slowest rate when the student is steadily compliant
+            max_fps (float): Rate while a violation is in progress
+            calm_seconds (float): Compliance needed before backing off
+            backoff (float): Factor the rate is multiplied by per calm frame
+            cost_smoothing (float): Weight of the newest sample in the cost average
+            clock (callable): Monotonic clock, injectable for tests
+        """
+        self.target_fps = target_fps
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.calm_seconds = calm_seconds
+        self.backoff = backoff
+        self.cost_smoothing = cost_smoothing
+        self.clock = clock
+
+        self.current_fps = target_fps
+        self.average_cost = None
+        self.frames = 0
+        self.dropped_frames = 0
+        self._calm_since = None
+        self._frame_start = None
+
+    @staticmethod
+    def is_compliant(result):
+        """True if a process_frame() result shows nothing wrong"""
+        return bool(result.get("is_camera_clear") and result.get("is_face_detected")
+                    and result.get("is_facing_camera") and not result.get("violation_duration"))
+
+    def frame_started(self, dropped=0):
+        """Call right before a frame is analysed"""
+        self._frame_start = self.clock()
+        self.dropped_frames += dropped
+
+    def frame_finished(self, result):
+        """
+        Call after a frame is analysed
+
+        Args:
+            result (dict): process_frame() result for the frame
+
+        Returns:
+            float: Seconds to wait before grabbing the next frame
+        """
+        now = self.clock()
+        cost = now - self._frame_start if self._frame_start is not None else 0.0
+        self._frame_start = None
+        self.frames += 1
+
+        if self.average_cost is None:
+            self.average_cost = cost
+        else:
+            self.average_cost += self.cost_smoothing * (cost - self.average_cost)
+
+        if not self.is_compliant(result):
+            # Follow violations closely
+            self._calm_since = None
+            self.current_fps = self.max_fps
+        elif self._calm_since is None:
+            self._calm_since = now
+            self.current_fps = self.target_fps
+        elif now - self._calm_since < self.calm_seconds:
+            self.current_fps = self.target_fps
+        else:
+            self.current_fps = max(self.min_fps, min(self.current_fps, self.target_fps) * self.backoff)
+
+        # Don't schedule faster than frames can be processed
+        if self.average_cost > 0:
+            self.current_fps = min(self.current_fps, 1.0 / self.average_cost)
+
+        return max(0.0, 1.0 / self.current_fps - cost)
+
+    def idle_delay(self):
+        """Seconds to wait after a failed capture before retrying"""
+        return 1.0 / self.target_fps
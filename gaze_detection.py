@@ -3,34 +3,154 @@ import numpy as np
 import time
 import logging
 import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from face_detectors import FaceDetector, HaarFaceDetector, create_detector, detector_name
+
+# Worker threads process_batch() runs detection on by default
+MAX_BATCH_WORKERS = 4
+
+# Full-resolution frames process_batch() measures image quality on at once
+FULL_QUALITY_CHUNK_SIZE = 16
+
+# Status fields returned by process_batch(), in order
+BATCH_FIELDS = (
+    "status",
+    "is_timeout",
+    "is_camera_clear",
+    "is_face_detected",
+    "is_facing_camera",
+    "violation_triggered",
+    "violation_type",
+    "violation_duration",
+)
+
+
+def quality_metrics(gray):
+    """
+    Measures clarity and brightness of a grayscale frame
+    
+    Clarity is the variance of the Laplacian. A 16-bit Laplacian is exact
+    for 8-bit input and much cheaper than float64.
+    
+    Returns:
+        tuple: (clarity, brightness)
+    """
+    _, stddev = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+    return stddev[0][0] ** 2, float(np.mean(gray))
+
+
+def fast_quality_metrics(gray, stride=2):
+    """
+    Cheap estimate of quality_metrics() from every stride-th pixel in each direction
+    
+    The Laplacian of the subsample sees coarser detail, so its variance is
+    on a different scale from the full measure: compare it against a
+    threshold calibrated with calibrate_quality.py. Brightness is an
+    integer sum over the subsample.
+    
+    Returns:
+        tuple: (clarity, brightness)
+    """
+    sample = np.ascontiguousarray(gray[::stride, ::stride])
+    _, stddev = cv2.meanStdDev(cv2.Laplacian(sample, cv2.CV_16S))
+    return stddev[0][0] ** 2, int(sample.sum(dtype=np.uint32)) / sample.size
+
+
+def batch_quality_metrics(grays, chunk_size=64):
+    """
+    Computes brightness and clarity for a stack of grayscale frames at once
+    
+    Each chunk of frames is stacked into one tall image with a reflected row
+    above and below every frame, so a single cv2.Laplacian call covers the
+    whole chunk and gives exactly the per-frame result of
+    check_image_quality(). Faster than filtering frame by frame, and much
+    faster than doing the arithmetic in NumPy.
+    
+    Args:
+        grays (numpy.ndarray): uint8 array of shape (frames, height, width)
+        chunk_size (int): Frames per Laplacian call, to bound memory use
+        
+    Returns:
+        tuple: (brightness, clarity) float arrays with one value per frame
+    """
+    count, height, width = grays.shape
+    brightness = grays.sum(axis=(1, 2), dtype=np.uint32) / (height * width)
+    clarity = np.empty(count)
+    
+    tall = np.empty((min(chunk_size, count), height + 2, width), dtype=np.uint8)
+    for start in range(0, count, chunk_size):
+        chunk = grays[start:start + chunk_size]
+        n = len(chunk)
+        # Border rows as BORDER_REFLECT_101 would make them for each frame
+        tall[:n, 1:-1] = chunk
+        tall[:n, 0] = chunk[:, 1]
+        tall[:n, -1] = chunk[:, -2]
+        laplacian = cv2.Laplacian(tall[:n].reshape(-1, width), cv2.CV_16S).reshape(n, height + 2, width)
+        for i in range(n):
+            _, stddev = cv2.meanStdDev(laplacian[i, 1:-1])
+            clarity[start + i] = stddev[0][0] ** 2
+    return brightness, clarity
+
 
 class GazeDetection:
-    def __init__(self, timeout_seconds=60):
+    def __init__(self, timeout_seconds=60, working_width=320, roi_padding=0.5, full_search_interval=15,
+                 detector=None, clock=time.time, facing_smoothing=0.5, facing_on_threshold=0.6,
+                 facing_off_threshold=0.4, eye_check_interval=5, quality_mode=None, quality_stride=2,
+                 fast_clarity_threshold=None, quality_change_threshold=2.0, quality_max_age=30):
         """
         Initialize the gaze detection system using OpenCV
         
         Args:
             timeout_seconds (int): Number of seconds before triggering a timeout alert
+            working_width (int): Frames wider than this are downscaled to this width
+                before analysis; None analyses frames at full resolution
+            roi_padding (float): Padding around the last face, as a fraction of its
+                size, that is searched before falling back to the whole frame (Haar only)
+            full_search_interval (int): Search the whole frame at least every this
+                many frames even while the face is being tracked (Haar only)
+            detector: FaceDetector instance, or the name of one ('haar', 'dnn' or
+                'mediapipe'); defaults to the GAZE_DETECTOR environment variable, then 'haar'
+            clock (callable): Returns the current time in seconds; replaced when
+                replaying recorded video (see gaze_replay.py)
+            facing_smoothing (float): Weight of the newest frame in the facing score;
+                1.0 turns smoothing off
+            facing_on_threshold (float): Score at which the user counts as facing the camera
+            facing_off_threshold (float): Score at which the user stops counting as facing
+                the camera; the gap between the thresholds stops single frames flipping it
+            eye_check_interval (int): Re-run eye detection at least every this many
+                frames while the face holds still (Haar only)
+            quality_mode (str): 'full' measures image quality on every frame; 'fast'
+                measures a subsample and reuses the last measurement while the scene
+                is static. Defaults to the GAZE_QUALITY_MODE environment variable, then 'full'
+            quality_stride (int): Subsampling step of the fast measurement
+            fast_clarity_threshold (float): Clarity threshold for the fast measurement;
+                defaults to GAZE_FAST_CLARITY_THRESHOLD, then the full threshold.
+                Calibrate it with calibrate_quality.py
+            quality_change_threshold (float): Mean absolute gray level change below which
+                a frame counts as unchanged and its quality isn't measured again (fast mode)
+            quality_max_age (int): Measure again after this many frames regardless (fast mode)
         """
         try:
-            # Initialize OpenCV face and eye cascade classifiers
-            face_cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-            eye_cascade_path = cv2.data.haarcascades + 'haarcascade_eye.xml'
-            
-            # Verify that the cascade files exist
-            if not os.path.exists(face_cascade_path):
-                raise FileNotFoundError(f"Face cascade file not found: {face_cascade_path}")
-            if not os.path.exists(eye_cascade_path):
-                raise FileNotFoundError(f"Eye cascade file not found: {eye_cascade_path}")
+            # Initialize the face detector
+            if isinstance(detector, FaceDetector):
+                self.face_detector = detector
+                self.detector_factory = None
+            else:
+                name = detector_name(detector)
+                options = {}
+                if name == HaarFaceDetector.name:
+                    options = {"roi_padding": roi_padding, "full_search_interval": full_search_interval,
+                               "eye_check_interval": eye_check_interval}
+                # Builds more detectors like this one for process_batch()'s workers
+                self.detector_factory = functools.partial(create_detector, name, **options)
+                self.face_detector = self.detector_factory()
             
-            # Load the cascades
-            self.face_cascade = cv2.CascadeClassifier(face_cascade_path)
-            self.eye_cascade = cv2.CascadeClassifier(eye_cascade_path)
-            
-            logging.info("OpenCV face and eye detectors initialized successfully")
+            logging.info(f"OpenCV gaze detection initialized with the {self.face_detector.name} detector")
             
             # State variables
-            self.last_facing_camera_time = time.time()
+            self.clock = clock
+            self.last_facing_camera_time = clock()
             self.warning_shown = False
             self.is_camera_clear = True
             self.is_face_detected = False
@@ -43,38 +163,133 @@ class GazeDetection:
             
             # Constants
             self.GAZE_TIMEOUT = timeout_seconds
+            
+            # Image quality thresholds, measured on the full-resolution frame. The
+            # clarity threshold was tuned at camera resolution: downscaling to the
+            # working width averages away fine detail and sensor noise, so the
+            # Laplacian variance of the working frame is on a different scale
+            self.clarity_threshold = 100
+            self.brightness_threshold = 30
+            
+            # Image quality measurement
+            self.quality_mode = (quality_mode or os.getenv("GAZE_QUALITY_MODE") or "full").lower()
+            if self.quality_mode not in ("full", "fast"):
+                raise ValueError(f"Unknown quality mode '{self.quality_mode}', expected 'full' or 'fast'")
+            self.quality_stride = quality_stride
+            if fast_clarity_threshold is None and os.getenv("GAZE_FAST_CLARITY_THRESHOLD"):
+                fast_clarity_threshold = float(os.getenv("GAZE_FAST_CLARITY_THRESHOLD"))
+            self.fast_clarity_threshold = (fast_clarity_threshold if fast_clarity_threshold is not None
+                                           else self.clarity_threshold)
+            self.quality_change_threshold = quality_change_threshold
+            self.quality_max_age = quality_max_age
+            self._quality_thumbnail = None  # Coarse copy of the last measured frame
+            self._quality_cached = None  # (clarity, brightness) measured on it
+            self._quality_age = 0
+            self.quality_cache_hits = 0
+            
+            # Detection pipeline settings
+            self.working_width = working_width
+            self.face_box = None  # Last face in original frame coordinates
+            
+            # Temporal smoothing of the facing decision
+            self.facing_smoothing = facing_smoothing
+            self.facing_on_threshold = facing_on_threshold
+            self.facing_off_threshold = facing_off_threshold
+            self.facing_score = None  # Smoothed per-frame evidence, 0 to 1
+            self.raw_facing = False  # This frame's decision before smoothing
+            self.smoothed_facing = False
         except Exception as e:
             logging.error(f"Failed to initialize OpenCV detectors: {e}")
             raise
     
-    def check_image_quality(self, frame):
+    def prepare_frame(self, frame):
+        """
+        Downscale a frame to the working resolution and convert it to grayscale
+        
+        Args:
+            frame: OpenCV BGR image frame
+            
+        Returns:
+            tuple: (grayscale working frame, scale from frame to working coordinates)
+        """
+        height, width = frame.shape[:2]
+        scale = 1.0
+        if self.working_width and width > self.working_width:
+            scale = self.working_width / width
+            frame = cv2.resize(frame, (self.working_width, max(1, round(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), scale
+    
+    def check_image_quality(self, frame, gray=None):
         """
         Check if the camera image is clear
         
+        The full check measures the frame at camera resolution, where
+        clarity_threshold applies; the fast check measures the working frame
+        against fast_clarity_threshold.
+        
         Args:
             frame: OpenCV image frame
+            gray: Grayscale working frame from prepare_frame(), computed if omitted
             
         Returns:
             bool: True if image is clear enough
         """
-        # Convert to grayscale for analysis
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Calculate image clarity - Laplacian variance method
-        clarity = cv2.Laplacian(gray, cv2.CV_64F).var()
+        if self.quality_mode == "fast":
+            if gray is None:
+                gray, _ = self.prepare_frame(frame)
+            clarity_threshold = self.fast_clarity_threshold
+        else:
+            if gray is None or gray.shape != frame.shape[:2]:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            clarity_threshold = self.clarity_threshold
         
-        # Check if image is too dark
-        brightness = np.mean(gray)
+        # Image clarity (Laplacian variance) and brightness
+        clarity, brightness = self.measure_quality(gray)
         
         # Return True if image is clear enough
-        return clarity > 100 and brightness > 30
+        return bool(clarity > clarity_threshold and brightness > self.brightness_threshold)
     
-    def detect_face_and_gaze(self, frame):
+    def measure_quality(self, gray):
+        """
+        Measure clarity and brightness of a grayscale frame according to quality_mode
+        
+        In fast mode a coarse thumbnail of the frame is compared with the one
+        from the last measurement, and while they differ by less than
+        quality_change_threshold the last measurement is reused.
+        
+        Returns:
+            tuple: (clarity, brightness)
+        """
+        if self.quality_mode != "fast":
+            return quality_metrics(gray)
+        
+        # Frame-difference gate on an 8x subsample
+        thumbnail = np.ascontiguousarray(gray[::8, ::8])
+        if (self._quality_cached is not None and self._quality_age < self.quality_max_age
+                and thumbnail.shape == self._quality_thumbnail.shape):
+            change = cv2.norm(thumbnail, self._quality_thumbnail, cv2.NORM_L1) / thumbnail.size
+            if change < self.quality_change_threshold:
+                self._quality_age += 1
+                self.quality_cache_hits += 1
+                return self._quality_cached
+        
+        self._quality_cached = fast_quality_metrics(gray, self.quality_stride)
+        self._quality_thumbnail = thumbnail
+        self._quality_age = 0
+        return self._quality_cached
+    
+    def detect_face_and_gaze(self, frame, gray=None, scale=None):
         """
         Detect face and determine if user is facing the camera using OpenCV
         
+        The face detector gets both the full-resolution frame and the
+        downscaled working frame (see face_detectors.py).
+        
         Args:
             frame: OpenCV image frame
+            gray: Grayscale working frame from prepare_frame(), computed if omitted
+            scale: Scale returned by prepare_frame() alongside gray
             
         Returns:
             frame: Processed frame with annotations (optional)
@@ -84,62 +299,44 @@ class GazeDetection:
         self.is_facing_camera = False
         
         try:
-            # Convert frame to grayscale for detection
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
-            # Detect faces
-            faces = self.face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.1,
-                minNeighbors=5,
-                minSize=(30, 30)
-            )
+            if gray is None or scale is None:
+                gray, scale = self.prepare_frame(frame)
             
-            if len(faces) > 0:
-                self.is_face_detected = True
-                
-                # Get the largest face (assuming it's the user)
-                largest_face = max(faces, key=lambda face: face[2] * face[3])
-                x, y, w, h = largest_face
-                
-                # Draw face rectangle (for debugging)
-                # cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
-                
-                # Extract face region and detect eyes
-                roi_gray = gray[y:y+h, x:x+w]
-                roi_color = frame[y:y+h, x:x+w]
-                
-                eyes = self.eye_cascade.detectMultiScale(
-                    roi_gray,
-                    scaleFactor=1.1,
-                    minNeighbors=5,
-                    minSize=(20, 20)
-                )
-                
-                # Check if both eyes are detected
-                if len(eyes) >= 2:
-                    # Sort eyes by x-position
-                    eyes = sorted(eyes, key=lambda e: e[0])
-                    
-                    # Draw eye rectangles (for debugging)
-                    # for (ex, ey, ew, eh) in eyes:
-                    #     cv2.rectangle(roi_color, (ex, ey), (ex+ew, ey+eh), (0, 255, 0), 2)
-                    
-                    # If we have at least two eyes and they're roughly at the same height,
-                    # consider the user to be facing the camera
-                    if len(eyes) >= 2:
-                        eye1_y = eyes[0][1] + eyes[0][3]/2
-                        eye2_y = eyes[1][1] + eyes[1][3]/2
-                        
-                        # If eyes are roughly at the same height (within 10% of face height)
-                        if abs(eye1_y - eye2_y) < 0.1 * h:
-                            self.is_facing_camera = True
+            self.face_box, is_facing = self.face_detector.detect(frame, gray, scale)
+            self.is_face_detected = self.face_box is not None
+            self.raw_facing = self.is_face_detected and bool(is_facing)
+            self.is_facing_camera = self.is_face_detected and self.update_facing(self.raw_facing)
             
             return frame
         except Exception as e:
             logging.error(f"Error in face/eye detection: {e}")
             return frame
     
+    def update_facing(self, evidence):
+        """
+        Fold one frame's facing decision into the smoothed facing state
+        
+        The score is an exponential moving average of the per-frame evidence;
+        the state only turns on above facing_on_threshold and off below
+        facing_off_threshold, so a single noisy frame doesn't flip it.
+        
+        Args:
+            evidence (bool): Whether this frame looked like the user facing the camera
+            
+        Returns:
+            bool: Smoothed facing state
+        """
+        if self.facing_score is None:
+            self.facing_score = float(evidence)
+        else:
+            self.facing_score += self.facing_smoothing * (float(evidence) - self.facing_score)
+        
+        if self.facing_score >= self.facing_on_threshold:
+            self.smoothed_facing = True
+        elif self.facing_score <= self.facing_off_threshold:
+            self.smoothed_facing = False
+        return self.smoothed_facing
+    
     def process_frame(self, frame):
         """
         Process a frame and check gaze status
@@ -150,14 +347,130 @@ class GazeDetection:
         Returns:
             dict: Status information
         """
+        # Downscale and convert once; both checks share the grayscale frame
+        gray, scale = self.prepare_frame(frame)
+        
         # Check if camera image is clear
-        self.is_camera_clear = self.check_image_quality(frame)
+        self.is_camera_clear = self.check_image_quality(frame, gray)
         
         # Detect face and gaze
-        processed_frame = self.detect_face_and_gaze(frame)
+        processed_frame = self.detect_face_and_gaze(frame, gray, scale)
+        
+        result = self._update_state(self.clock())
+        result["frame"] = processed_frame
+        return result
+    
+    def process_batch(self, frames, timestamps, workers=None):
+        """
+        Analyse a recording in one call
+        
+        Frames are downscaled and run through face detection on a thread pool,
+        each worker with its own detector working through a contiguous run of
+        frames. Image quality is then computed for all frames in vectorized
+        passes, and finally the smoothing and violation timers are replayed over
+        the timestamps in order, continuing from this object's current state.
+        Long recordings can be fed in consecutive segments to bound memory use.
+        
+        Args:
+            frames: Sequence of BGR frames of one size, e.g. an array of shape
+                (frames, height, width, 3)
+            timestamps: Capture time of each frame in seconds
+            workers (int): Detection threads; defaults to MAX_BATCH_WORKERS or
+                the CPU count if lower. A detector passed in as an instance
+                can't be copied, so it always runs on one thread
+            
+        Returns:
+            dict: One numpy array per status field (see BATCH_FIELDS), plus
+            brightness, clarity and face_box (frames x 4, -1 where no face).
+            Quality is always measured in full here, whatever quality_mode is
+        """
+        count = len(frames)
+        if len(timestamps) != count:
+            raise ValueError(f"Got {count} frames but {len(timestamps)} timestamps")
+        
+        if workers is None:
+            workers = min(MAX_BATCH_WORKERS, os.cpu_count() or 1)
+        if self.detector_factory is None:
+            workers = 1
+        workers = max(1, min(workers, count))
+        
+        grays = None
+        face_boxes = np.full((count, 4), -1, dtype=np.int32)
+        raw_facing = np.zeros(count, dtype=bool)
+        
+        if count:
+            # Size the shared gray stack from the first frame
+            first_gray, _ = self.prepare_frame(frames[0])
+            grays = np.empty((count,) + first_gray.shape, dtype=np.uint8)
+        
+        def detect_run(start, stop, detector):
+            for i in range(start, stop):
+                gray, scale = self.prepare_frame(frames[i])
+                grays[i] = gray
+                face_box, is_facing = detector.detect(frames[i], gray, scale)
+                if face_box is not None:
+                    face_boxes[i] = face_box
+                    raw_facing[i] = bool(is_facing)
+        
+        if workers == 1:
+            detect_run(0, count, self.face_detector)
+        else:
+            bounds = np.linspace(0, count, workers + 1).astype(int)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(detect_run, bounds[w], bounds[w + 1], self.detector_factory())
+                           for w in range(workers)]
+                for future in futures:
+                    future.result()
+        
+        if not count:
+            brightness, clarity = np.empty(0), np.empty(0)
+        elif grays.shape[1:] == frames[0].shape[:2]:
+            brightness, clarity = batch_quality_metrics(grays)
+        else:
+            # Like process_frame(), measure at camera resolution, a chunk at a time
+            brightness, clarity = np.empty(count), np.empty(count)
+            for start in range(0, count, FULL_QUALITY_CHUNK_SIZE):
+                full = np.stack([cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                                 for frame in frames[start:start + FULL_QUALITY_CHUNK_SIZE]])
+                stop = start + len(full)
+                brightness[start:stop], clarity[start:stop] = batch_quality_metrics(full)
+        camera_clear = (clarity > self.clarity_threshold) & (brightness > self.brightness_threshold)
+        
+        # Replay smoothing and timers in frame order
+        columns = {field: [] for field in BATCH_FIELDS}
+        for i in range(count):
+            self.is_camera_clear = bool(camera_clear[i])
+            self.is_face_detected = bool(face_boxes[i, 0] >= 0)
+            self.face_box = tuple(face_boxes[i]) if self.is_face_detected else None
+            self.raw_facing = bool(raw_facing[i])
+            self.is_facing_camera = self.is_face_detected and self.update_facing(self.raw_facing)
+            result = self._update_state(float(timestamps[i]))
+            for field in BATCH_FIELDS:
+                columns[field].append(result[field])
+        
+        batch = {
+            "status": np.array(columns["status"], dtype=object),
+            "violation_type": np.array(columns["violation_type"], dtype=object),
+            "violation_duration": np.array(columns["violation_duration"], dtype=float),
+            "brightness": brightness,
+            "clarity": clarity,
+            "face_box": face_boxes,
+        }
+        for field in ("is_timeout", "is_camera_clear", "is_face_detected", "is_facing_camera",
+                      "violation_triggered"):
+            batch[field] = np.array(columns[field], dtype=bool)
+        return batch
+    
+    def _update_state(self, current_time):
+        """
+        Advance the violation and timeout timers from the current detection flags
         
-        # Update status and check timeout
-        current_time = time.time()
+        Args:
+            current_time (float): Time of the frame the flags were set from
+            
+        Returns:
+            dict: Status information (without the frame)
+        """
         status = ""
         is_timeout = False
         violation_triggered = False
@@ -188,7 +501,6 @@ class GazeDetection:
             self.violation_start_time = None
             self.violation_duration = 0
             return {
-                "frame": processed_frame,
                 "status": status,
                 "is_timeout": is_timeout,
                 "is_camera_clear": self.is_camera_clear,
@@ -213,7 +525,6 @@ class GazeDetection:
             self.violation_duration = 0
         
         return {
-            "frame": processed_frame,
             "status": status,
             "is_timeout": is_timeout,
             "is_camera_clear": self.is_camera_clear,
@@ -226,10 +537,14 @@ class GazeDetection:
 
     def reset(self):
         """Reset the gaze detection state"""
-        self.last_facing_camera_time = time.time()
+        self.last_facing_camera_time = self.clock()
         self.warning_shown = False
         self.violation_start_time = None
         self.violation_duration = 0
+        self.facing_score = None
+        self.smoothed_facing = False
+        self._quality_cached = None
+        self.face_detector.reset()
 
 # Example usage with OpenCV window
 def main():
@@ -0,0 +1,242 @@
+import logging
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Frames that can be in flight between the camera thread and the worker process
+RING_SLOTS = 2
+
+# Seconds to wait for the worker process to start up or shut down
+START_TIMEOUT = 30.0
+STOP_TIMEOUT = 2.0
+
+# Result keys sent back to the UI process; the annotated frame stays behind
+RESULT_KEYS = (
+    "status",
+    "is_timeout",
+    "is_camera_clear",
+    "is_face_detected",
+    "is_facing_camera",
+    "violation_triggered",
+    "violation_type",
+    "violation_duration",
+)
+
+
+class GazeProcessError(Exception):
+    """Raised when the gaze worker process fails or stops responding"""
+
+
+def _create_detector(**kwargs):
+    from gaze_detection import GazeDetection
+    return GazeDetection(**kwargs)
+
+
+def _worker_main(shm_name, shape, slots, tasks, results, detector_factory, detector_kwargs):
+    """Entry point of the worker process: analyses frames until it is sent None"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        ring = np.ndarray((slots,) + shape, dtype=np.uint8, buffer=shm.buf)
+        try:
+            detector = detector_factory(**detector_kwargs)
+        except Exception as e:
+            results.put(("error", None, f"Failed to initialize gaze detection: {e}"))
+            return
+        results.put(("ready", None, None))
+
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot = task
+            try:
+                result = detector.process_frame(ring[slot])
+                results.put(("result", seq, {key: result.get(key) for key in RESULT_KEYS}))
+            except Exception as e:
+                results.put(("failed", seq, str(e)))
+        # Drop the view before closing, otherwise the buffer is still exported
+        del ring
+    finally:
+        shm.close()
+
+
+class GazeProcess:
+    """
+    Runs GazeDetection in a separate process so OpenCV work and its Python
+    bookkeeping don't compete with the Qt event loop for the GIL.
+
+    Frames are copied into a ring of slots in shared memory and only a slot
+    index goes over the task queue; the worker sends back the process_frame()
+    status without the annotated frame. The process is started with start()
+    once the frame size is known and must be shut down with stop().
+    """
+
+    def __init__(self, slots=RING_SLOTS, detector_factory=_create_detector, **detector_kwargs):
+        """
+        Args:
+            slots (int): Number of frames that can be in flight at once
+            detector_factory (callable): Module-level callable building the
+                detector in the worker process; must be picklable
+            **detector_kwargs: Passed to detector_factory (e.g. timeout_seconds)
+        """
+        self.slots = slots
+        self.detector_factory = detector_factory
+        self.detector_kwargs = detector_kwargs
+        self.shape = None
+        self.process = None
+        self._shm = None
+        self._ring = None
+        self._tasks = None
+        self._results = None
+        self._free_slots = []
+        self._slot_of = {}  # seq -> slot the frame is in
+        self._next_seq = 0
+
+    def is_running(self):
+        return self.process is not None and self.process.is_alive()
+
+    def start(self, frame_shape):
+        """
+        Allocates the shared frame ring and starts the worker process
+
+        Args:
+            frame_shape (tuple): Shape of the BGR frames that will be submitted
+
+        Raises:
+            GazeProcessError: If the worker fails to start
+        """
+        if self.process is not None:
+            return
+
+        # Spawn rather than fork so the child doesn't inherit Qt's state
+        context = multiprocessing.get_context("spawn")
+        self.shape = tuple(frame_shape)
+        frame_size = int(np.prod(self.shape))
+        self._shm = shared_memory.SharedMemory(create=True, size=frame_size * self.slots)
+        self._ring = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=self._shm.buf)
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        self._free_slots = list(range(self.slots))
+        self._slot_of = {}
+
+        self.process = context.Process(
+            target=_worker_main,
+            args=(self._shm.name, self.shape, self.slots, self._tasks, self._results,
+                  self.detector_factory, self.detector_kwargs),
+            daemon=True,
+        )
+        self.process.start()
+
+        try:
+            kind, _, message = self._results.get(timeout=START_TIMEOUT)
+        except queue.Empty:
+            kind, message = "error", "Gaze worker process did not start in time"
+        if kind != "ready":
+            self.stop()
+            raise GazeProcessError(message)
+        logging.info(f"Gaze worker process started (pid {self.process.pid})")
+
+    def submit(self, frame):
+        """
+        Copies a frame into a free slot and queues it for analysis
+
+        Args:
+            frame (numpy.ndarray): BGR frame of the shape given to start()
+
+        Returns:
+            int: Sequence number of the frame, or None if every slot is busy
+        """
+        if frame.shape != self.shape:
+            raise ValueError(f"Expected a frame of shape {self.shape}, got {frame.shape}")
+        if not self._free_slots:
+            return None
+
+        slot = self._free_slots.pop()
+        np.copyto(self._ring[slot], frame)
+        seq = self._next_seq
+        self._next_seq += 1
+        self._slot_of[seq] = slot
+        self._tasks.put((seq, slot))
+        return seq
+
+    def wait_result(self, seq, timeout=1.0):
+        """
+        Waits for the result of a submitted frame. Results of older frames
+        that arrive first are discarded.
+
+        Args:
+            seq (int): Sequence number returned by submit()
+            timeout (float): Seconds to wait
+
+        Returns:
+            dict: process_frame() status for the frame, or None on timeout
+
+        Raises:
+            GazeProcessError: If the worker died or failed on the frame
+        """
+        while True:
+            try:
+                kind, done_seq, payload = self._results.get(timeout=timeout)
+            except queue.Empty:
+                if not self.is_running():
+                    raise GazeProcessError("Gaze worker process exited unexpectedly")
+                return None
+
+            # The worker is done with the slot either way
+            slot = self._slot_of.pop(done_seq, None)
+            if slot is not None:
+                self._free_slots.append(slot)
+
+            if done_seq != seq:
+                continue
+            if kind == "failed":
+                raise GazeProcessError(payload)
+            return payload
+
+    def process_frame(self, frame, timeout=1.0):
+        """
+        Analyses a frame in the worker process, like GazeDetection.process_frame()
+
+        Returns:
+            dict: Status information without the annotated frame, or None if
+            no slot was free or the worker didn't answer within timeout
+        """
+        seq = self.submit(frame)
+        if seq is None:
+            # A frame that timed out earlier still holds every slot; collect it
+            self.wait_result(-1, timeout=0)
+            seq = self.submit(frame)
+            if seq is None:
+                return None
+        return self.wait_result(seq, timeout)
+
+    def stop(self):
+        """Stops the worker process and releases the shared memory"""
+        if self.process is not None:
+            try:
+                self._tasks.put(None)
+            except Exception as e:
+                logging.debug(f"Error signalling gaze worker to stop: {e}")
+            self.process.join(STOP_TIMEOUT)
+            if self.process.is_alive():
+                logging.warning("Gaze worker process did not stop, terminating it")
+                self.process.terminate()
+                self.process.join(STOP_TIMEOUT)
+            self.process = None
+
+        for q in (self._tasks, self._results):
+            if q is not None:
+                q.close()
+                q.cancel_join_thread()
+        self._tasks = None
+        self._results = None
+
+        if self._shm is not None:
+            self._ring = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        self._free_slots = []
+        self._slot_of = {}
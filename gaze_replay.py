@@ -0,0 +1,166 @@
+"""
+Replays recorded video through GazeDetection without a webcam.
+
+Frames are read from a video file or a directory of images and processed
+as fast as possible, while GazeDetection sees a simulated clock that
+advances by 1/fps per frame, so violation timers behave as they would have
+live and every run of the same recording gives the same statuses. Writes a
+JSONL trace with one line per frame and prints throughput:
+
+    python gaze_replay.py session.mp4 --fps 10 --trace session.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from gaze_detection import GazeDetection
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+# process_frame() fields copied into the trace
+TRACE_FIELDS = (
+    "status",
+    "is_timeout",
+    "is_camera_clear",
+    "is_face_detected",
+    "is_facing_camera",
+    "violation_triggered",
+    "violation_type",
+    "violation_duration",
+)
+
+
+class ReplayClock:
+    """Simulated clock for GazeDetection that moves forward one frame at a time"""
+
+    def __init__(self, fps=10, start=0.0):
+        self.frame_interval = 1.0 / fps
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self):
+        self.now += self.frame_interval
+        return self.now
+
+
+def read_frames(source, max_frames=None):
+    """
+    Yields frames from a video file or a directory of images
+
+    Images in a directory are read in file name order.
+    """
+    count = 0
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if max_frames is not None and count >= max_frames:
+                return
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            frame = cv2.imread(os.path.join(source, name))
+            if frame is None:
+                raise IOError(f"Could not read image: {name}")
+            yield frame
+            count += 1
+        return
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {source}")
+    try:
+        while max_frames is None or count < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+            count += 1
+    finally:
+        cap.release()
+
+
+def replay(frames, gaze_detector, clock, trace=None):
+    """
+    Runs frames through a GazeDetection as fast as possible
+
+    Args:
+        frames (iterable): BGR frames
+        gaze_detector (GazeDetection): Detector created with clock=clock
+        clock (ReplayClock): Clock to advance before each frame
+        trace (file): Text file to write the JSONL trace to, optional
+
+    Returns:
+        dict: frames, violations, timeouts, total processing seconds,
+        frames per second and processing time percentiles in milliseconds
+    """
+    timings = []
+    violations = timeouts = 0
+
+    for index, frame in enumerate(frames):
+        now = clock.advance()
+        start = time.perf_counter()
+        result = gaze_detector.process_frame(frame)
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+
+        violations += bool(result["violation_triggered"])
+        timeouts += bool(result["is_timeout"])
+        if trace is not None:
+            record = {"frame": index, "time": round(now, 6)}
+            record.update({field: result[field] for field in TRACE_FIELDS})
+            record["seconds_since_facing"] = round(now - gaze_detector.last_facing_camera_time, 6)
+            # Per-frame evidence behind the smoothed is_facing_camera
+            record["raw_facing"] = gaze_detector.raw_facing
+            record["facing_score"] = gaze_detector.facing_score
+            record["processing_ms"] = round(elapsed * 1000, 3)
+            trace.write(json.dumps(record) + "\n")
+
+    total = sum(timings)
+    p50, p99 = np.percentile(timings, [50, 99]) * 1000 if timings else (None, None)
+    return {
+        "frames": len(timings),
+        "violations": violations,
+        "timeouts": timeouts,
+        "processing_seconds": total,
+        "fps": len(timings) / total if total > 0 else None,
+        "p50_ms": p50,
+        "p99_ms": p99,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded video through gaze detection")
+    parser.add_argument('source', help="Video file or directory of images")
+    parser.add_argument('--fps', type=float, default=10, help="Frame rate the recording is replayed as")
+    parser.add_argument('--timeout', type=float, default=15, help="Gaze timeout in seconds")
+    parser.add_argument('--detector', help="Face detector to use (default: GAZE_DETECTOR or haar)")
+    parser.add_argument('--trace', help="Write a JSONL trace of every frame to this file")
+    parser.add_argument('--max-frames', type=int, help="Stop after this many frames")
+    args = parser.parse_args(argv)
+
+    clock = ReplayClock(args.fps)
+    gaze_detector = GazeDetection(timeout_seconds=args.timeout, detector=args.detector, clock=clock)
+    frames = read_frames(args.source, args.max_frames)
+
+    if args.trace:
+        with open(args.trace, 'w') as trace:
+            summary = replay(frames, gaze_detector, clock, trace)
+    else:
+        summary = replay(frames, gaze_detector, clock)
+
+    if not summary["frames"]:
+        print("No frames to replay", file=sys.stderr)
+        return 1
+    print(f"Frames: {summary['frames']}  Violations: {summary['violations']}  Timeouts: {summary['timeouts']}")
+    print(f"Processing: {summary['processing_seconds']:.3f}s ({summary['fps']:.1f} fps)  "
+          f"p50 {summary['p50_ms']:.2f} ms  p99 {summary['p99_ms']:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import logging
+
+# Maps the "Option X" form stored in questions.correct_answer to an option index
+OPTION_INDEX_MAP = {"Option 1": 0, "Option 2": 1, "Option 3": 2, "Option 4": 3}
+
+
+def fetch_answer_key(supabase, exam_id):
+    """
+    Fetches the answer key for an exam in a single query
+
+    Args:
+        supabase: Supabase client
+        exam_id (int): Exam to fetch
+
+    Returns:
+        dict: question_id -> row with correct_answer and option1..option4
+    """
+    response = supabase.table('questions') \
+        .select('id, correct_answer, option1, option2, option3, option4') \
+        .eq('exam_id', exam_id) \
+        .execute()
+    return {q['id']: q for q in response.data}
+
+
+def correct_option_text(question):
+    """Returns the text of the correct option for a question row"""
+    correct_answer = question['correct_answer']
+    if correct_answer in OPTION_INDEX_MAP:
+        return question[f"option{OPTION_INDEX_MAP[correct_answer] + 1}"]
+    # Fallback to direct match (if correct_answer is stored as the actual text)
+    return correct_answer
+
+
+def is_correct_answer(question, selected_option):
+    """
+    Checks a selected option against a question row
+
+    Args:
+        question (dict): Row with correct_answer and option1..option4
+        selected_option (str): Text of the option the student picked
+
+    Returns:
+        bool: True if the selection is the correct answer
+    """
+    return selected_option == correct_option_text(question)
+
+
+def grade_answers(answer_key, answers):
+    """
+    Grades every answer of an attempt in one pass over the answer key
+
+    Args:
+        answer_key (dict): question_id -> question row, from fetch_answer_key
+        answers (dict): question_id -> selected option index (0-3)
+
+    Returns:
+        dict: question_id -> (selected option text, is_correct) for every
+        answered question present in the answer key
+    """
+    question_ids = [q_id for q_id in answers if q_id in answer_key]
+    missing = len(answers) - len(question_ids)
+    if missing:
+        logging.warning(f"{missing} answered questions are not in the answer key")
+
+    questions = [answer_key[q_id] for q_id in question_ids]
+    selected = [q[f"option{answers[q_id] + 1}"] for q_id, q in zip(question_ids, questions)]
+    expected = [correct_option_text(q) for q in questions]
+    correct = [s == e for s, e in zip(selected, expected)]
+
+    return dict(zip(question_ids, zip(selected, correct)))
+
+
+def build_answer_rows(exam_id, student_username, graded):
+    """Turns grade_answers() output into student_answers rows for a bulk upsert"""
+    return [{
+        'exam_id': exam_id,
+        'question_id': question_id,
+        'student_username': student_username,
+        'selected_answer': selected_option,
+        'is_correct': is_correct
+    } for question_id, (selected_option, is_correct) in graded.items()]
@@ -6,9 +6,27 @@ from teacher_dashboard import TeacherDashboard
 from admin_dashboard import AdminDashboard
 from styles import COMMON_STYLES
 from exam_creation import ExamCreation
+from data_loader import DataLoader
+from navigation import NavigationManager
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    # Top-level pages, built on first navigation: attribute name -> page class.
+    # A user only ever sees one dashboard, so the others are never built
+    PAGE_CLASSES = {
+        'signup_page': SignupPage,
+        'login_page': LoginPage,
+        'student_dashboard': StudentDashboard,
+        'teacher_dashboard': TeacherDashboard,
+        'admin_dashboard': AdminDashboard,
+    }
+
+    signup_page = property(lambda self: self.page('signup_page'))
+    login_page = property(lambda self: self.page('login_page'))
+    student_dashboard = property(lambda self: self.page('student_dashboard'))
+    teacher_dashboard = property(lambda self: self.page('teacher_dashboard'))
+    admin_dashboard = property(lambda self: self.page('admin_dashboard'))
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Proctor Prime - Online Examination System")
@@ -35,25 +53,59 @@ class MainWindow(QtWidgets.QMainWindow):
         self.stackedWidget = QtWidgets.QStackedWidget()
         self.setCentralWidget(self.stackedWidget)
 
+        # Runs dashboard queries off the GUI thread; loads for pages that are
+        # navigated away from are cancelled
+        self.data_loader = DataLoader(self)
+        self.data_loader.attach(self.stackedWidget)
+
+        # Reuses dashboard subpages and deletes single-use pages (disclaimer,
+        # exams) once they are left, so the stack doesn't grow per visit
+        self.navigation = NavigationManager(self.stackedWidget, self)
+
         # Store current user info
         self.current_user = None
         self.current_user_type = None
 
-        self.signup_page = SignupPage(self)
-        self.login_page = LoginPage(self)
-        self.student_dashboard = StudentDashboard(self)
-        self.teacher_dashboard = TeacherDashboard(self)
-        self.admin_dashboard = AdminDashboard(self)
-
-        self.stackedWidget.addWidget(self.signup_page)
-        self.stackedWidget.addWidget(self.login_page)
-        self.stackedWidget.addWidget(self.student_dashboard)
-        self.stackedWidget.addWidget(self.teacher_dashboard)
-        self.stackedWidget.addWidget(self.admin_dashboard)
-    
+        # Pages built so far, by name; see page()
+        self.pages = {}
 
         self.stackedWidget.setCurrentWidget(self.login_page)
 
+    def page(self, name):
+        """
+        Returns a top-level page, building it and adding it to the stacked
+        widget the first time it is asked for
+
+        Args:
+            name (str): Key of PAGE_CLASSES, e.g. 'student_dashboard'
+
+        Returns:
+            QWidget: The cached page
+        """
+        if name not in self.pages:
+            page = self.PAGE_CLASSES[name](self)
+            self.stackedWidget.addWidget(page)
+            self.pages[name] = page
+        return self.pages[name]
+
+    def evict_page(self, page):
+        """
+        Removes a page and its subpages from the stacked widget and deletes
+        them, e.g. the dashboard of a user who logged out. Top-level pages
+        are rebuilt by page() the next time they are needed. Navigate away
+        from the page before evicting it.
+
+        Args:
+            page (QWidget): Page to remove
+
+        Returns:
+            bool: False if the page isn't in the stacked widget
+        """
+        for name, cached in list(self.pages.items()):
+            if cached is page:
+                del self.pages[name]
+        return self.navigation.remove(page)
+
 if __name__ == "__main__":
     app = QtWidgets.QApplication([])
     window = MainWindow()
@@ -0,0 +1,26 @@
+-- Natural keys for per-student answers and results.
+-- Required for the batched upserts used by the answer journal and exam
+-- submission (on_conflict targets must be backed by a unique constraint).
+
+-- Drop duplicate rows left behind by the old select-then-insert code paths,
+-- keeping the most recent row of each group.
+DELETE FROM student_answers a
+USING student_answers b
+WHERE a.id < b.id
+  AND a.exam_id = b.exam_id
+  AND a.question_id = b.question_id
+  AND a.student_username = b.student_username;
+
+DELETE FROM exam_results a
+USING exam_results b
+WHERE a.id < b.id
+  AND a.exam_id = b.exam_id
+  AND a.student_username = b.student_username;
+
+ALTER TABLE student_answers
+    ADD CONSTRAINT uq_student_answers_exam_question_student
+    UNIQUE (exam_id, question_id, student_username);
+
+ALTER TABLE exam_results
+    ADD CONSTRAINT uq_exam_results_exam_student
+    UNIQUE (exam_id, student_username);
@@ -0,0 +1,84 @@
+-- record_answers: save a batch of answers and keep the attempt's score in
+-- exam_results up to date in a single call.
+--
+-- p_answers is a JSON array of {"question_id": <int>, "selected_answer": <text>}.
+-- Correctness is decided here from the questions table, the score is
+-- recounted from student_answers inside the same transaction, and the
+-- exam_results row is locked first so concurrent calls for the same attempt
+-- serialise instead of racing on the score. Pass p_completed = TRUE on
+-- submission to stamp completed_at. Returns the new score.
+--
+-- Once completed_at is set the attempt is final: later calls, e.g. a late
+-- write from the client or a resubmission, change nothing and return the
+-- stored score. This also keeps the zero score of a terminated exam.
+--
+-- Requires 001_unique_answer_and_result_keys.sql.
+
+CREATE OR REPLACE FUNCTION record_answers(
+    p_exam_id INT,
+    p_student_username VARCHAR,
+    p_answers JSONB,
+    p_completed BOOLEAN DEFAULT FALSE
+) RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_score INT;
+    v_completed_at TIMESTAMP;
+BEGIN
+    -- completed_at defaults to the insert time; an attempt in progress has none
+    INSERT INTO exam_results (exam_id, student_username, score, completed_at)
+    VALUES (p_exam_id, p_student_username, 0, NULL)
+    ON CONFLICT (exam_id, student_username) DO NOTHING;
+
+    SELECT score, completed_at INTO v_score, v_completed_at
+    FROM exam_results
+    WHERE exam_id = p_exam_id
+      AND student_username = p_student_username
+    FOR UPDATE;
+
+    IF v_completed_at IS NOT NULL THEN
+        RETURN v_score;
+    END IF;
+
+    INSERT INTO student_answers (exam_id, question_id, student_username, selected_answer, is_correct)
+    SELECT DISTINCT ON (q.id)
+        p_exam_id,
+        q.id,
+        p_student_username,
+        a.value ->> 'selected_answer',
+        (a.value ->> 'selected_answer') = CASE q.correct_answer
+            WHEN 'Option 1' THEN q.option1
+            WHEN 'Option 2' THEN q.option2
+            WHEN 'Option 3' THEN q.option3
+            WHEN 'Option 4' THEN q.option4
+            ELSE q.correct_answer
+        END
+    FROM jsonb_array_elements(COALESCE(p_answers, '[]'::jsonb)) WITH ORDINALITY AS a(value, position)
+    JOIN questions q
+      ON q.id = (a.value ->> 'question_id')::INT
+     AND q.exam_id = p_exam_id
+    WHERE a.value ->> 'selected_answer' IS NOT NULL
+    -- If a question appears more than once, the last entry wins
+    ORDER BY q.id, a.position DESC
+    ON CONFLICT (exam_id, question_id, student_username)
+    DO UPDATE SET selected_answer = EXCLUDED.selected_answer,
+                  is_correct = EXCLUDED.is_correct;
+
+    SELECT COUNT(*) INTO v_score
+    FROM student_answers
+    WHERE exam_id = p_exam_id
+      AND student_username = p_student_username
+      AND is_correct;
+
+    UPDATE exam_results
+    SET score = v_score,
+        completed_at = CASE WHEN p_completed THEN CURRENT_TIMESTAMP ELSE completed_at END
+    WHERE exam_id = p_exam_id
+      AND student_username = p_student_username;
+
+    RETURN v_score;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION record_answers(INT, VARCHAR, JSONB, BOOLEAN) TO anon, authenticated;
@@ -0,0 +1,27 @@
+-- exams.question_count: number of questions in each exam, kept up to date by
+-- a trigger on questions so result pages can show "score / total" without
+-- downloading every question ID.
+
+ALTER TABLE exams ADD COLUMN IF NOT EXISTS question_count INT NOT NULL DEFAULT 0;
+
+UPDATE exams e
+SET question_count = (SELECT COUNT(*) FROM questions q WHERE q.exam_id = e.id);
+
+CREATE OR REPLACE FUNCTION maintain_exam_question_count() RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE exams SET question_count = question_count + 1 WHERE id = NEW.exam_id;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE exams SET question_count = question_count - 1 WHERE id = OLD.exam_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_questions_count ON questions;
+CREATE TRIGGER trg_questions_count
+AFTER INSERT OR DELETE OR UPDATE OF exam_id ON questions
+FOR EACH ROW EXECUTE FUNCTION maintain_exam_question_count();
@@ -0,0 +1,18 @@
+-- Indexes behind the admin dashboard's paginated user lists: a btree on
+-- (user_type, username) serves the keyset pages (username > last seen, in
+-- username order) and a trigram index serves the ILIKE '%text%' search.
+-- pg_trgm ships with Supabase; where it isn't available the search still
+-- works, it just scans the user type's rows.
+
+CREATE INDEX IF NOT EXISTS users_user_type_username_idx ON users (user_type, username);
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        EXECUTE 'CREATE INDEX IF NOT EXISTS users_username_trgm_idx ON users USING gin (username gin_trgm_ops)';
+    ELSE
+        RAISE NOTICE 'pg_trgm is not available; user search will not be indexed';
+    END IF;
+END;
+$$;
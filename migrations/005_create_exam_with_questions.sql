@@ -0,0 +1,48 @@
+-- create_exam_with_questions: insert an exam and all of its questions in a
+-- single call and a single transaction, so an exam is never left behind
+-- with only some of its questions.
+--
+-- p_exam is a JSON object with the exams columns name, teacher_username,
+-- duration, exam_date, start_time and end_time, and optionally status
+-- (default 'active'). p_questions is a JSON array of objects with
+-- question_text, option1..option4 and correct_answer; the questions are
+-- inserted in array order with one INSERT. Returns the new exam's id.
+
+CREATE OR REPLACE FUNCTION create_exam_with_questions(
+    p_exam JSONB,
+    p_questions JSONB
+) RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_exam_id INT;
+BEGIN
+    INSERT INTO exams (name, teacher_username, duration, status, exam_date, start_time, end_time)
+    VALUES (
+        p_exam ->> 'name',
+        p_exam ->> 'teacher_username',
+        (p_exam ->> 'duration')::INT,
+        COALESCE(p_exam ->> 'status', 'active'),
+        (p_exam ->> 'exam_date')::DATE,
+        (p_exam ->> 'start_time')::TIME,
+        (p_exam ->> 'end_time')::TIME
+    )
+    RETURNING id INTO v_exam_id;
+
+    INSERT INTO questions (exam_id, question_text, option1, option2, option3, option4, correct_answer)
+    SELECT
+        v_exam_id,
+        q.value ->> 'question_text',
+        q.value ->> 'option1',
+        q.value ->> 'option2',
+        q.value ->> 'option3',
+        q.value ->> 'option4',
+        q.value ->> 'correct_answer'
+    FROM jsonb_array_elements(COALESCE(p_questions, '[]'::jsonb)) WITH ORDINALITY AS q(value, position)
+    ORDER BY q.position;
+
+    RETURN v_exam_id;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION create_exam_with_questions(JSONB, JSONB) TO anon, authenticated;
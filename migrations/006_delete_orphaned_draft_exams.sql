@@ -0,0 +1,42 @@
+-- delete_orphaned_draft_exams: delete draft exams that were never finished,
+-- with their questions, in one transaction.
+--
+-- Exam creation used to insert the exam as a draft before its questions
+-- were written, so every abandoned exam left a draft row behind. Exams are
+-- now saved in one go when they are finished (see
+-- 005_create_exam_with_questions.sql). Only drafts created more than
+-- p_older_than ago and without any results or answers are deleted, so an
+-- import still in progress is left alone. Returns the number of exams
+-- deleted.
+
+CREATE OR REPLACE FUNCTION delete_orphaned_draft_exams(
+    p_older_than INTERVAL DEFAULT INTERVAL '24 hours'
+) RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_exam_ids INT[];
+BEGIN
+    SELECT ARRAY(
+        SELECT e.id
+        FROM exams e
+        WHERE e.status = 'draft'
+          AND e.created_at < CURRENT_TIMESTAMP - p_older_than
+          AND NOT EXISTS (SELECT 1 FROM exam_results r WHERE r.exam_id = e.id)
+          AND NOT EXISTS (SELECT 1 FROM student_answers a WHERE a.exam_id = e.id)
+        FOR UPDATE
+    ) INTO v_exam_ids;
+
+    DELETE FROM questions WHERE exam_id = ANY(v_exam_ids);
+    DELETE FROM exams WHERE id = ANY(v_exam_ids);
+
+    RETURN cardinality(v_exam_ids);
+END;
+$$;
+
+-- Deleting exams is maintenance, not something the app's anon key may do:
+-- only the service role (cleanup_draft_exams.py) can run this. Functions
+-- are executable by PUBLIC by default, and Supabase also grants new
+-- functions to anon and authenticated, so revoke from all three.
+REVOKE EXECUTE ON FUNCTION delete_orphaned_draft_exams(INTERVAL) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION delete_orphaned_draft_exams(INTERVAL) TO service_role;
@@ -0,0 +1,105 @@
+import logging
+from PyQt6 import QtCore, QtWidgets, sip
+
+
+class NavigationManager(QtCore.QObject):
+    """
+    Keeps the main QStackedWidget from growing with every visit.
+
+    Subpages such as a dashboard's "My Results" are singletons: one per
+    owner page, built on the first visit and refreshed on later ones.
+    Transient pages such as the exam disclaimer or an exam are used once:
+    they are removed and deleted as soon as another page is shown.
+    """
+
+    def __init__(self, stacked_widget, parent=None):
+        super().__init__(parent)
+        self.stacked_widget = stacked_widget
+        self._subpages = {}  # (owner, key) -> page
+        self._transient = set()
+        stacked_widget.currentChanged.connect(self._on_page_changed)
+
+    def show_subpage(self, owner, key, build, refresh=None):
+        """
+        Shows an owner's subpage, building it on the first visit
+
+        Args:
+            owner (QWidget): Page the subpage belongs to; its subpages are
+                removed along with it
+            key (str): Name of the subpage, unique per owner
+            build (callable): Returns the new subpage widget
+            refresh (callable): Called when an existing subpage is shown
+                again, e.g. to reload its data; optional
+
+        Returns:
+            QWidget: The subpage
+        """
+        page = self._subpages.get((owner, key))
+        if page is not None and sip.isdeleted(page):
+            del self._subpages[(owner, key)]
+            page = None
+
+        if page is None:
+            page = build()
+            self._subpages[(owner, key)] = page
+            self.stacked_widget.addWidget(page)
+            self.stacked_widget.setCurrentWidget(page)
+        else:
+            self.stacked_widget.setCurrentWidget(page)
+            if refresh is not None:
+                refresh()
+        return page
+
+    def show_transient(self, page):
+        """Adds a single-use page and shows it; it is deleted once navigated away from"""
+        self._transient.add(page)
+        self.stacked_widget.addWidget(page)
+        self.stacked_widget.setCurrentWidget(page)
+        return page
+
+    def remove(self, page):
+        """
+        Removes a page, and any subpages it owns, from the stacked widget
+        and deletes them
+
+        Returns:
+            bool: False if the page isn't in the stacked widget
+        """
+        if self.stacked_widget.indexOf(page) == -1:
+            return False
+        for (owner, key), subpage in list(self._subpages.items()):
+            if owner is page:
+                del self._subpages[(owner, key)]
+                self._delete(subpage)
+            elif subpage is page:
+                del self._subpages[(owner, key)]
+        self._transient.discard(page)
+        self._delete(page)
+        return True
+
+    def counts(self):
+        """
+        Returns:
+            dict: Pages in the stacked widget, how many of those are
+            subpages and transient pages, and the widgets they contain
+        """
+        return {
+            'pages': self.stacked_widget.count(),
+            'subpages': len(self._subpages),
+            'transient': len(self._transient),
+            'widgets': len(self.stacked_widget.findChildren(QtWidgets.QWidget)),
+        }
+
+    def _delete(self, page):
+        if not sip.isdeleted(page):
+            self.stacked_widget.removeWidget(page)
+            page.deleteLater()
+
+    def _on_page_changed(self, _index):
+        current = self.stacked_widget.currentWidget()
+        for page in list(self._transient):
+            if page is not current:
+                self._transient.discard(page)
+                self._delete(page)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Navigation: {self.counts()}")
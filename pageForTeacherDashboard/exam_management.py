@@ -1,6 +1,8 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 from supabase_connection import create_connection
 from PyQt6.QtCore import QDateTime
+from data_loader import clear_layout, show_loading
+import functools
 
 class ExamManagement(QtWidgets.QWidget):
     def __init__(self, main_window):
@@ -62,34 +64,41 @@ class ExamManagement(QtWidgets.QWidget):
         self.load_exams()
 
     def load_exams(self):
-        # Clear existing exams
-        while self.exams_layout.count():
-            item = self.exams_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-        
-        try:
-            supabase = create_connection()
-            exams_response = supabase.table('exams') \
-                .select('id, name, status, exam_date, start_time, end_time, violation_limit') \
-                .eq('teacher_username', self.main_window.current_user) \
-                .execute()
+        # Show a placeholder while the exams are fetched in the background
+        show_loading(self.exams_layout, "Loading exams...")
+        self.main_window.data_loader.load(
+            self.exams_container,
+            functools.partial(self.fetch_exams, self.main_window.current_user),
+            self.render_exams,
+            self.show_load_error
+        )
 
-            data = exams_response.data
-            if not data:
-                no_exams_label = QtWidgets.QLabel("No exams created yet.")
-                no_exams_label.setStyleSheet("color: #555; font-size: 16px; padding: 20px;")
-                self.exams_layout.addWidget(no_exams_label)
-                return
+    def fetch_exams(self, teacher_username):
+        """Fetches the teacher's exams. Runs on a worker thread."""
+        supabase = create_connection()
+        exams_response = supabase.table('exams') \
+            .select('id, name, status, exam_date, start_time, end_time, violation_limit') \
+            .eq('teacher_username', teacher_username) \
+            .execute()
+        return exams_response.data
 
-            for exam in data:
-                self.create_exam_card(exam)
+    def render_exams(self, data):
+        clear_layout(self.exams_layout)
 
-        except Exception as e:
-            error_label = QtWidgets.QLabel(f"Error loading exams: {str(e)}")
-            error_label.setStyleSheet("color: red;")
-            self.exams_layout.addWidget(error_label)
+        if not data:
+            no_exams_label = QtWidgets.QLabel("No exams created yet.")
+            no_exams_label.setStyleSheet("color: #555; font-size: 16px; padding: 20px;")
+            self.exams_layout.addWidget(no_exams_label)
+            return
+
+        for exam in data:
+            self.create_exam_card(exam)
+
+    def show_load_error(self, e):
+        clear_layout(self.exams_layout)
+        error_label = QtWidgets.QLabel(f"Error loading exams: {str(e)}")
+        error_label.setStyleSheet("color: red;")
+        self.exams_layout.addWidget(error_label)
     
     def create_exam_card(self, exam):
         # Create card container
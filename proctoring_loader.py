@@ -0,0 +1,60 @@
+import importlib
+import logging
+import threading
+import time
+
+# Module holding the proctored exam page; importing it pulls in OpenCV, NumPy
+# and gaze detection, so nothing imports it at startup
+PROCTORING_MODULE = "exam_taking_proctored"
+
+_load_lock = threading.Lock()
+_prewarm_thread = None
+load_seconds = None  # How long the first load took, for the startup report
+
+
+def load_proctoring(module_name=PROCTORING_MODULE):
+    """
+    Returns the proctoring module, importing it on first use.
+    If a prewarm is still running this waits for it instead of
+    importing a second time.
+
+    Raises:
+        ImportError: If OpenCV or another proctoring dependency is missing
+    """
+    global load_seconds
+    with _load_lock:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        if load_seconds is None:
+            load_seconds = time.perf_counter() - start
+            logging.info(f"Loaded proctoring stack in {load_seconds:.2f}s")
+
+        # mediapipe is only imported when its detector is created; do it now too.
+        # face_detectors imports cv2, so it can't be imported at the top of this module
+        from face_detectors import detector_name, MediaPipeFaceDetector
+        if detector_name() == MediaPipeFaceDetector.name:
+            importlib.import_module("mediapipe")
+    return module
+
+
+def _prewarm(module_name):
+    try:
+        load_proctoring(module_name)
+    except Exception as e:
+        # The exam page reports this when it loads the module for real
+        logging.warning(f"Prewarming the proctoring stack failed: {e}")
+
+
+def prewarm_proctoring(module_name=PROCTORING_MODULE):
+    """
+    Starts loading the proctoring stack on a background thread, e.g. while
+    the student reads the exam disclaimer. Safe to call more than once.
+
+    Returns:
+        threading.Thread: The loading thread
+    """
+    global _prewarm_thread
+    if _prewarm_thread is None or (not _prewarm_thread.is_alive() and load_seconds is None):
+        _prewarm_thread = threading.Thread(target=_prewarm, args=(module_name,), daemon=True)
+        _prewarm_thread.start()
+    return _prewarm_thread
@@ -0,0 +1,314 @@
+import csv
+import json
+import logging
+import os
+import re
+from grading import OPTION_INDEX_MAP, correct_option_text
+from supabase_connection import create_connection, create_exam_with_questions, is_missing_rpc_error
+
+QUESTION_FIELDS = ('question_text', 'option1', 'option2', 'option3', 'option4', 'correct_answer')
+OPTION_FIELDS = QUESTION_FIELDS[1:5]
+OPTION_LETTERS = "ABCD"
+MAX_OPTION_LENGTH = 255  # questions.option1..option4 are VARCHAR(255)
+
+# Questions per bulk insert when create_exam_with_questions() isn't deployed
+CHUNK_SIZE = 500
+
+# Questions fetched per query when exporting
+EXPORT_PAGE_SIZE = 1000
+
+FILE_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.gift': 'gift', '.txt': 'gift'}
+
+# Characters with a meaning in GIFT, escaped with a backslash in text
+GIFT_SPECIAL = '~=#{}:'
+
+
+def file_format(path):
+    """Returns 'csv', 'jsonl' or 'gift' from a file's extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(f"Unsupported question file type '{extension}', use .csv, .jsonl or .gift")
+    return FILE_FORMATS[extension]
+
+
+def _unescape_gift(text):
+    return re.sub(r'\\(.)', r'\1', text).strip()
+
+
+def _escape_gift(text):
+    return ''.join('\\' + char if char in GIFT_SPECIAL or char == '\\' else char for char in text)
+
+
+def _split_unescaped(text, separators):
+    """
+    Splits text at the separator characters that aren't escaped with a backslash
+
+    Returns:
+        list: (separator, text) pairs; the first separator is ''
+    """
+    parts, start, separator, i = [], 0, '', 0
+    while i < len(text):
+        if text[i] == '\\':
+            i += 2
+            continue
+        if text[i] in separators:
+            parts.append((separator, text[start:i]))
+            separator, start = text[i], i + 1
+        i += 1
+    parts.append((separator, text[start:]))
+    return parts
+
+
+def parse_gift_question(block):
+    """
+    Parses one multiple choice question in the GIFT format:
+
+        ::Title:: Question text {=right answer ~wrong ~wrong ~wrong}
+
+    The title and answer feedback (#...) are ignored. Answers become
+    option1..option4 in the order written.
+
+    Returns:
+        dict: Question row, as read; None unless there is one set of answers
+        in braces
+    """
+    body = block.strip()
+    if body.startswith('::'):
+        title_end = body.find('::', 2)
+        if title_end != -1:
+            body = body[title_end + 2:]
+
+    parts = _split_unescaped(body, '{}')
+    if [separator for separator, _ in parts] != ['', '{', '}']:
+        return None
+
+    # GIFT allows text after the answers too
+    row = {'question_text': _unescape_gift(parts[0][1].strip() + ' ' + parts[2][1].strip())}
+    correct = []
+    for number, (marker, answer) in enumerate(_split_unescaped(parts[1][1], '=~')[1:], 1):
+        answer = _split_unescaped(answer, '#')[0][1]  # Drop the feedback
+        row[f"option{number}"] = _unescape_gift(answer)
+        if marker == '=':
+            correct.append(f"Option {number}")
+    row['correct_answer'] = ', '.join(correct)
+    return row
+
+
+def read_questions(file, file_type):
+    """
+    Streams the questions in a question file
+
+    Args:
+        file: Text file object
+        file_type (str): 'csv' (with a header row), 'jsonl' or 'gift'
+
+    Yields:
+        tuple: (line number, question dict with lowercased keys, or None for
+        an entry that isn't a question)
+    """
+    if file_type == 'csv':
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, {str(key).strip().lower(): value for key, value in row.items() if key}
+    elif file_type == 'jsonl':
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                row = None
+            if not isinstance(row, dict):
+                yield line_number, None
+                continue
+            yield line_number, {str(key).strip().lower(): value for key, value in row.items()}
+    else:
+        # Questions are separated by blank lines; // starts a comment line
+        block, first_line = [], None
+        for line_number, line in enumerate(file, 1):
+            stripped = line.strip()
+            if stripped.startswith('//') or stripped.startswith('$CATEGORY'):
+                continue
+            if stripped:
+                if not block:
+                    first_line = line_number
+                block.append(line)
+                continue
+            if block:
+                yield first_line, parse_gift_question(''.join(block))
+                block = []
+        if block:
+            yield first_line, parse_gift_question(''.join(block))
+
+
+def resolve_correct_answer(value, options):
+    """
+    Normalises a correct answer to the 'Option N' form the exam form saves
+
+    Accepts 'Option 2', '2', 'B' or the text of one of the options.
+
+    Returns:
+        str: 'Option 1' to 'Option 4', or None if value matches none of them
+    """
+    value = str(value or '').strip()
+    if not value:
+        return None
+    for option in OPTION_INDEX_MAP:
+        if value.lower() == option.lower():
+            return option
+    if value in ('1', '2', '3', '4'):
+        return f"Option {value}"
+    if len(value) == 1 and value.upper() in OPTION_LETTERS:
+        return f"Option {OPTION_LETTERS.index(value.upper()) + 1}"
+    if value in options:
+        return f"Option {options.index(value) + 1}"
+    return None
+
+
+def validate_question(row):
+    """
+    Checks one question with the rules of the exam form
+
+    Returns:
+        tuple: (questions row without exam_id, None) or (None, error message)
+    """
+    if row is None:
+        return None, "Not a question"
+    question_text = str(row.get('question_text') or '').strip()
+    options = [str(row.get(field) or '').strip() for field in OPTION_FIELDS]
+
+    if not question_text:
+        return None, "Question cannot be empty"
+    if row.get('option5'):
+        return None, "Questions must have exactly 4 options"
+    if not all(options):
+        return None, "All options must be filled"
+    if any(len(option) > MAX_OPTION_LENGTH for option in options):
+        return None, f"Options must be at most {MAX_OPTION_LENGTH} characters"
+    correct_answer = resolve_correct_answer(row.get('correct_answer'), options)
+    if correct_answer is None:
+        return None, "Correct answer must be one of Option 1-4, A-D or the text of an option"
+
+    question = dict(zip(OPTION_FIELDS, options))
+    question['question_text'] = question_text
+    question['correct_answer'] = correct_answer
+    return question, None
+
+
+def parse_question_file(path):
+    """
+    Reads and validates every question in a CSV, JSONL or GIFT file
+
+    Returns:
+        tuple: (valid questions in file order, list of (line number, error))
+    """
+    questions, errors = [], []
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for line_number, row in read_questions(f, file_format(path)):
+            question, error = validate_question(row)
+            if error is None:
+                questions.append(question)
+            else:
+                errors.append((line_number, error))
+    return questions, errors
+
+
+def insert_exam_in_chunks(supabase, exam, questions, chunk_size=CHUNK_SIZE):
+    """
+    Creates an exam and its questions with table queries: the exam as a
+    draft, the questions with one bulk insert per chunk, then the exam's
+    final status. Deletes what it wrote if any step fails.
+
+    Returns:
+        int: ID of the new exam
+    """
+    response = supabase.table('exams').insert(dict(exam, status='draft')).execute()
+    exam_id = response.data[0]['id']
+    try:
+        for start in range(0, len(questions), chunk_size):
+            supabase.table('questions') \
+                .insert([dict(question, exam_id=exam_id) for question in questions[start:start + chunk_size]]) \
+                .execute()
+        supabase.table('exams').update({'status': exam.get('status', 'active')}).eq('id', exam_id).execute()
+    except Exception:
+        supabase.table('questions').delete().eq('exam_id', exam_id).execute()
+        supabase.table('exams').delete().eq('id', exam_id).execute()
+        raise
+    return exam_id
+
+
+def save_exam_with_questions(exam, questions):
+    """
+    Creates an exam with all of its questions at once
+
+    Uses the create_exam_with_questions() database function, so the exam
+    and its questions are written in one transaction. Falls back to
+    insert_exam_in_chunks() if that function hasn't been deployed yet.
+
+    Args:
+        exam (dict): exams columns, see create_exam_with_questions()
+        questions (list): Rows from validate_question(), in order
+
+    Returns:
+        int: ID of the new exam
+    """
+    try:
+        return create_exam_with_questions(exam, questions)
+    except Exception as e:
+        if not is_missing_rpc_error(e):
+            raise
+    logging.warning("create_exam_with_questions() is not deployed, inserting questions in chunks")
+    return insert_exam_in_chunks(create_connection(), exam, questions)
+
+
+def iter_exam_questions(supabase, exam_id, page_size=EXPORT_PAGE_SIZE):
+    """Yields an exam's questions in ID order, fetching a page at a time"""
+    last_id = None
+    while True:
+        query = supabase.table('questions') \
+            .select(', '.join(('id',) + QUESTION_FIELDS)) \
+            .eq('exam_id', exam_id)
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        rows = query.order('id').limit(page_size).execute().data
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]['id']
+
+
+def export_questions(supabase, exam_id, path, page_size=EXPORT_PAGE_SIZE):
+    """
+    Writes an exam's questions to a CSV, JSONL or GIFT file that
+    parse_question_file() reads back
+
+    Returns:
+        int: Number of questions written
+    """
+    file_type = file_format(path)
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = None
+        if file_type == 'csv':
+            writer = csv.DictWriter(f, fieldnames=QUESTION_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+
+        for question in iter_exam_questions(supabase, exam_id, page_size):
+            count += 1
+            options = [question[field] for field in OPTION_FIELDS]
+            # Older rows may store the correct option's text instead of 'Option N'
+            correct_answer = resolve_correct_answer(question['correct_answer'], options) \
+                or resolve_correct_answer(correct_option_text(question), options) \
+                or question['correct_answer']
+            row = dict(question, correct_answer=correct_answer)
+
+            if file_type == 'csv':
+                writer.writerow(row)
+            elif file_type == 'jsonl':
+                f.write(json.dumps({field: row[field] for field in QUESTION_FIELDS}) + "\n")
+            else:
+                answers = "\n".join(
+                    f"{'=' if correct_answer == f'Option {number}' else '~'}{_escape_gift(option)}"
+                    for number, option in enumerate(options, 1))
+                f.write(f"::Q{count}:: {_escape_gift(row['question_text'])} {{\n{answers}\n}}\n\n")
+    return count
@@ -0,0 +1,143 @@
+import numpy as np
+
+NGRAM = 3
+
+
+def _code(gram):
+    """Packs NGRAM bytes into an integer; keeps byte order, so codes sort like the bytes"""
+    code = 0
+    for byte in gram:
+        code = (code << 8) | byte
+    return code
+
+
+class SearchIndex:
+    """
+    Case-insensitive substring search over a list of strings, e.g. the
+    usernames loaded in an admin list.
+
+    The strings are lowercased, UTF-8 encoded and laid out in one buffer,
+    each followed by NGRAM - 1 zero bytes. Every position in the buffer is
+    indexed by the trigram starting there, in a sorted array. A query of
+    three or more bytes then starts at the positions where all of its
+    trigrams line up, found by binary search starting from its rarest
+    trigram. Shorter queries are the prefix of a range of trigrams (the
+    zero padding covers the end of a string). Built once per load; a
+    query costs time proportional to the positions of its rarest trigram,
+    not to the number of strings. search() narrows the previous query's
+    matches when the query grows, checking only the new trigrams.
+    """
+
+    def __init__(self, strings):
+        self.lowered = [s.lower().encode('utf-8') for s in strings]
+        lengths = np.array([len(s) for s in self.lowered], dtype=np.int64)
+        # Offset of each string in the buffer, for mapping positions back to rows
+        self.starts = np.concatenate(([0], np.cumsum(lengths + NGRAM - 1)[:-1])).astype(np.int64)
+
+        padding = b'\0' * (NGRAM - 1)
+        buffer = np.frombuffer(padding.join(self.lowered) + padding, dtype=np.uint8).astype(np.int32)
+        count = max(len(buffer) - NGRAM + 1, 0)
+        codes = np.zeros(count, dtype=np.int32)
+        for i in range(NGRAM):
+            codes = (codes << 8) | buffer[i:i + count]
+
+        # Trigrams that start in the padding would only match across strings
+        positions = np.flatnonzero(buffer[:count]).astype(np.int64)
+        codes = codes[positions]
+        order = np.argsort(codes, kind='stable')  # Keeps each trigram's positions ascending
+        self.codes = codes[order]
+        self.positions = positions[order]
+        # Row of each indexed position, so matches map back without a search
+        self.rows = (np.searchsorted(self.starts, self.positions, side='right') - 1).astype(np.int32)
+        self._last = None  # (key, start positions, rows) of the last search()
+
+    def __len__(self):
+        return len(self.lowered)
+
+    def _span(self, low, high):
+        """Slice of the index holding the trigram codes in [low, high]"""
+        # Search with the array's own dtype; a Python int would copy the array
+        return slice(np.searchsorted(self.codes, np.int32(low), side='left'),
+                     np.searchsorted(self.codes, np.int32(high), side='right'))
+
+    def _occurrences(self, key, known=None):
+        """
+        Start positions of key in the buffer and the row of each, ascending.
+        key must be at least NGRAM bytes long.
+
+        Args:
+            key (bytes): Lowercased, encoded query
+            known (tuple): (length, positions, rows) from a previous call for
+                a prefix of key; only the trigrams after it are checked
+        """
+        offsets = range(len(key) - NGRAM + 1)
+        if known is not None:
+            length, positions, rows = known
+            offsets = offsets[length - NGRAM + 1:]
+        grams = sorted(((self._span(code, code), offset)
+                        for offset, code in ((i, _code(key[i:i + NGRAM])) for i in offsets)),
+                       key=lambda gram: gram[0].stop - gram[0].start)
+        if known is None:
+            # Start from the rarest trigram
+            span, offset = grams.pop(0)
+            positions, rows = self.positions[span] - offset, self.rows[span]
+
+        for span, offset in grams:
+            postings = self.positions[span]
+            if not len(positions) or not len(postings):
+                return positions[:0], rows[:0]
+            wanted = positions + offset
+            found = np.minimum(np.searchsorted(postings, wanted), len(postings) - 1)
+            keep = postings[found] == wanted
+            positions, rows = positions[keep], rows[keep]
+        return positions, rows
+
+    @staticmethod
+    def _unique_rows(rows):
+        """Rows of ascending positions are ascending too, so repeats are adjacent"""
+        return rows[np.concatenate(([True], rows[1:] != rows[:-1]))] if len(rows) else rows
+
+    def find(self, query):
+        """
+        Finds the strings containing query, ignoring case
+
+        Returns:
+            numpy.ndarray: Sorted row indices of the matches, or None for an
+            empty query (everything matches)
+        """
+        key = query.lower().encode('utf-8')
+        if not key:
+            return None
+
+        if len(key) < NGRAM:
+            # Matches can be many and span several trigrams, so mark rows in
+            # a mask instead of sorting their positions
+            missing = NGRAM - len(key)
+            span = self._span(_code(key + b'\0' * missing), _code(key + b'\xff' * missing))
+            matched = np.zeros(len(self.lowered), dtype=bool)
+            matched[self.rows[span]] = True
+            return np.flatnonzero(matched)
+
+        return self._unique_rows(self._occurrences(key)[1])
+
+    def search(self, query):
+        """
+        find() for search-as-you-type: when the query extends the previous
+        one, only the previous matches are checked, against the new trigrams
+
+        Returns:
+            numpy.ndarray: Sorted row indices of the matches, or None for an
+            empty query
+        """
+        key = query.lower().encode('utf-8')
+        if len(key) < NGRAM:
+            self._last = None
+            return self.find(query)
+
+        known = None
+        if self._last is not None and key.startswith(self._last[0]):
+            last_key, positions, rows = self._last
+            known = (len(last_key), positions, rows)
+        positions, rows = self._occurrences(key, known)
+        self._last = (key, positions, rows)
+        return self._unique_rows(rows)
@@ -0,0 +1,97 @@
+"""
+Reports what the app imports at startup and what the proctoring stack adds.
+
+Runs `python -X importtime` in fresh interpreters, once importing only the
+app and once importing the app plus the proctored exam page, and prints
+the total import time of each, the slowest modules and whether OpenCV,
+NumPy or mediapipe were loaded. Teachers and admins should only ever pay
+for the first line:
+
+    python startup_importtime.py
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from proctoring_loader import PROCTORING_MODULE
+
+APP_MODULE = "main"
+
+# Modules that belong to the proctoring stack and shouldn't load at startup
+HEAVY_MODULES = ("cv2", "numpy", "mediapipe")
+
+
+def parse_importtime(stderr):
+    """
+    Parses the output of python -X importtime
+
+    Returns:
+        tuple: (total microseconds, dict of top-level package name ->
+        cumulative microseconds of the outermost import of that package)
+    """
+    total = 0
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header line
+        cumulative = int(fields[1])
+        name = fields[2].strip()
+        if not fields[2][1:].startswith(" "):
+            total += cumulative  # Not nested in another import
+        package = name.split(".")[0]
+        # Children are listed before their parents, so the last entry is the outermost
+        if name == package or package not in times:
+            times[package] = cumulative
+    return total, times
+
+
+def measure_imports(modules, env=None):
+    """
+    Imports modules in a fresh interpreter with -X importtime
+
+    Returns:
+        tuple: Output of parse_importtime()
+    """
+    env = dict(os.environ if env is None else env)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    code = "import " + ", ".join(modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, env=env,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def format_report(label, measurement, top=8):
+    """Formats one measurement: total, heavy modules and the slowest imports"""
+    total, times = measurement
+    lines = [f"{label}: {total / 1e6:.3f}s"]
+    for name in HEAVY_MODULES:
+        loaded = f"loaded ({times[name] / 1e3:.0f} ms)" if name in times else "not loaded"
+        lines.append(f"    {name:<10} {loaded}")
+    for name, micros in sorted(times.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"    {micros / 1e3:8.1f} ms  {name}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report startup import time")
+    parser.add_argument('--top', type=int, default=8, help="Slowest modules to list")
+    args = parser.parse_args(argv)
+
+    startup = measure_imports([APP_MODULE])
+    proctored = measure_imports([APP_MODULE, PROCTORING_MODULE])
+    print(format_report("Startup", startup, args.top))
+    print(format_report("Startup + proctoring", proctored, args.top))
+    print(f"Deferred to the first proctored exam: "
+          f"{(proctored[0] - startup[0]) / 1e6:.3f}s")
+    return 1 if any(name in startup[1] for name in HEAVY_MODULES) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,93 @@
 from PyQt6 import QtCore, QtWidgets
 from styles import COMMON_STYLES
-from supabase_connection import create_connection
+from supabase_connection import create_connection, is_missing_column_error
 from exam_taking import ExamTaking
 from exam_disclaimer import ExamDisclaimerPage
+from data_loader import clear_layout, show_loading
 import datetime
+import functools
 import logging
 
+
+def bucket_exams(exams, attempted_ids, current_time):
+    """
+    Splits today's exams into available now, upcoming and expired
+
+    Args:
+        exams (list): Exam rows with id, name, duration, start_time and end_time
+        attempted_ids (set): IDs of exams the student already attempted; skipped
+        current_time (datetime.time): Time to compare the schedule against
+
+    Returns:
+        tuple: (available_now, upcoming, expired) lists of
+        (exam_id, name, duration, start_time, end_time)
+    """
+    available_now = []
+    upcoming = []
+    expired = []
+
+    for exam in exams:
+        if exam['id'] in attempted_ids:
+            continue
+
+        start_time = datetime.datetime.strptime(exam['start_time'], '%H:%M:%S').time()
+        end_time = datetime.datetime.strptime(exam['end_time'], '%H:%M:%S').time()
+        entry = (exam['id'], exam['name'], exam['duration'], start_time, end_time)
+
+        if start_time <= current_time <= end_time:
+            available_now.append(entry)
+        elif start_time > current_time:
+            upcoming.append(entry)
+        else:  # end_time < current_time
+            expired.append(entry)
+
+    return available_now, upcoming, expired
+
+def fetch_exam_summaries(supabase, exam_ids):
+    """
+    Fetches name, date and question count for several exams at once
+
+    Uses the question_count column from migrations/003_exam_question_count.sql;
+    if that has not been applied yet, each exam's questions are counted by
+    the database instead, one count query per exam.
+
+    Args:
+        supabase: Supabase client
+        exam_ids (list): Exams to fetch
+
+    Returns:
+        dict: exam_id -> row with name, exam_date and question_count
+    """
+    if not exam_ids:
+        return {}
+
+    try:
+        response = supabase.table('exams') \
+            .select('id, name, exam_date, question_count') \
+            .in_('id', exam_ids) \
+            .execute()
+        return {exam['id']: exam for exam in response.data}
+    except Exception as e:
+        if not is_missing_column_error(e):
+            raise
+        logging.warning("exams.question_count is missing, counting questions instead")
+
+    exams_response = supabase.table('exams') \
+        .select('id, name, exam_date') \
+        .in_('id', exam_ids) \
+        .execute()
+    exams = {}
+    for exam in exams_response.data:
+        # An exact count without fetching the rows; downloading the question
+        # rows to count them is cut short by the API's row limit
+        count_response = supabase.table('questions') \
+            .select('id', count='exact', head=True) \
+            .eq('exam_id', exam['id']) \
+            .execute()
+        exam['question_count'] = count_response.count or 0
+        exams[exam['id']] = exam
+    return exams
+
 class StudentDashboard(QtWidgets.QWidget):
     def __init__(self, main_window):
         super().__init__()
@@ -87,8 +169,13 @@ class StudentDashboard(QtWidgets.QWidget):
 
     def logout(self):
         self.main_window.stackedWidget.setCurrentWidget(self.main_window.login_page)
+        # Free this dashboard; the next user to log in gets a fresh one
+        self.main_window.evict_page(self)
 
     def show_exams(self):
+        self.main_window.navigation.show_subpage(self, 'exams', self.build_exams_page, self.load_exams)
+
+    def build_exams_page(self):
         # Create a new widget to display exams
         self.exams_widget = QtWidgets.QWidget()
         exams_layout = QtWidgets.QVBoxLayout(self.exams_widget)
@@ -126,164 +213,148 @@ class StudentDashboard(QtWidgets.QWidget):
         self.load_exams()
         
         exams_layout.addStretch()
-        self.main_window.stackedWidget.addWidget(self.exams_widget)
-        self.main_window.stackedWidget.setCurrentWidget(self.exams_widget)
+        return self.exams_widget
     
     def reload_exams(self):
-        # Clear the current exams
-        self.clear_exams_container()
-        
-        # Show loading indicator
-        loading_label = QtWidgets.QLabel("Loading exams...")
-        loading_label.setStyleSheet("font-size: 14px; color: #666; margin: 10px;")
-        loading_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self.exams_container_layout.addWidget(loading_label)
-        
-        # Use a short timer to allow the UI to update before loading exams
-        QtCore.QTimer.singleShot(100, self.load_exams)
+        # The load shows its own placeholder and doesn't block the UI
+        self.load_exams()
     
     def clear_exams_container(self):
         # Clear all widgets from the exams container
-        while self.exams_container_layout.count():
-            item = self.exams_container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        clear_layout(self.exams_container_layout)
+    
+    def show_load_error(self, layout, error):
+        # Drop the loading placeholder and report the failure
+        clear_layout(layout)
+        msg = QtWidgets.QMessageBox()
+        msg.setStyleSheet(COMMON_STYLES['message_box'])
+        msg.setWindowTitle("Error")
+        msg.setText(str(error))
+        msg.setIcon(QtWidgets.QMessageBox.Icon.Critical)
+        msg.exec()
     
     def load_exams(self):
-        # Clear any existing content
+        # Show a placeholder while the exams are fetched in the background
+        show_loading(self.exams_container_layout, "Loading exams...")
+        self.main_window.data_loader.load(
+            self.exams_container,
+            functools.partial(self.fetch_exams, self.main_window.current_user),
+            self.render_exams,
+            lambda e: self.show_load_error(self.exams_container_layout, e)
+        )
+    
+    def fetch_exams(self, username):
+        """
+        Fetches today's exams the student has not attempted yet.
+        Runs on a worker thread, so it must not touch any widgets.
+        
+        Returns:
+            dict: 'scheduled' (bool, any active exams today), 'buckets'
+            (available now, upcoming, expired lists) and 'refreshed_at'
+        """
+        # Get current date and time once so every exam is bucketed against the same instant
+        now = datetime.datetime.now()
+        current_date = now.date().isoformat()  # Convert to ISO format for Supabase
+        
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+        
+        # Query for exams that are:
+        # 1. Active
+        # 2. Scheduled for today
+        # 3. Not attempted by the current student
+        
+        # First get all exams for today
+        exams_response = supabase.table('exams') \
+            .select('id, name, duration, start_time, end_time') \
+            .eq('status', 'active') \
+            .eq('exam_date', current_date) \
+            .execute()
+        
+        if not exams_response.data:
+            return {'scheduled': False, 'buckets': ([], [], []), 'refreshed_at': now}
+        
+        # Then find which of them the student already attempted, in one query
+        exam_ids = [exam['id'] for exam in exams_response.data]
+        attempted_response = supabase.table('exam_results') \
+            .select('exam_id') \
+            .in_('exam_id', exam_ids) \
+            .eq('student_username', username) \
+            .execute()
+        attempted_ids = {result['exam_id'] for result in attempted_response.data}
+        
+        # Group unattempted exams by availability in a single pass
+        buckets = bucket_exams(exams_response.data, attempted_ids, now.time())
+        return {'scheduled': True, 'buckets': buckets, 'refreshed_at': now}
+    
+    def render_exams(self, result):
         self.clear_exams_container()
         
-        # Get current date and time
-        current_date = datetime.date.today().isoformat()  # Convert to ISO format for Supabase
-        current_time = datetime.datetime.now().time().strftime('%H:%M:%S')  # Format time for comparison
-        
-        # Fetch exams from the database that are active and scheduled for today
-        try:
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-            
-            # Query for exams that are:
-            # 1. Active
-            # 2. Scheduled for today
-            # 3. Not attempted by the current student
+        if not result['scheduled']:
+            no_exams_label = QtWidgets.QLabel("No exams scheduled for today.")
+            no_exams_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_exams_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.exams_container_layout.addWidget(no_exams_label)
+            return
+        
+        available_now, upcoming, expired = result['buckets']
+        if not (available_now or upcoming or expired):
+            no_exams_label = QtWidgets.QLabel("No exams available for you today.")
+            no_exams_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_exams_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.exams_container_layout.addWidget(no_exams_label)
+            return
+        
+        # Section headers
+        available_now_label = QtWidgets.QLabel("Available Now")
+        available_now_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #6C63FF; margin-top: 10px;")
+        
+        upcoming_label = QtWidgets.QLabel("Upcoming Today")
+        upcoming_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #6C63FF; margin-top: 20px;")
+        
+        expired_label = QtWidgets.QLabel("Expired")
+        expired_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #6C63FF; margin-top: 20px;")
+        
+        # Create scrollable area
+        scroll_area = QtWidgets.QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_content = QtWidgets.QWidget()
+        scroll_layout = QtWidgets.QVBoxLayout(scroll_content)
+        scroll_layout.setSpacing(10)
+        
+        # Display available now exams
+        if available_now:
+            scroll_layout.addWidget(available_now_label)
             
-            # First get all exams for today
-            exams_response = supabase.table('exams') \
-                .select('id, name, duration, start_time, end_time') \
-                .eq('status', 'active') \
-                .eq('exam_date', current_date) \
-                .execute()
-                
-            if not exams_response.data:
-                no_exams_label = QtWidgets.QLabel("No exams scheduled for today.")
-                no_exams_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_exams_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.exams_container_layout.addWidget(no_exams_label)
-                return
-                
-            # Now check which ones the student hasn't taken yet
-            available_exams = []
-            for exam in exams_response.data:
-                # Check if student already attempted this exam
-                result_response = supabase.table('exam_results') \
-                    .select('id') \
-                    .eq('exam_id', exam['id']) \
-                    .eq('student_username', self.main_window.current_user) \
-                    .execute()
-                    
-                if not result_response.data:  # No results found, exam is available
-                    available_exams.append(exam)
-            
-            if not available_exams:
-                no_exams_label = QtWidgets.QLabel("No exams available for you today.")
-                no_exams_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_exams_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.exams_container_layout.addWidget(no_exams_label)
-                return
-                
-            # Section headers
-            available_now_label = QtWidgets.QLabel("Available Now")
-            available_now_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #6C63FF; margin-top: 10px;")
-            
-            upcoming_label = QtWidgets.QLabel("Upcoming Today")
-            upcoming_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #6C63FF; margin-top: 20px;")
-            
-            expired_label = QtWidgets.QLabel("Expired")
-            expired_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #6C63FF; margin-top: 20px;")
-            
-            # Group exams by availability
-            available_now = []
-            upcoming = []
-            expired = []
-            
-            for exam in available_exams:
-                # Convert times for comparison
-                start_time_str = exam['start_time']
-                end_time_str = exam['end_time']
-                
-                # Parse time strings
-                start_time = datetime.datetime.strptime(start_time_str, '%H:%M:%S').time()
-                end_time = datetime.datetime.strptime(end_time_str, '%H:%M:%S').time()
-                
-                # Get current time
-                current_time_obj = datetime.datetime.now().time()
-                
-                # Check if exam is currently available
-                if start_time <= current_time_obj and end_time >= current_time_obj:
-                    available_now.append((exam['id'], exam['name'], exam['duration'], start_time, end_time))
-                elif start_time > current_time_obj:
-                    upcoming.append((exam['id'], exam['name'], exam['duration'], start_time, end_time))
-                else:  # end_time < current_time
-                    expired.append((exam['id'], exam['name'], exam['duration'], start_time, end_time))
-            
-            # Create scrollable area
-            scroll_area = QtWidgets.QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_content = QtWidgets.QWidget()
-            scroll_layout = QtWidgets.QVBoxLayout(scroll_content)
-            scroll_layout.setSpacing(10)
-            
-            # Display available now exams
-            if available_now:
-                scroll_layout.addWidget(available_now_label)
-                
-                for exam_id, name, duration, start_time, end_time in available_now:
-                    exam_card = self.create_exam_card(exam_id, name, duration, start_time, end_time, True)
-                    scroll_layout.addWidget(exam_card)
-            
-            # Display upcoming exams
-            if upcoming:
-                scroll_layout.addWidget(upcoming_label)
-                
-                for exam_id, name, duration, start_time, end_time in upcoming:
-                    exam_card = self.create_exam_card(exam_id, name, duration, start_time, end_time, False)
-                    scroll_layout.addWidget(exam_card)
+            for exam_id, name, duration, start_time, end_time in available_now:
+                exam_card = self.create_exam_card(exam_id, name, duration, start_time, end_time, True)
+                scroll_layout.addWidget(exam_card)
+        
+        # Display upcoming exams
+        if upcoming:
+            scroll_layout.addWidget(upcoming_label)
             
-            # Display expired exams
-            if expired:
-                scroll_layout.addWidget(expired_label)
-                
-                for exam_id, name, duration, start_time, end_time in expired:
-                    exam_card = self.create_exam_card(exam_id, name, duration, start_time, end_time, False, True)
-                    scroll_layout.addWidget(exam_card)
+            for exam_id, name, duration, start_time, end_time in upcoming:
+                exam_card = self.create_exam_card(exam_id, name, duration, start_time, end_time, False)
+                scroll_layout.addWidget(exam_card)
+        
+        # Display expired exams
+        if expired:
+            scroll_layout.addWidget(expired_label)
             
-            scroll_area.setWidget(scroll_content)
-            self.exams_container_layout.addWidget(scroll_area)
-            
-            # Add a refresh note
-            refresh_note = QtWidgets.QLabel("Last refreshed: " + datetime.datetime.now().strftime("%H:%M:%S"))
-            refresh_note.setStyleSheet("color: #999; font-size: 12px; font-style: italic;")
-            refresh_note.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-            self.exams_container_layout.addWidget(refresh_note)
-    
-        except Exception as e:
-            msg = QtWidgets.QMessageBox()
-            msg.setStyleSheet(COMMON_STYLES['message_box'])
-            msg.setWindowTitle("Error")
-            msg.setText(str(e))
-            msg.setIcon(QtWidgets.QMessageBox.Icon.Critical)
-            msg.exec()
+            for exam_id, name, duration, start_time, end_time in expired:
+                exam_card = self.create_exam_card(exam_id, name, duration, start_time, end_time, False, True)
+                scroll_layout.addWidget(exam_card)
+        
+        scroll_area.setWidget(scroll_content)
+        self.exams_container_layout.addWidget(scroll_area)
+        
+        # Add a refresh note
+        refresh_note = QtWidgets.QLabel("Last refreshed: " + result['refreshed_at'].strftime("%H:%M:%S"))
+        refresh_note.setStyleSheet("color: #999; font-size: 12px; font-style: italic;")
+        refresh_note.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        self.exams_container_layout.addWidget(refresh_note)
             
     def create_exam_card(self, exam_id, name, duration, start_time, end_time, is_available, is_expired=False):
         exam_card = QtWidgets.QWidget()
@@ -423,10 +494,12 @@ class StudentDashboard(QtWidgets.QWidget):
     def take_exam(self, exam_id):
         # Navigate to the disclaimer page first instead of directly to exam taking
         disclaimer_page = ExamDisclaimerPage(self.main_window, exam_id)
-        self.main_window.stackedWidget.addWidget(disclaimer_page)
-        self.main_window.stackedWidget.setCurrentWidget(disclaimer_page)
+        self.main_window.navigation.show_transient(disclaimer_page)
 
     def show_results(self):
+        self.main_window.navigation.show_subpage(self, 'results', self.build_results_page, self.load_results)
+
+    def build_results_page(self):
         # Create a new widget to display results
         self.results_widget = QtWidgets.QWidget()
         results_layout = QtWidgets.QVBoxLayout(self.results_widget)
@@ -454,118 +527,117 @@ class StudentDashboard(QtWidgets.QWidget):
         self.load_results()
 
         results_layout.addStretch()
-        self.main_window.stackedWidget.addWidget(self.results_widget)
-        self.main_window.stackedWidget.setCurrentWidget(self.results_widget)
+        return self.results_widget
 
     def load_results(self):
-        # Clear any existing content
-        while self.results_container_layout.count():
-            item = self.results_container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        try:
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-
-            # Fetch exam results for the current student
-            results_response = supabase.table('exam_results') \
-                .select('exam_id, score, completed_at') \
-                .eq('student_username', self.main_window.current_user) \
-                .execute()
-
-            if not results_response.data:
-                no_results_label = QtWidgets.QLabel("No results available.")
-                no_results_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_results_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.results_container_layout.addWidget(no_results_label)
-                return
-
-            # Create section headers
-            completed_label = QtWidgets.QLabel("Completed Exams")
-            completed_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #6C63FF; margin-top: 10px;")
+        # Show a placeholder while the results are fetched in the background
+        show_loading(self.results_container_layout, "Loading results...")
+        self.main_window.data_loader.load(
+            self.results_container,
+            functools.partial(self.fetch_results, self.main_window.current_user),
+            self.render_results,
+            lambda e: self.show_load_error(self.results_container_layout, e)
+        )
+
+    def fetch_results(self, username):
+        """
+        Fetches the student's results with each exam's name, date and question count.
+        Runs on a worker thread, so it must not touch any widgets.
+
+        Returns:
+            tuple: (result rows, exam_id -> exam summary)
+        """
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+
+        # Fetch exam results for the current student
+        results_response = supabase.table('exam_results') \
+            .select('exam_id, score, completed_at') \
+            .eq('student_username', username) \
+            .execute()
+
+        if not results_response.data:
+            return [], {}
+
+        # Fetch names, dates and question counts for every exam in one go
+        exams = fetch_exam_summaries(supabase, list({result['exam_id'] for result in results_response.data}))
+        return results_response.data, exams
+
+    def render_results(self, fetched):
+        clear_layout(self.results_container_layout)
+        results, exams = fetched
+
+        if not results:
+            no_results_label = QtWidgets.QLabel("No results available.")
+            no_results_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_results_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.results_container_layout.addWidget(no_results_label)
+            return
+
+        # Create section headers
+        completed_label = QtWidgets.QLabel("Completed Exams")
+        completed_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #6C63FF; margin-top: 10px;")
+        
+        in_progress_label = QtWidgets.QLabel("In-Progress Exams")
+        in_progress_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #FF9800; margin-top: 20px;")
+        
+        # Group results by status
+        completed_exams = []
+        in_progress_exams = []
+        
+        for result in results:
+            exam_id = result['exam_id']
+            score = result['score']
+            completed_at = result['completed_at']
             
-            in_progress_label = QtWidgets.QLabel("In-Progress Exams")
-            in_progress_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #FF9800; margin-top: 20px;")
-            
-            # Group results by status
-            completed_exams = []
-            in_progress_exams = []
-            
-            for result in results_response.data:
-                exam_id = result['exam_id']
-                score = result['score']
-                completed_at = result['completed_at']
-                
-                # Fetch exam date and name from exams table
-                exam_data = supabase.table('exams') \
-                    .select('exam_date, name') \
-                    .eq('id', exam_id) \
-                    .single() \
-                    .execute()
-                
-                exam_date = exam_data.data['exam_date'] if exam_data.data and 'exam_date' in exam_data.data else "Unknown"
-                exam_name = exam_data.data['name'] if exam_data.data and 'name' in exam_data.data else f"Exam #{exam_id}"
-
-                # Count total number of questions for the exam
-                questions_data = supabase.table('questions') \
-                    .select('id') \
-                    .eq('exam_id', exam_id) \
-                    .execute()
-                total_marks = len(questions_data.data) if questions_data.data else 0
-                
-                # Log information for debugging
-                logging.debug(f"Exam result: id={exam_id}, name={exam_name}, score={score}/{total_marks}, completed={completed_at}")
-                
-                # Look at completed_at timestamp to determine if exam is completed
-                if completed_at:
-                    # For a more accurate check, we could add additional logic here
-                    # such as comparing with end time of the exam
-                    completed_exams.append((exam_id, exam_name, score, total_marks, exam_date, completed_at))
-                else:
-                    in_progress_exams.append((exam_id, exam_name, score, total_marks, exam_date))
-        
-            # Add container for scrollable content
-            scroll_area = QtWidgets.QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_content = QtWidgets.QWidget()
-            scroll_layout = QtWidgets.QVBoxLayout(scroll_content)
-            scroll_layout.setSpacing(10)
+            exam = exams.get(exam_id, {})
+            exam_date = exam.get('exam_date') or "Unknown"
+            exam_name = exam.get('name') or f"Exam #{exam_id}"
+            total_marks = exam.get('question_count') or 0
             
-            # Display completed exams
-            if completed_exams:
-                scroll_layout.addWidget(completed_label)
-                
-                for exam_id, exam_name, score, total_marks, exam_date, completed_at in completed_exams:
-                    result_card = self.create_result_card(exam_id, exam_name, score, total_marks, exam_date, True, completed_at)
-                    scroll_layout.addWidget(result_card)
+            # Log information for debugging
+            logging.debug(f"Exam result: id={exam_id}, name={exam_name}, score={score}/{total_marks}, completed={completed_at}")
             
-            # Display in-progress exams
-            if in_progress_exams:
-                scroll_layout.addWidget(in_progress_label)
-                
-                for exam_id, exam_name, score, total_marks, exam_date in in_progress_exams:
-                    result_card = self.create_result_card(exam_id, exam_name, score, total_marks, exam_date, False)
-                    scroll_layout.addWidget(result_card)
+            # Look at completed_at timestamp to determine if exam is completed
+            if completed_at:
+                # For a more accurate check, we could add additional logic here
+                # such as comparing with end time of the exam
+                completed_exams.append((exam_id, exam_name, score, total_marks, exam_date, completed_at))
+            else:
+                in_progress_exams.append((exam_id, exam_name, score, total_marks, exam_date))
+    
+        # Add container for scrollable content
+        scroll_area = QtWidgets.QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_content = QtWidgets.QWidget()
+        scroll_layout = QtWidgets.QVBoxLayout(scroll_content)
+        scroll_layout.setSpacing(10)
+        
+        # Display completed exams
+        if completed_exams:
+            scroll_layout.addWidget(completed_label)
             
-            if not (completed_exams or in_progress_exams):
-                no_results_label = QtWidgets.QLabel("No results available.")
-                no_results_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_results_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                scroll_layout.addWidget(no_results_label)
+            for exam_id, exam_name, score, total_marks, exam_date, completed_at in completed_exams:
+                result_card = self.create_result_card(exam_id, exam_name, score, total_marks, exam_date, True, completed_at)
+                scroll_layout.addWidget(result_card)
+        
+        # Display in-progress exams
+        if in_progress_exams:
+            scroll_layout.addWidget(in_progress_label)
             
-            scroll_area.setWidget(scroll_content)
-            self.results_container_layout.addWidget(scroll_area)
-
-        except Exception as e:
-            logging.error(f"Error loading results: {e}")
-            msg = QtWidgets.QMessageBox()
-            msg.setStyleSheet(COMMON_STYLES['message_box'])
-            msg.setWindowTitle("Error")
-            msg.setText(str(e))
-            msg.setIcon(QtWidgets.QMessageBox.Icon.Critical)
-            msg.exec()
+            for exam_id, exam_name, score, total_marks, exam_date in in_progress_exams:
+                result_card = self.create_result_card(exam_id, exam_name, score, total_marks, exam_date, False)
+                scroll_layout.addWidget(result_card)
+        
+        if not (completed_exams or in_progress_exams):
+            no_results_label = QtWidgets.QLabel("No results available.")
+            no_results_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_results_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            scroll_layout.addWidget(no_results_label)
+        
+        scroll_area.setWidget(scroll_content)
+        self.results_container_layout.addWidget(scroll_area)
 
     def create_result_card(self, exam_id, exam_name, score, total_marks, exam_date, is_completed, completed_at=None):
         result_card = QtWidgets.QWidget()
@@ -639,6 +711,9 @@ class StudentDashboard(QtWidgets.QWidget):
         return result_card
 
     def show_profile(self):
+        self.main_window.navigation.show_subpage(self, 'profile', self.build_profile_page, self.load_profile)
+
+    def build_profile_page(self):
         # Create a new widget to display profile information
         self.profile_widget = QtWidgets.QWidget()
         profile_layout = QtWidgets.QVBoxLayout(self.profile_widget)
@@ -666,55 +741,55 @@ class StudentDashboard(QtWidgets.QWidget):
         self.load_profile()
 
         profile_layout.addStretch()
-        self.main_window.stackedWidget.addWidget(self.profile_widget)
-        self.main_window.stackedWidget.setCurrentWidget(self.profile_widget)
+        return self.profile_widget
 
     def load_profile(self):
-        # Clear any existing content
-        while self.profile_container_layout.count():
-            item = self.profile_container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        try:
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-
-            # Fetch profile information for the current user
-            profile_response = supabase.table('users') \
-                .select('username, user_type') \
-                .eq('username', self.main_window.current_user) \
-                .single() \
-                .execute()
-
-            if not profile_response.data:
-                no_profile_label = QtWidgets.QLabel("Profile information not available.")
-                no_profile_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_profile_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.profile_container_layout.addWidget(no_profile_label)
-                return
-
-            profile_data = profile_response.data
-
-            username_label = QtWidgets.QLabel(f"Username: {profile_data['username']}")
-            username_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #333;")
-
-            user_type_label = QtWidgets.QLabel(f"User Type: {profile_data['user_type']}")
-            user_type_label.setStyleSheet("font-size: 14px; color: #666;")
-
-            self.profile_container_layout.addWidget(username_label)
-            self.profile_container_layout.addWidget(user_type_label)
-
-        except Exception as e:
-            msg = QtWidgets.QMessageBox()
-            msg.setStyleSheet(COMMON_STYLES['message_box'])
-            msg.setWindowTitle("Error")
-            msg.setText(str(e))
-            msg.setIcon(QtWidgets.QMessageBox.Icon.Critical)
-            msg.exec()
+        # Show a placeholder while the profile is fetched in the background
+        show_loading(self.profile_container_layout, "Loading profile...")
+        self.main_window.data_loader.load(
+            self.profile_container,
+            functools.partial(self.fetch_profile, self.main_window.current_user),
+            self.render_profile,
+            lambda e: self.show_load_error(self.profile_container_layout, e)
+        )
+
+    def fetch_profile(self, username):
+        """Fetches the user's profile row. Runs on a worker thread."""
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+
+        # Fetch profile information for the current user
+        profile_response = supabase.table('users') \
+            .select('username, user_type') \
+            .eq('username', username) \
+            .single() \
+            .execute()
+        return profile_response.data
+
+    def render_profile(self, profile_data):
+        clear_layout(self.profile_container_layout)
+
+        if not profile_data:
+            no_profile_label = QtWidgets.QLabel("Profile information not available.")
+            no_profile_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_profile_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.profile_container_layout.addWidget(no_profile_label)
+            return
+
+        username_label = QtWidgets.QLabel(f"Username: {profile_data['username']}")
+        username_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #333;")
+
+        user_type_label = QtWidgets.QLabel(f"User Type: {profile_data['user_type']}")
+        user_type_label.setStyleSheet("font-size: 14px; color: #666;")
+
+        self.profile_container_layout.addWidget(username_label)
+        self.profile_container_layout.addWidget(user_type_label)
 
     def show_resources(self):
+        self.main_window.navigation.show_subpage(self, 'resources', self.build_resources_page, self.load_resources)
+
+    def build_resources_page(self):
         # Create a new widget to display resources
         self.resources_widget = QtWidgets.QWidget()
         resources_layout = QtWidgets.QVBoxLayout(self.resources_widget)
@@ -742,68 +817,66 @@ class StudentDashboard(QtWidgets.QWidget):
         self.load_resources()
 
         resources_layout.addStretch()
-        self.main_window.stackedWidget.addWidget(self.resources_widget)
-        self.main_window.stackedWidget.setCurrentWidget(self.resources_widget)
+        return self.resources_widget
 
     def load_resources(self):
-        # Clear any existing content
-        while self.resources_container_layout.count():
-            item = self.resources_container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        # Show a placeholder while the resources are fetched in the background
+        show_loading(self.resources_container_layout, "Loading resources...")
+        self.main_window.data_loader.load(
+            self.resources_container,
+            self.fetch_resources,
+            self.render_resources,
+            lambda e: self.show_load_error(self.resources_container_layout, e)
+        )
+
+    def fetch_resources(self):
+        """Fetches the study resources. Runs on a worker thread."""
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+
+        # Fetch resources from the database
+        resources_response = supabase.table('resources') \
+            .select('title, description, link') \
+            .execute()
+        return resources_response.data
+
+    def render_resources(self, resources):
+        clear_layout(self.resources_container_layout)
+
+        if not resources:
+            no_resources_label = QtWidgets.QLabel("No resources available.")
+            no_resources_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_resources_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.resources_container_layout.addWidget(no_resources_label)
+            return
+
+        # Display each resource
+        for resource in resources:
+            resource_card = QtWidgets.QWidget()
+            resource_card.setStyleSheet('''
+                QWidget {
+                    background: white;
+                    border-radius: 10px;
+                    padding: 15px;
+                    margin: 5px;
+                    border: 1px solid #E0E0E0;
+                }
+            ''')
+            card_layout = QtWidgets.QVBoxLayout(resource_card)
 
-        try:
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-
-            # Fetch resources from the database
-            resources_response = supabase.table('resources') \
-                .select('title, description, link') \
-                .execute()
-
-            if not resources_response.data:
-                no_resources_label = QtWidgets.QLabel("No resources available.")
-                no_resources_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_resources_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.resources_container_layout.addWidget(no_resources_label)
-                return
-
-            # Display each resource
-            for resource in resources_response.data:
-                resource_card = QtWidgets.QWidget()
-                resource_card.setStyleSheet('''
-                    QWidget {
-                        background: white;
-                        border-radius: 10px;
-                        padding: 15px;
-                        margin: 5px;
-                        border: 1px solid #E0E0E0;
-                    }
-                ''')
-                card_layout = QtWidgets.QVBoxLayout(resource_card)
-
-                title_label = QtWidgets.QLabel(resource['title'])
-                title_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #333;")
-
-                description_label = QtWidgets.QLabel(resource['description'])
-                description_label.setStyleSheet("font-size: 13px; color: #666;")
-
-                link_btn = QtWidgets.QPushButton('Open Resource')
-                link_btn.setStyleSheet(COMMON_STYLES['primary_button'])
-                link_btn.clicked.connect(lambda _, url=resource['link']: QtCore.QDesktopServices.openUrl(QtCore.QUrl(url)))
-
-                card_layout.addWidget(title_label)
-                card_layout.addWidget(description_label)
-                card_layout.addWidget(link_btn)
-
-                self.resources_container_layout.addWidget(resource_card)
-
-        except Exception as e:
-            msg = QtWidgets.QMessageBox()
-            msg.setStyleSheet(COMMON_STYLES['message_box'])
-            msg.setWindowTitle("Error")
-            msg.setText(str(e))
-            msg.setIcon(QtWidgets.QMessageBox.Icon.Critical)
-            msg.exec()
+            title_label = QtWidgets.QLabel(resource['title'])
+            title_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #333;")
+
+            description_label = QtWidgets.QLabel(resource['description'])
+            description_label.setStyleSheet("font-size: 13px; color: #666;")
+
+            link_btn = QtWidgets.QPushButton('Open Resource')
+            link_btn.setStyleSheet(COMMON_STYLES['primary_button'])
+            link_btn.clicked.connect(lambda _, url=resource['link']: QtCore.QDesktopServices.openUrl(QtCore.QUrl(url)))
+
+            card_layout.addWidget(title_label)
+            card_layout.addWidget(description_label)
+            card_layout.addWidget(link_btn)
 
+            self.resources_container_layout.addWidget(resource_card)
@@ -1,33 +1,274 @@
 import os
+import time
+import logging
+import threading
 from dotenv import load_dotenv
 from supabase import create_client
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Seconds a pooled client may sit idle before it is health checked on next use
+HEALTH_CHECK_INTERVAL = 60
+
+# HTTP connection pool limits shared by every request made through the client
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 30
+
+# Process-wide client registry, keyed by (url, key)
+_clients = {}
+_clients_lock = threading.Lock()
+_connection_stats = {
+    'opened': 0,
+    'reused': 0,
+    'health_checks': 0,
+    'reconnects': 0,
+}
+
+
+class _PooledClient:
+    """A Supabase client together with the bookkeeping the registry needs."""
+
+    def __init__(self, client, http_client):
+        self.client = client
+        self.http_client = http_client
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self.http_client is not None:
+            try:
+                self.http_client.close()
+            except Exception as e:
+                logging.debug(f"Error closing pooled HTTP client: {e}")
+
+
+def _get_credentials():
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_KEY")
+
+    if not supabase_url or not supabase_key:
+        print("Error: Supabase URL or key not found in environment variables")
+        print("Make sure you have a .env file with SUPABASE_URL and SUPABASE_KEY")
+        return None, None
+
+    return supabase_url, supabase_key
+
+
+def _open_client(supabase_url, supabase_key):
+    """
+    Builds a Supabase client backed by a keep-alive HTTP connection pool.
+    Falls back to a default client on supabase versions without httpx_client.
+    """
+    http_client = None
+    try:
+        import httpx
+        from supabase import ClientOptions
+
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(30.0),
+        )
+        client = create_client(supabase_url, supabase_key, ClientOptions(httpx_client=http_client))
+    except (ImportError, TypeError) as e:
+        logging.debug(f"Pooled HTTP client not supported, using default client: {e}")
+        if http_client is not None:
+            http_client.close()
+            http_client = None
+        client = create_client(supabase_url, supabase_key)
+
+    _connection_stats['opened'] += 1
+    return _PooledClient(client, http_client)
+
+
+def _is_healthy(client):
+    try:
+        client.table('users').select('username').limit(1).execute()
+        return True
+    except Exception as e:
+        logging.warning(f"Supabase health check failed: {e}")
+        return False
+
+
 def create_connection():
     """
-    Creates and returns a connection to Supabase.
+    Returns the shared Supabase client for this process.
+    The first call opens the client; later calls reuse it and its pooled
+    HTTP connections. A client that has been idle for longer than
+    HEALTH_CHECK_INTERVAL is health checked and transparently reopened
+    if the check fails. Safe to call from any thread.
     Returns None if connection fails.
     """
     try:
         # Get Supabase credentials from environment variables
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_KEY")
-        
-        if not supabase_url or not supabase_key:
-            print("Error: Supabase URL or key not found in environment variables")
-            print("Make sure you have a .env file with SUPABASE_URL and SUPABASE_KEY")
+        supabase_url, supabase_key = _get_credentials()
+        if not supabase_url:
             return None
             
-        # Create Supabase client
-        supabase = create_client(supabase_url, supabase_key)
-        return supabase
+        registry_key = (supabase_url, supabase_key)
+        with _clients_lock:
+            pooled = _clients.get(registry_key)
+            now = time.monotonic()
+
+            if pooled is None:
+                pooled = _open_client(supabase_url, supabase_key)
+                _clients[registry_key] = pooled
+                pooled.last_used = now
+                return pooled.client
+
+            needs_check = now - pooled.last_used > HEALTH_CHECK_INTERVAL
+            # Mark the client used now, so other threads don't check it too
+            pooled.last_used = now
+            if needs_check:
+                _connection_stats['health_checks'] += 1
+            else:
+                _connection_stats['reused'] += 1
+                return pooled.client
+
+        # The health check is a network request; don't hold the lock for it,
+        # or every other caller waits out the request timeout
+        healthy = _is_healthy(pooled.client)
+
+        with _clients_lock:
+            current = _clients.get(registry_key)
+            if current is pooled and not healthy:
+                pooled.close()
+                _connection_stats['reconnects'] += 1
+                current = _open_client(supabase_url, supabase_key)
+                _clients[registry_key] = current
+            elif current is None:
+                # reset_connection() ran during the check
+                current = _open_client(supabase_url, supabase_key)
+                _clients[registry_key] = current
+            else:
+                _connection_stats['reused'] += 1
+
+            current.last_used = time.monotonic()
+            return current.client
     
     except Exception as e:
         print(f"Error connecting to Supabase: {e}")
         return None
 
+
+def reset_connection():
+    """
+    Drops every pooled client so the next create_connection() reconnects.
+    Use this after a request fails in a way that suggests a broken session.
+    """
+    with _clients_lock:
+        for pooled in _clients.values():
+            pooled.close()
+        if _clients:
+            _connection_stats['reconnects'] += 1
+        _clients.clear()
+
+
+def get_connection_stats():
+    """
+    Returns a snapshot of the connection registry counters.
+
+    Returns:
+        dict: opened, reused, health_checks and reconnects counts plus
+        the number of clients currently pooled
+    """
+    with _clients_lock:
+        stats = dict(_connection_stats)
+        stats['pooled_clients'] = len(_clients)
+    return stats
+
+
+def is_missing_rpc_error(error):
+    """
+    Checks whether an error means a database function has not been deployed.
+    Callers use this to fall back to plain table queries until
+    the migrations in migrations/ have been applied.
+    """
+    # PostgREST reports an unknown function as PGRST202
+    return getattr(error, 'code', None) == 'PGRST202' or 'PGRST202' in str(error)
+
+
+def is_missing_column_error(error):
+    """
+    Checks whether an error means a queried column does not exist yet,
+    e.g. because a migration adding it has not been applied.
+    """
+    # Postgres reports an unknown column as 42703
+    return getattr(error, 'code', None) == '42703' or '42703' in str(error)
+
+
+def record_answers(exam_id, student_username, answers, completed=False):
+    """
+    Saves answers and updates the attempt's score in one round trip.
+    Calls the record_answers() database function from
+    migrations/002_record_answers_function.sql, which grades the answers,
+    upserts them into student_answers and recounts the score in
+    exam_results in a single transaction.
+
+    Args:
+        exam_id (int): Exam being taken
+        student_username (str): Student taking the exam
+        answers (dict): question_id -> selected option text
+        completed (bool): Also stamp completed_at (use on submission)
+
+    Returns:
+        int: The student's score after the answers were saved
+
+    Raises:
+        Exception: If there is no connection or the call fails; use
+        is_missing_rpc_error() to detect an undeployed function
+    """
+    supabase = create_connection()
+    if not supabase:
+        raise Exception("Failed to connect to Supabase")
+
+    response = supabase.rpc('record_answers', {
+        'p_exam_id': exam_id,
+        'p_student_username': student_username,
+        'p_answers': [
+            {'question_id': question_id, 'selected_answer': selected_option}
+            for question_id, selected_option in answers.items()
+        ],
+        'p_completed': completed
+    }).execute()
+    return response.data
+
+
+def create_exam_with_questions(exam, questions):
+    """
+    Creates an exam together with all of its questions in one round trip.
+    Calls the create_exam_with_questions() database function from
+    migrations/005_create_exam_with_questions.sql, which inserts both in a
+    single transaction.
+
+    Args:
+        exam (dict): exams columns: name, teacher_username, duration,
+            exam_date, start_time, end_time and optionally status
+        questions (list): Dicts with question_text, option1..option4 and
+            correct_answer, in order
+
+    Returns:
+        int: ID of the new exam
+
+    Raises:
+        Exception: If there is no connection or the call fails; use
+        is_missing_rpc_error() to detect an undeployed function
+    """
+    supabase = create_connection()
+    if not supabase:
+        raise Exception("Failed to connect to Supabase")
+
+    response = supabase.rpc('create_exam_with_questions', {
+        'p_exam': exam,
+        'p_questions': questions
+    }).execute()
+    return response.data
+
+
 def test_connection():
     """
     Tests the Supabase connection by performing a simple query.
@@ -40,6 +281,7 @@ def test_connection():
             response = supabase.table('users').select('username').limit(1).execute()
             print("Connection successful!")
             print(f"Found data: {response.data}")
+            print(f"Connection stats: {get_connection_stats()}")
             return True
         except Exception as e:
             print(f"Connection test failed: {e}")
@@ -48,4 +290,4 @@ def test_connection():
 
 # For direct testing of this module
 if __name__ == "__main__":
-    test_connection() 
\ No newline at end of file
+    test_connection() 
@@ -1,7 +1,12 @@
 from PyQt6 import QtWidgets, QtCore
 from styles import COMMON_STYLES
 from exam_creation import ExamCreation
+from exam_draft import ExamDraft
 from supabase_connection import create_connection
+from data_loader import clear_layout, show_loading
+from question_bank import export_questions
+import functools
+
 class TeacherDashboard(QtWidgets.QWidget):
     def __init__(self, main_window):
         super().__init__()
@@ -12,9 +17,12 @@ class TeacherDashboard(QtWidgets.QWidget):
         if action == 'Create Exam':
             try:
                 if hasattr(self.main_window, 'current_user') and self.main_window.current_user:
-                    exam_page = ExamCreation(self.main_window, self.main_window.current_user)
-                    self.main_window.stackedWidget.addWidget(exam_page)
-                    self.main_window.stackedWidget.setCurrentWidget(exam_page)
+                    draft = ExamDraft.load(self.main_window.current_user)
+                    if draft is not None and not self.continue_draft(draft):
+                        draft.discard()
+                        draft = None
+                    exam_page = ExamCreation(self.main_window, self.main_window.current_user, draft)
+                    self.main_window.navigation.show_transient(exam_page)
                 else:
                     msg = QtWidgets.QMessageBox()
                     msg.setWindowTitle("Error")
@@ -28,6 +36,19 @@ class TeacherDashboard(QtWidgets.QWidget):
                 msg.setIcon(QtWidgets.QMessageBox.Icon.Critical)
                 msg.exec()
 
+    def continue_draft(self, draft):
+        """Asks whether to continue an unfinished exam; returns False to discard it"""
+        msg = QtWidgets.QMessageBox(self)
+        msg.setWindowTitle("Unfinished Exam")
+        msg.setText(f"You have an unfinished exam '{draft.exam['name']}' with "
+                    f"{draft.written_count()} of {draft.total_questions} questions written.")
+        msg.setInformativeText("Continue it? Choosing No deletes it.")
+        msg.setIcon(QtWidgets.QMessageBox.Icon.Question)
+        msg.setStandardButtons(QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No)
+        msg.setDefaultButton(QtWidgets.QMessageBox.StandardButton.Yes)
+        msg.setStyleSheet("color: black;")  # Ensure text is visible
+        return msg.exec() == QtWidgets.QMessageBox.StandardButton.Yes
+
     def initUI(self):
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.setContentsMargins(20, 20, 20, 20)
@@ -135,8 +156,13 @@ class TeacherDashboard(QtWidgets.QWidget):
         self.main_window.current_user = None
         self.main_window.current_user_type = None
         self.main_window.stackedWidget.setCurrentWidget(self.main_window.login_page)
+        # Free this dashboard; the next user to log in gets a fresh one
+        self.main_window.evict_page(self)
     
     def manage_existing_exam(self):
+        self.main_window.navigation.show_subpage(self, 'exams', self.build_exams_page, self.load_exams)
+
+    def build_exams_page(self):
         # Create a new widget to display existing exams
         self.exams_widget = QtWidgets.QWidget()
         exams_layout = QtWidgets.QVBoxLayout(self.exams_widget)
@@ -164,86 +190,143 @@ class TeacherDashboard(QtWidgets.QWidget):
         self.load_exams()
         
         exams_layout.addStretch()
-        self.main_window.stackedWidget.addWidget(self.exams_widget)
-        self.main_window.stackedWidget.setCurrentWidget(self.exams_widget)
+        return self.exams_widget
     
+    def show_load_error(self, layout, message):
+        # Replace the loading placeholder with the error
+        clear_layout(layout)
+        error_label = QtWidgets.QLabel(message)
+        error_label.setStyleSheet("font-size: 14px; color: red; margin: 20px;")
+        layout.addWidget(error_label)
+
     def load_exams(self):
-        # Clear any existing content
-        while self.exams_container_layout.count():
-            item = self.exams_container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        try:
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
+        # Show a placeholder while the exams are fetched in the background
+        show_loading(self.exams_container_layout, "Loading exams...")
+        self.main_window.data_loader.load(
+            self.exams_container,
+            functools.partial(self.fetch_exams, self.main_window.current_user),
+            self.render_exams,
+            lambda e: self.show_load_error(self.exams_container_layout, f"Failed to fetch exams: {str(e)}")
+        )
+    
+    def fetch_exams(self, teacher_username):
+        """Fetches the teacher's exams. Runs on a worker thread."""
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+        
+        response = supabase.table('exams') \
+            .select('id, name, status, exam_date, start_time, end_time') \
+            .eq('teacher_username', teacher_username) \
+            .execute()
+        return response.data
+    
+    def render_exams(self, data):
+        clear_layout(self.exams_container_layout)
+        
+        if not data:
+            no_exams_label = QtWidgets.QLabel("You haven't created any exams yet.")
+            no_exams_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_exams_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.exams_container_layout.addWidget(no_exams_label)
+            return
+        
+        # Create a scroll area for the exams
+        scroll_area = QtWidgets.QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_widget = QtWidgets.QWidget()
+        scroll_layout = QtWidgets.QVBoxLayout(scroll_widget)
+        scroll_layout.setSpacing(10)
+        
+        for exam in data:
+            exam_card = QtWidgets.QWidget()
+            exam_card.setStyleSheet('''
+                QWidget {
+                    background: white;
+                    border-radius: 10px;
+                    padding: 15px;
+                    margin: 5px;
+                    border: 1px solid #E0E0E0;
+                }
+            ''')
+            card_layout = QtWidgets.QVBoxLayout(exam_card)
+            
+            name_label = QtWidgets.QLabel(f"Name: {exam['name']}")
+            name_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
+            
+            id_label = QtWidgets.QLabel(f"ID: {exam['id']}")
+            id_label.setStyleSheet("font-size: 14px; color: #666;")
             
-            response = supabase.table('exams') \
-                .select('id, name, status, exam_date, start_time, end_time') \
-                .eq('teacher_username', self.main_window.current_user) \
-                .execute()
+            status_label = QtWidgets.QLabel(f"Status: {exam['status']}")
+            status_label.setStyleSheet("font-size: 14px; color: #666;")
             
-            data = response.data
-            if not data:
-                no_exams_label = QtWidgets.QLabel("You haven't created any exams yet.")
-                no_exams_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_exams_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.exams_container_layout.addWidget(no_exams_label)
-                return
+            date_label = QtWidgets.QLabel(f"Date: {exam['exam_date']}")
+            date_label.setStyleSheet("font-size: 14px; color: #666;")
             
-            # Create a scroll area for the exams
-            scroll_area = QtWidgets.QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_widget = QtWidgets.QWidget()
-            scroll_layout = QtWidgets.QVBoxLayout(scroll_widget)
-            scroll_layout.setSpacing(10)
+            time_label = QtWidgets.QLabel(f"Time: {exam['start_time']} - {exam['end_time']}")
+            time_label.setStyleSheet("font-size: 14px; color: #666;")
             
-            for exam in data:
-                exam_card = QtWidgets.QWidget()
-                exam_card.setStyleSheet('''
-                    QWidget {
-                        background: white;
-                        border-radius: 10px;
-                        padding: 15px;
-                        margin: 5px;
-                        border: 1px solid #E0E0E0;
-                    }
-                ''')
-                card_layout = QtWidgets.QVBoxLayout(exam_card)
-                
-                name_label = QtWidgets.QLabel(f"Name: {exam['name']}")
-                name_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
-                
-                id_label = QtWidgets.QLabel(f"ID: {exam['id']}")
-                id_label.setStyleSheet("font-size: 14px; color: #666;")
-                
-                status_label = QtWidgets.QLabel(f"Status: {exam['status']}")
-                status_label.setStyleSheet("font-size: 14px; color: #666;")
-                
-                date_label = QtWidgets.QLabel(f"Date: {exam['exam_date']}")
-                date_label.setStyleSheet("font-size: 14px; color: #666;")
-                
-                time_label = QtWidgets.QLabel(f"Time: {exam['start_time']} - {exam['end_time']}")
-                time_label.setStyleSheet("font-size: 14px; color: #666;")
-                
-                card_layout.addWidget(name_label)
-                card_layout.addWidget(id_label)
-                card_layout.addWidget(status_label)
-                card_layout.addWidget(date_label)
-                card_layout.addWidget(time_label)
-                
-                scroll_layout.addWidget(exam_card)
+            card_layout.addWidget(name_label)
+            card_layout.addWidget(id_label)
+            card_layout.addWidget(status_label)
+            card_layout.addWidget(date_label)
+            card_layout.addWidget(time_label)
             
-            scroll_area.setWidget(scroll_widget)
-            self.exams_container_layout.addWidget(scroll_area)
+            export_btn = QtWidgets.QPushButton("Export Questions")
+            export_btn.setStyleSheet(COMMON_STYLES['secondary_button'])
+            export_btn.clicked.connect(lambda _, exam=exam, button=export_btn: self.export_exam_questions(exam, button))
+            card_layout.addWidget(export_btn)
             
-        except Exception as e:
-            error_label = QtWidgets.QLabel(f"Failed to fetch exams: {str(e)}")
-            error_label.setStyleSheet("font-size: 14px; color: red; margin: 20px;")
-            self.exams_container_layout.addWidget(error_label)
+            scroll_layout.addWidget(exam_card)
+        
+        scroll_area.setWidget(scroll_widget)
+        self.exams_container_layout.addWidget(scroll_area)
+
+    def export_exam_questions(self, exam, button):
+        """Saves an exam's questions to a CSV, JSONL or GIFT file that Import Questions reads back"""
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Questions", f"{exam['name']}.csv",
+            "CSV files (*.csv);;JSON Lines files (*.jsonl);;GIFT files (*.gift)")
+        if not path:
+            return
+        
+        button.setEnabled(False)
+        
+        def finished(count):
+            button.setEnabled(True)
+            msg = QtWidgets.QMessageBox()
+            msg.setWindowTitle("Export Finished")
+            msg.setText(f"Exported {count} questions to {path}")
+            msg.setIcon(QtWidgets.QMessageBox.Icon.Information)
+            msg.exec()
+        
+        def failed(e):
+            button.setEnabled(True)
+            msg = QtWidgets.QMessageBox()
+            msg.setWindowTitle("Error")
+            msg.setText(f"Failed to export questions: {str(e)}")
+            msg.setIcon(QtWidgets.QMessageBox.Icon.Critical)
+            msg.exec()
+        
+        self.main_window.data_loader.load(
+            button,
+            functools.partial(self.fetch_and_export_questions, exam['id'], path),
+            finished,
+            failed
+        )
+    
+    def fetch_and_export_questions(self, exam_id, path):
+        """Writes an exam's questions to path. Runs on a worker thread."""
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+        
+        return export_questions(supabase, exam_id, path)
 
     def check_student_result(self):
+        self.main_window.navigation.show_subpage(self, 'results', self.build_results_page, self.load_results)
+
+    def build_results_page(self):
         # Create a new widget to display results
         self.results_widget = QtWidgets.QWidget()
         results_layout = QtWidgets.QVBoxLayout(self.results_widget)
@@ -271,95 +354,110 @@ class TeacherDashboard(QtWidgets.QWidget):
         self.load_results()
         
         results_layout.addStretch()
-        self.main_window.stackedWidget.addWidget(self.results_widget)
-        self.main_window.stackedWidget.setCurrentWidget(self.results_widget)
+        return self.results_widget
     
     def load_results(self):
-        # Clear any existing content
-        while self.results_container_layout.count():
-            item = self.results_container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        try:
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-            
-            # Step 1: Get exams created by the teacher
-            exams_response = supabase.table('exams') \
-                .select('id, name') \
-                .eq('teacher_username', self.main_window.current_user) \
-                .execute()
-            
-            exam_ids = [e['id'] for e in exams_response.data]
-            exam_names = {e['id']: e['name'] for e in exams_response.data}
-            
-            if not exam_ids:
-                no_exams_label = QtWidgets.QLabel("You haven't created any exams yet.")
-                no_exams_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_exams_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.results_container_layout.addWidget(no_exams_label)
-                return
-            
-            # Step 2: Fetch results for those exams
-            results_response = supabase.table('exam_results') \
-                .select('exam_id, student_username, score') \
-                .in_('exam_id', exam_ids) \
-                .execute()
+        # Show a placeholder while the results are fetched in the background
+        show_loading(self.results_container_layout, "Loading results...")
+        self.main_window.data_loader.load(
+            self.results_container,
+            functools.partial(self.fetch_results, self.main_window.current_user),
+            self.render_results,
+            lambda e: self.show_load_error(self.results_container_layout, f"Failed to fetch results: {str(e)}")
+        )
+    
+    def fetch_results(self, teacher_username):
+        """
+        Fetches results for every exam the teacher created. Runs on a worker thread.
+        
+        Returns:
+            tuple: (exam_id -> exam name, result rows); result rows is None
+            when the teacher has no exams
+        """
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+        
+        # Step 1: Get exams created by the teacher
+        exams_response = supabase.table('exams') \
+            .select('id, name') \
+            .eq('teacher_username', teacher_username) \
+            .execute()
+        
+        exam_ids = [e['id'] for e in exams_response.data]
+        exam_names = {e['id']: e['name'] for e in exams_response.data}
+        
+        if not exam_ids:
+            return exam_names, None
+        
+        # Step 2: Fetch results for those exams
+        results_response = supabase.table('exam_results') \
+            .select('exam_id, student_username, score') \
+            .in_('exam_id', exam_ids) \
+            .execute()
+        return exam_names, results_response.data
+    
+    def render_results(self, fetched):
+        clear_layout(self.results_container_layout)
+        exam_names, results = fetched
+        
+        if results is None:
+            no_exams_label = QtWidgets.QLabel("You haven't created any exams yet.")
+            no_exams_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_exams_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.results_container_layout.addWidget(no_exams_label)
+            return
+        
+        if not results:
+            no_results_label = QtWidgets.QLabel("No students have submitted results yet.")
+            no_results_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_results_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.results_container_layout.addWidget(no_results_label)
+            return
+        
+        # Create a scroll area for the results
+        scroll_area = QtWidgets.QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_widget = QtWidgets.QWidget()
+        scroll_layout = QtWidgets.QVBoxLayout(scroll_widget)
+        scroll_layout.setSpacing(10)
+        
+        for result in results:
+            exam_name = exam_names.get(result['exam_id'], 'Unknown')
+            result_card = QtWidgets.QWidget()
+            result_card.setStyleSheet('''
+                QWidget {
+                    background: white;
+                    border-radius: 10px;
+                    padding: 15px;
+                    margin: 5px;
+                    border: 1px solid #E0E0E0;
+                }
+            ''')
+            card_layout = QtWidgets.QVBoxLayout(result_card)
             
-            if not results_response.data:
-                no_results_label = QtWidgets.QLabel("No students have submitted results yet.")
-                no_results_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_results_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.results_container_layout.addWidget(no_results_label)
-                return
+            exam_label = QtWidgets.QLabel(f"Exam: {exam_name}")
+            exam_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
             
-            # Create a scroll area for the results
-            scroll_area = QtWidgets.QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_widget = QtWidgets.QWidget()
-            scroll_layout = QtWidgets.QVBoxLayout(scroll_widget)
-            scroll_layout.setSpacing(10)
+            student_label = QtWidgets.QLabel(f"Student: {result['student_username']}")
+            student_label.setStyleSheet("font-size: 14px; color: #666;")
             
-            for result in results_response.data:
-                exam_name = exam_names.get(result['exam_id'], 'Unknown')
-                result_card = QtWidgets.QWidget()
-                result_card.setStyleSheet('''
-                    QWidget {
-                        background: white;
-                        border-radius: 10px;
-                        padding: 15px;
-                        margin: 5px;
-                        border: 1px solid #E0E0E0;
-                    }
-                ''')
-                card_layout = QtWidgets.QVBoxLayout(result_card)
-                
-                exam_label = QtWidgets.QLabel(f"Exam: {exam_name}")
-                exam_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
-                
-                student_label = QtWidgets.QLabel(f"Student: {result['student_username']}")
-                student_label.setStyleSheet("font-size: 14px; color: #666;")
-                
-                score_label = QtWidgets.QLabel(f"Score: {result['score']}")
-                score_label.setStyleSheet("font-size: 14px; color: #666;")
-                
-                card_layout.addWidget(exam_label)
-                card_layout.addWidget(student_label)
-                card_layout.addWidget(score_label)
-                
-                scroll_layout.addWidget(result_card)
+            score_label = QtWidgets.QLabel(f"Score: {result['score']}")
+            score_label.setStyleSheet("font-size: 14px; color: #666;")
             
-            scroll_area.setWidget(scroll_widget)
-            self.results_container_layout.addWidget(scroll_area)
+            card_layout.addWidget(exam_label)
+            card_layout.addWidget(student_label)
+            card_layout.addWidget(score_label)
             
-        except Exception as e:
-            error_label = QtWidgets.QLabel(f"Failed to fetch results: {str(e)}")
-            error_label.setStyleSheet("font-size: 14px; color: red; margin: 20px;")
-            self.results_container_layout.addWidget(error_label)
+            scroll_layout.addWidget(result_card)
+        
+        scroll_area.setWidget(scroll_widget)
+        self.results_container_layout.addWidget(scroll_area)
 
     def view_student(self):
+        self.main_window.navigation.show_subpage(self, 'students', self.build_students_page, self.load_students)
+
+    def build_students_page(self):
         # Create a new widget to display students
         self.students_widget = QtWidgets.QWidget()
         students_layout = QtWidgets.QVBoxLayout(self.students_widget)
@@ -387,63 +485,65 @@ class TeacherDashboard(QtWidgets.QWidget):
         self.load_students()
         
         students_layout.addStretch()
-        self.main_window.stackedWidget.addWidget(self.students_widget)
-        self.main_window.stackedWidget.setCurrentWidget(self.students_widget)
+        return self.students_widget
     
     def load_students(self):
-        # Clear any existing content
-        while self.students_container_layout.count():
-            item = self.students_container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        try:
-            supabase = create_connection()
-            if not supabase:
-                raise Exception("Failed to connect to Supabase")
-            
-            response = supabase.table('users') \
-                .select('username') \
-                .eq('user_type', 'Student') \
-                .execute()
-            
-            if not response.data:
-                no_students_label = QtWidgets.QLabel("No students found in the system.")
-                no_students_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
-                no_students_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.students_container_layout.addWidget(no_students_label)
-                return
-            
-            # Create a scroll area for the students
-            scroll_area = QtWidgets.QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_widget = QtWidgets.QWidget()
-            scroll_layout = QtWidgets.QVBoxLayout(scroll_widget)
-            scroll_layout.setSpacing(10)
-            
-            for user in response.data:
-                student_card = QtWidgets.QWidget()
-                student_card.setStyleSheet('''
-                    QWidget {
-                        background: white;
-                        border-radius: 10px;
-                        padding: 15px;
-                        margin: 5px;
-                        border: 1px solid #E0E0E0;
-                    }
-                ''')
-                card_layout = QtWidgets.QVBoxLayout(student_card)
-                
-                username_label = QtWidgets.QLabel(f"Username: {user['username']}")
-                username_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
-                
-                card_layout.addWidget(username_label)
-                scroll_layout.addWidget(student_card)
+        # Show a placeholder while the students are fetched in the background
+        show_loading(self.students_container_layout, "Loading students...")
+        self.main_window.data_loader.load(
+            self.students_container,
+            self.fetch_students,
+            self.render_students,
+            lambda e: self.show_load_error(self.students_container_layout, f"Failed to fetch students: {str(e)}")
+        )
+    
+    def fetch_students(self):
+        """Fetches every student account. Runs on a worker thread."""
+        supabase = create_connection()
+        if not supabase:
+            raise Exception("Failed to connect to Supabase")
+        
+        response = supabase.table('users') \
+            .select('username') \
+            .eq('user_type', 'Student') \
+            .execute()
+        return response.data
+    
+    def render_students(self, students):
+        clear_layout(self.students_container_layout)
+        
+        if not students:
+            no_students_label = QtWidgets.QLabel("No students found in the system.")
+            no_students_label.setStyleSheet("font-size: 16px; color: #666; margin: 20px;")
+            no_students_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.students_container_layout.addWidget(no_students_label)
+            return
+        
+        # Create a scroll area for the students
+        scroll_area = QtWidgets.QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_widget = QtWidgets.QWidget()
+        scroll_layout = QtWidgets.QVBoxLayout(scroll_widget)
+        scroll_layout.setSpacing(10)
+        
+        for user in students:
+            student_card = QtWidgets.QWidget()
+            student_card.setStyleSheet('''
+                QWidget {
+                    background: white;
+                    border-radius: 10px;
+                    padding: 15px;
+                    margin: 5px;
+                    border: 1px solid #E0E0E0;
+                }
+            ''')
+            card_layout = QtWidgets.QVBoxLayout(student_card)
             
-            scroll_area.setWidget(scroll_widget)
-            self.students_container_layout.addWidget(scroll_area)
+            username_label = QtWidgets.QLabel(f"Username: {user['username']}")
+            username_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
             
-        except Exception as e:
-            error_label = QtWidgets.QLabel(f"Failed to fetch students: {str(e)}")
-            error_label.setStyleSheet("font-size: 14px; color: red; margin: 20px;")
-            self.students_container_layout.addWidget(error_label)
\ No newline at end of file
+            card_layout.addWidget(username_label)
+            scroll_layout.addWidget(student_card)
+        
+        scroll_area.setWidget(scroll_widget)
+        self.students_container_layout.addWidget(scroll_area)
\ No newline at end of file
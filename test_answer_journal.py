@@ -0,0 +1,176 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from answer_journal import AnswerJournal
+
+# Debounce and max delay, in fake seconds. Waits follow them in real time,
+# so they are kept short; the fake clock decides when a batch is due.
+DEBOUNCE = 0.05
+MAX_DELAY = 0.2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeWriter:
+    """Records every batch; fails while results holds False"""
+
+    def __init__(self, results=()):
+        self.batches = []
+        self.results = list(results)
+        self.before_result = None
+        self.called = threading.Event()
+
+    def __call__(self, batch):
+        self.batches.append(dict(batch))
+        self.called.set()
+        if self.before_result is not None:
+            self.before_result()
+        return self.results.pop(0) if self.results else True
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestAnswerJournal(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.writer = FakeWriter()
+        self.journal = None
+
+    def tearDown(self):
+        if self.journal is not None:
+            self.journal.close(flush=False)
+
+    def make_journal(self):
+        self.journal = AnswerJournal(5, 'student', debounce_seconds=DEBOUNCE, max_delay_seconds=MAX_DELAY,
+                                     clock=self.clock, writer=self.writer)
+        return self.journal
+
+    def test_only_the_latest_selection_per_question_is_written(self):
+        journal = self.make_journal()
+        journal.record(1, 'a')
+        journal.record(2, 'b')
+        journal.record(1, 'c')
+        self.assertEqual(journal.pending_count, 2)
+
+        self.assertTrue(journal.flush(wait=True))
+        self.assertEqual(self.writer.batches, [{1: 'c', 2: 'b'}])
+        self.assertEqual(journal.pending_count, 0)
+
+    def test_written_once_selections_stop(self):
+        journal = self.make_journal()
+        journal.record(1, 'a')
+        self.clock.now = DEBOUNCE / 2
+        journal.record(2, 'b')
+        # Not due until DEBOUNCE after the last selection
+        self.clock.now = DEBOUNCE
+        self.assertFalse(self.writer.called.wait(3 * DEBOUNCE))
+
+        self.clock.now = 1.5 * DEBOUNCE
+        self.assertTrue(self.writer.called.wait(2))
+        self.assertEqual(self.writer.batches, [{1: 'a', 2: 'b'}])
+
+    def test_written_after_max_delay_while_selections_continue(self):
+        journal = self.make_journal()
+        for question_id in range(5):
+            self.clock.now = question_id * DEBOUNCE * 0.9
+            journal.record(question_id, 'a')
+        self.assertFalse(self.writer.called.wait(2 * DEBOUNCE))
+
+        # Still selecting, but the first selection is MAX_DELAY old
+        self.clock.now = MAX_DELAY
+        journal.record(5, 'a')
+        self.assertTrue(self.writer.called.wait(2))
+        self.assertEqual(list(self.writer.batches[0]), [0, 1, 2, 3, 4, 5])
+
+    def test_failed_batch_is_retried_without_clobbering_newer_selections(self):
+        self.writer.results = [False]
+        journal = self.make_journal()
+        # Selections made while the failing write is in flight
+        self.writer.before_result = lambda: (journal.record(1, 'new'), journal.record(3, 'c'))
+        journal.record(1, 'old')
+        journal.record(2, 'b')
+        journal.flush()
+        self.assertTrue(self.writer.called.wait(2))
+        # Retried after a pause, once the newer selections are due too
+        self.clock.now = DEBOUNCE
+
+        self.assertTrue(wait_until(lambda: len(self.writer.batches) == 2))
+        self.writer.before_result = None
+        self.assertEqual(self.writer.batches, [{1: 'old', 2: 'b'}, {1: 'new', 2: 'b', 3: 'c'}])
+        self.assertTrue(journal.flush(wait=True))
+
+    def test_flush_wait_reports_unsaved_answers(self):
+        self.writer.results = [False] * 100
+        journal = self.make_journal()
+        journal.record(1, 'a')
+
+        self.assertFalse(journal.flush(wait=True, timeout=0.1))
+        self.assertEqual(journal.pending_count, 1)
+
+    def test_close_writes_pending_answers(self):
+        journal = self.make_journal()
+        journal.record(1, 'a')
+        journal.close()
+
+        self.assertEqual(self.writer.batches, [{1: 'a'}])
+        self.assertFalse(journal._thread.is_alive())
+        # Later selections and closes are ignored
+        journal.record(2, 'b')
+        journal.close()
+        self.assertEqual(journal.pending_count, 0)
+
+    def test_close_without_flush_drops_the_buffer(self):
+        journal = self.make_journal()
+        journal.record(1, 'a')
+        journal.close(flush=False)
+
+        self.assertEqual(journal.pending_count, 0)
+        self.assertTrue(wait_until(lambda: not journal._thread.is_alive()))
+        self.assertEqual(self.writer.batches, [])
+
+    def test_close_without_flush_does_not_wait_for_a_write(self):
+        release = threading.Event()
+        self.writer.before_result = lambda: release.wait(5)
+        self.writer.results = [False]
+        journal = self.make_journal()
+        journal.record(1, 'a')
+        journal.flush()
+        self.assertTrue(self.writer.called.wait(2))
+
+        started = time.monotonic()
+        journal.close(flush=False)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+        # The failed write is not retried once closed
+        release.set()
+        self.assertTrue(wait_until(lambda: not journal._thread.is_alive()))
+        self.assertEqual(len(self.writer.batches), 1)
+
+    def test_close_without_flush_cancels_database_writes(self):
+        journal = AnswerJournal(5, 'student')
+        journal.close(flush=False)
+        # _write checks before every request, so nothing is sent
+        self.assertFalse(journal._write({1: 'a'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import unittest
+import sys
+import os
+import csv
+import json
+import tempfile
+import threading
+from unittest.mock import MagicMock
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bulk_import import import_users, validate_row, hash_password, write_error_report
+
+
+def fake_supabase(existing=(), taken_during_import=()):
+    """
+    Client whose users table holds existing; usernames in taken_during_import
+    pass the lookup but are skipped by the insert, as if added meanwhile
+    """
+    supabase = MagicMock()
+    table = supabase.table.return_value
+
+    def lookup(column, usernames):
+        query = MagicMock()
+        query.execute.return_value.data = [{'username': u} for u in usernames if u in existing]
+        return query
+
+    def upsert(rows, on_conflict, ignore_duplicates):
+        query = MagicMock()
+        query.execute.return_value.data = [row for row in rows if row['username'] not in taken_during_import]
+        return query
+
+    table.select.return_value.in_.side_effect = lookup
+    table.upsert.side_effect = upsert
+    return supabase
+
+
+class TestBulkImport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_csv(self, rows, header=('username', 'password')):
+        path = os.path.join(self.tmp.name, 'users.csv')
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return path
+
+    def test_validate_row(self):
+        user, error = validate_row({'username': ' alice ', 'password': 'password1'})
+        self.assertIsNone(error)
+        self.assertEqual(user, {'username': 'alice', 'password': hash_password('password1'), 'user_type': 'Student'})
+
+        self.assertEqual(validate_row({'username': 'bob', 'password': 'short'})[1],
+                         "Password must be at least 8 characters")
+        self.assertEqual(validate_row({'username': '', 'password': 'password1'})[1],
+                         "Username and password are required")
+        self.assertIn("User type", validate_row({'username': 'eve', 'password': 'password1', 'user_type': 'Admin'})[1])
+        self.assertEqual(validate_row({'username': 'tom', 'password': 'password1', 'user_type': 'teacher'})[0]['user_type'],
+                         'Teacher')
+
+    def test_one_lookup_and_one_insert_per_chunk(self):
+        path = self.write_csv([(f"student{i:04d}", 'password1') for i in range(600)])
+        supabase = fake_supabase()
+
+        report = import_users(supabase, path, chunk_size=250)
+
+        self.assertEqual((report.rows, report.added, report.errors), (600, 600, []))
+        table = supabase.table.return_value
+        self.assertEqual(table.select.return_value.in_.call_count, 3)
+        self.assertEqual(table.upsert.call_count, 3)
+        inserted = [row['username'] for call in table.upsert.call_args_list for row in call.args[0]]
+        self.assertEqual(sorted(inserted), [f"student{i:04d}" for i in range(600)])
+        for call in table.upsert.call_args_list:
+            self.assertEqual(call.kwargs, {'on_conflict': 'username', 'ignore_duplicates': True})
+
+    def test_rejected_rows_are_reported_by_line(self):
+        path = self.write_csv([
+            ('alice', 'password1'),      # line 2
+            ('bob', 'short'),            # line 3
+            ('', 'password1'),           # line 4
+            ('alice', 'password2'),      # line 5: repeated in the file
+            ('carol', 'password1'),      # line 6: already exists
+            ('dave', 'password1'),       # line 7: added while importing
+            ('erin', 'password1'),       # line 8
+        ])
+        supabase = fake_supabase(existing={'carol'}, taken_during_import={'dave'})
+
+        report = import_users(supabase, path, chunk_size=2)
+
+        self.assertEqual((report.rows, report.added), (7, 2))
+        self.assertEqual(report.errors, [
+            (3, 'bob', "Password must be at least 8 characters"),
+            (4, '', "Username and password are required"),
+            (5, 'alice', "Username appears earlier in the file"),
+            (6, 'carol', "Username already exists"),
+            (7, 'dave', "Username already exists"),
+        ])
+
+        report_path = os.path.join(self.tmp.name, 'errors.csv')
+        write_error_report(report_path, report.errors)
+        with open(report_path, newline='') as f:
+            self.assertEqual(len(list(csv.reader(f))), 6)
+
+    def test_jsonl_and_failed_chunks(self):
+        path = os.path.join(self.tmp.name, 'users.jsonl')
+        with open(path, 'w') as f:
+            f.write(json.dumps({'username': 'tina', 'password': 'password1', 'user_type': 'Teacher'}) + "\n")
+            f.write("not json\n")
+            f.write("\n")
+            f.write(json.dumps({'Username': 'sam', 'Password': 'password1'}) + "\n")
+        supabase = fake_supabase()
+
+        report = import_users(supabase, path, default_user_type='Student', chunk_size=1)
+
+        self.assertEqual((report.rows, report.added), (3, 2))
+        self.assertEqual(report.errors, [(2, '', "Not a JSON object")])
+        inserted = [call.args[0][0] for call in supabase.table.return_value.upsert.call_args_list]
+        self.assertEqual({(row['username'], row['user_type']) for row in inserted},
+                         {('tina', 'Teacher'), ('sam', 'Student')})
+
+        # A chunk that fails is reported row by row and the import goes on
+        supabase.table.return_value.upsert.side_effect = [Exception("timeout"), MagicMock()]
+        report = import_users(supabase, path, chunk_size=1, max_in_flight=1)
+        self.assertEqual(report.errors[0], (1, 'tina', "Error: timeout"))
+
+    def test_cancel_stops_reading(self):
+        path = self.write_csv([(f"student{i:04d}", 'password1') for i in range(1000)])
+        updates = []
+
+        report = import_users(fake_supabase(), path, chunk_size=100, max_in_flight=2,
+                              progress=lambda report, fraction: updates.append(fraction),
+                              cancelled=lambda: len(updates) >= 2)
+
+        self.assertTrue(report.cancelled)
+        self.assertLess(report.added, 1000)
+        self.assertEqual(report.added, report.rows)
+        self.assertEqual(updates[-1], 1.0)
+        self.assertEqual(updates, sorted(updates))
+
+    def test_nothing_is_sent_once_cancelled(self):
+        path = self.write_csv([(f"student{i:04d}", 'password1') for i in range(1000)])
+        supabase = fake_supabase()
+        insert = supabase.table.return_value.upsert.side_effect
+        writing = threading.Event()
+        checks = []
+
+        def upsert(rows, on_conflict, ignore_duplicates):
+            writing.set()
+            return insert(rows, on_conflict, ignore_duplicates)
+
+        def cancelled():
+            # Cancel is pressed while the first chunk is being written
+            checks.append(True)
+            return len(checks) > 1 and writing.wait(5)
+
+        supabase.table.return_value.upsert.side_effect = upsert
+        report = import_users(supabase, path, chunk_size=100, max_in_flight=4, cancelled=cancelled)
+
+        self.assertTrue(report.cancelled)
+        self.assertEqual(supabase.table.return_value.upsert.call_count, 1)
+        self.assertEqual((report.added, report.rows), (100, 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
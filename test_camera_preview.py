@@ -0,0 +1,165 @@
+import unittest
+import sys
+import os
+import functools
+import threading
+import types
+from unittest.mock import MagicMock, patch
+import numpy as np
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from camera_preview import CameraPreview
+from frame_scheduler import AdaptiveFrameScheduler
+from exam_taking_proctored import ProctoredExamTaking
+from gaze_process import GazeProcessError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCameraPreview(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.preview = CameraPreview(120, 90, max_fps=10, clock=self.clock)
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.frame[:, :, 2] = 255  # pure red in BGR
+
+    def test_renders_into_shared_buffer(self):
+        image = self.preview.render(self.frame)
+        self.assertEqual((image.width(), image.height()), (120, 90))
+        # BGR is handed to Qt as is; no conversion needed for the colours to come out right
+        self.assertEqual(image.pixelColor(0, 0).getRgb()[:3], (255, 0, 0))
+
+        self.preview.frame_shown()
+        self.clock.now += 0.2
+        second = self.preview.render(self.frame)
+        self.assertEqual(int(second.constBits()), int(image.constBits()))
+
+    def test_waits_for_previous_frame_to_be_shown(self):
+        self.assertIsNotNone(self.preview.render(self.frame))
+        self.clock.now += 1.0
+        self.assertIsNone(self.preview.render(self.frame))
+
+        self.preview.frame_shown()
+        self.assertIsNotNone(self.preview.render(self.frame))
+
+    def test_throttled_to_max_fps(self):
+        self.preview = CameraPreview(120, 90, max_fps=8, clock=self.clock)
+        rendered = 0
+        # 32 fps of camera frames for one second
+        for _ in range(32):
+            if self.preview.render(self.frame) is not None:
+                rendered += 1
+                self.preview.frame_shown()
+            self.clock.now += 1 / 32
+        self.assertEqual(rendered, 8)
+        self.assertEqual(self.preview.skipped, 24)
+
+    def test_hidden_preview_not_rendered(self):
+        self.assertIsNone(self.preview.render(self.frame, visible=False))
+        self.assertEqual(self.preview.rendered, 0)
+
+
+COMPLIANT = {"is_camera_clear": True, "is_face_detected": True, "is_facing_camera": True,
+             "violation_duration": 0, "is_timeout": False}
+
+
+class TestCameraWorker(unittest.TestCase):
+    """Runs the proctoring camera loop for two simulated seconds"""
+
+    def run_worker(self, preview_visible, gaze_process=None, analyze_frame=None):
+        clock = FakeClock()
+        stop = threading.Event()
+        page = types.SimpleNamespace(preview_visible=preview_visible,
+                                     preview_renderer=CameraPreview(120, 90, max_fps=10, clock=clock),
+                                     gaze_status_signal=MagicMock(), camera_frame_signal=MagicMock())
+        page.analyze_frame = analyze_frame or MagicMock(return_value=COMPLIANT)
+        page.update_camera_preview = functools.partial(ProctoredExamTaking.update_camera_preview, page)
+        page.camera_frame_signal.emit.side_effect = lambda image: page.preview_renderer.frame_shown()
+
+        def sleep(seconds):
+            # Like a real sleep, never wakes early
+            clock.now += max(seconds, 0.0) + 1e-6
+            if clock.now >= 2.0:
+                stop.set()
+
+        fake_time = types.SimpleNamespace(monotonic=clock, sleep=sleep)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        # Steadily compliant, so analysis stays at its slowest rate
+        scheduler = AdaptiveFrameScheduler(target_fps=2, min_fps=2, max_fps=2, clock=clock)
+        with patch('exam_taking_proctored.GAZE_DETECTION_AVAILABLE', True), \
+                patch('exam_taking_proctored.time', fake_time), \
+                patch('exam_taking_proctored.cv2.VideoCapture'), \
+                patch('exam_taking_proctored.read_latest_frame', return_value=(True, frame, 0)) as read, \
+                patch('exam_taking_proctored.AdaptiveFrameScheduler', return_value=scheduler):
+            ProctoredExamTaking.camera_worker(page, stop, gaze_process)
+        return page, read
+
+    def test_preview_keeps_its_rate_when_analysis_backs_off(self):
+        page, _ = self.run_worker(preview_visible=True)
+        self.assertEqual(page.analyze_frame.call_count, 4)
+        self.assertEqual(page.gaze_status_signal.emit.call_count, 4)
+        self.assertEqual(page.preview_renderer.rendered, 20)
+
+    def test_hidden_preview_only_wakes_for_analysis(self):
+        page, read = self.run_worker(preview_visible=False)
+        self.assertEqual(page.analyze_frame.call_count, 4)
+        self.assertEqual(read.call_count, 4)
+        self.assertEqual(page.preview_renderer.rendered, 0)
+
+    def test_thread_stops_its_own_gaze_process(self):
+        gaze_process = MagicMock()
+        page, _ = self.run_worker(preview_visible=False, gaze_process=gaze_process)
+
+        self.assertEqual(page.analyze_frame.call_count, 4)
+        self.assertIs(page.analyze_frame.call_args.args[1], gaze_process)
+        gaze_process.stop.assert_called_once_with()
+        # Nothing shared with the page, which may have started another thread
+        self.assertNotIn('gaze_process', vars(page))
+
+    def test_failed_gaze_process_falls_back_in_process(self):
+        gaze_process = MagicMock()
+
+        def analyze_frame(frame, process=None):
+            if process is not None:
+                raise GazeProcessError("worker died")
+            return COMPLIANT
+
+        analyze = MagicMock(side_effect=analyze_frame)
+        page, _ = self.run_worker(preview_visible=False, gaze_process=gaze_process, analyze_frame=analyze)
+
+        self.assertEqual(page.gaze_status_signal.emit.call_count, 4)
+        # Tried once, then every frame is analysed in-process
+        self.assertEqual([len(c.args) for c in analyze.call_args_list], [2, 1, 1, 1, 1])
+        gaze_process.stop.assert_called_once_with()
+
+    def test_restart_gives_each_thread_its_own_stop_flag_and_process(self):
+        page = types.SimpleNamespace(is_camera_running=False, camera_thread=None, camera_stop=None)
+        started = []
+        page.camera_worker = lambda stop, gaze_process: started.append((stop, gaze_process))
+        page.start_camera = functools.partial(ProctoredExamTaking.start_camera, page)
+        page.stop_camera = functools.partial(ProctoredExamTaking.stop_camera, page)
+
+        with patch('exam_taking_proctored.GAZE_DETECTION_AVAILABLE', True), \
+                patch('exam_taking_proctored.USE_GAZE_PROCESS', True), \
+                patch('exam_taking_proctored.GazeProcess', side_effect=lambda timeout_seconds: MagicMock()):
+            page.start_camera()
+            page.stop_camera()
+            page.start_camera()
+            page.camera_thread.join(1)
+
+        (first_stop, first_process), (second_stop, second_process) = started
+        self.assertTrue(first_stop.is_set())
+        self.assertFalse(second_stop.is_set())
+        self.assertIsNot(first_process, second_process)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,7 @@ from PyQt6.QtTest import QTest
 import sys
 import os
 import hashlib
+import datetime
 from unittest.mock import patch, MagicMock
 
 # Add the current directory to the Python path
@@ -14,9 +15,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from login_page import LoginPage
 from signup_page import SignupPage
-from student_dashboard import StudentDashboard
+from student_dashboard import StudentDashboard, bucket_exams, fetch_exam_summaries
 from teacher_dashboard import TeacherDashboard
-from admin_dashboard import AdminDashboard
+from admin_dashboard import AdminDashboard, fetch_users_page
 from main import MainWindow
 
 class TestDashboardFunctionality(unittest.TestCase):
@@ -118,6 +119,96 @@ class TestDashboardFunctionality(unittest.TestCase):
             # Verify exam list was loaded
             self.assertTrue(hasattr(self.student_dashboard, 'exam_list'))
 
+    def test_student_load_exams_checks_attempts_in_one_query(self):
+        self.main_window.current_user = 'divyansh'
+        with patch('student_dashboard.create_connection') as mock_conn:
+            mock_supabase = MagicMock()
+            mock_conn.return_value = mock_supabase
+            exams_query = MagicMock()
+            exams_query.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = [
+                {'id': 1, 'name': 'Taken', 'duration': 600, 'start_time': '00:00:00', 'end_time': '23:59:59'},
+                {'id': 2, 'name': 'Open', 'duration': 600, 'start_time': '00:00:00', 'end_time': '23:59:59'},
+            ]
+            results_query = MagicMock()
+            results_query.select.return_value.in_.return_value.eq.return_value.execute.return_value.data = [
+                {'exam_id': 1}
+            ]
+            mock_supabase.table.side_effect = lambda name: {'exams': exams_query, 'exam_results': results_query}[name]
+
+            self.student_dashboard.show_exams()
+            self.main_window.data_loader.wait()
+
+            # One exams query and one exam_results query, however many exams there are
+            self.assertEqual(mock_supabase.table.call_count, 2)
+            results_query.select.return_value.in_.assert_called_once_with('exam_id', [1, 2])
+
+    def test_bucket_exams(self):
+        exams = [
+            {'id': 1, 'name': 'Morning', 'duration': 600, 'start_time': '08:00:00', 'end_time': '09:00:00'},
+            {'id': 2, 'name': 'Noon', 'duration': 600, 'start_time': '11:30:00', 'end_time': '12:30:00'},
+            {'id': 3, 'name': 'Evening', 'duration': 600, 'start_time': '18:00:00', 'end_time': '19:00:00'},
+            {'id': 4, 'name': 'Taken', 'duration': 600, 'start_time': '11:00:00', 'end_time': '13:00:00'},
+        ]
+        available_now, upcoming, expired = bucket_exams(exams, {4}, datetime.time(12, 0))
+        self.assertEqual([e[0] for e in available_now], [2])
+        self.assertEqual([e[0] for e in upcoming], [3])
+        self.assertEqual([e[0] for e in expired], [1])
+
+    def test_fetch_exam_summaries_batches_queries(self):
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value.select.return_value.in_.return_value.execute.return_value.data = [
+            {'id': 1, 'name': 'Quiz', 'exam_date': '2024-01-01', 'question_count': 5}
+        ]
+
+        exams = fetch_exam_summaries(mock_supabase, [1, 2, 3])
+
+        self.assertEqual(exams[1]['question_count'], 5)
+        mock_supabase.table.assert_called_once_with('exams')
+        mock_supabase.table.return_value.select.return_value.in_.assert_called_once_with('id', [1, 2, 3])
+
+    def test_fetch_exam_summaries_counts_questions_without_column(self):
+        missing_column = Exception("column exams.question_count does not exist")
+        missing_column.code = '42703'
+        exams_query = MagicMock()
+        exams_query.select.side_effect = lambda columns: MagicMock(**{
+            'in_.return_value.execute.side_effect': missing_column
+        }) if 'question_count' in columns else MagicMock(**{
+            'in_.return_value.execute.return_value.data': [{'id': 1, 'name': 'Quiz', 'exam_date': None}]
+        })
+        questions_query = MagicMock()
+        # More questions than the API returns rows for in one response
+        questions_query.select.return_value.eq.return_value.execute.return_value.count = 1500
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = lambda name: {'exams': exams_query, 'questions': questions_query}[name]
+
+        exams = fetch_exam_summaries(mock_supabase, [1])
+
+        self.assertEqual(exams[1]['question_count'], 1500)
+        # Counted by the database, without downloading the rows
+        questions_query.select.assert_called_once_with('id', count='exact', head=True)
+        questions_query.select.return_value.eq.assert_called_once_with('exam_id', 1)
+
+    def test_fetch_users_page_is_keyset_paginated(self):
+        mock_supabase = MagicMock()
+        users = mock_supabase.table.return_value.select.return_value.eq.return_value
+        users.ilike.return_value.gt.return_value.order.return_value.limit.return_value.execute.return_value.data = [
+            {'username': 'ann_2'}
+        ]
+
+        rows, _ = fetch_users_page(mock_supabase, 'Student', search='n_%', after='ann_1', limit=20)
+
+        self.assertEqual(rows, [{'username': 'ann_2'}])
+        # Wildcards in the search text are matched literally
+        users.ilike.assert_called_once_with('username', '%n\\_\\%%')
+        users.ilike.return_value.gt.assert_called_once_with('username', 'ann_1')
+        users.ilike.return_value.gt.return_value.order.return_value.limit.assert_called_once_with(20)
+        # Only the first page asks for a count
+        mock_supabase.table.return_value.select.assert_called_once_with('username', count=None)
+
+        fetch_users_page(mock_supabase, 'Teacher')
+        mock_supabase.table.return_value.select.assert_called_with('username', count='estimated')
+        mock_supabase.table.return_value.select.return_value.eq.assert_called_with('user_type', 'Teacher')
+
     def test_teacher_dashboard_buttons(self):
         # Set current user
         self.main_window.current_user = 'divyanshteacher'
@@ -142,6 +233,38 @@ class TestDashboardFunctionality(unittest.TestCase):
             # Verify user list was loaded
             self.assertTrue(hasattr(self.admin_dashboard, 'user_list'))
 
+    def test_admin_add_and_import_buttons_with_no_users(self):
+        with patch.object(self.main_window.data_loader, 'load'):
+            page = self.admin_dashboard.build_students_page()
+        self.admin_dashboard.render_students(([], None))
+
+        buttons = [button.text() for button in page.findChildren(QtWidgets.QPushButton)]
+        self.assertIn("+ Add New Student", buttons)
+        self.assertIn("Import Students from File...", buttons)
+
+    def test_pages_are_built_on_first_navigation(self):
+        # Only the login page is needed to start
+        self.assertEqual(list(self.main_window.pages), ['login_page'])
+
+        dashboard = self.main_window.student_dashboard
+        self.assertIs(self.main_window.student_dashboard, dashboard)
+        self.assertNotEqual(self.main_window.stackedWidget.indexOf(dashboard), -1)
+        self.assertNotIn('teacher_dashboard', self.main_window.pages)
+
+    def test_evict_page(self):
+        dashboard = self.main_window.student_dashboard
+        self.main_window.stackedWidget.setCurrentWidget(dashboard)
+        dashboard.logout()
+
+        self.assertIs(self.main_window.stackedWidget.currentWidget(), self.main_window.login_page)
+        self.assertEqual(self.main_window.stackedWidget.indexOf(dashboard), -1)
+        self.assertNotIn('student_dashboard', self.main_window.pages)
+        # Built again when next needed
+        self.assertIsNot(self.main_window.student_dashboard, dashboard)
+
+        # Pages that were never added are left alone
+        self.assertFalse(self.main_window.evict_page(QtWidgets.QWidget()))
+
     @classmethod
     def tearDownClass(cls):
         # Clean up QApplication
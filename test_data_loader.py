@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+import threading
+from PyQt6 import QtWidgets
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import DataLoader, show_loading, clear_layout
+
+class TestDataLoader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    def setUp(self):
+        self.loader = DataLoader()
+        self.stack = QtWidgets.QStackedWidget()
+        self.loader.attach(self.stack)
+        self.page = QtWidgets.QWidget()
+        self.container = QtWidgets.QWidget(self.page)
+        self.other_page = QtWidgets.QWidget()
+        self.stack.addWidget(self.page)
+        self.stack.addWidget(self.other_page)
+        self.stack.setCurrentWidget(self.page)
+
+    def tearDown(self):
+        self.loader.cancel_all()
+        self.loader.wait()
+
+    def test_fetch_runs_off_the_gui_thread(self):
+        results = []
+        self.loader.load(self.container, threading.get_ident, results.append)
+        self.loader.wait()
+
+        self.assertEqual(len(results), 1)
+        self.assertNotEqual(results[0], threading.get_ident())
+        self.assertEqual(self.loader.pending_count(), 0)
+
+    def test_errors_are_delivered(self):
+        errors = []
+        self.loader.load(self.container, lambda: 1 / 0, self.fail, errors.append)
+        self.loader.wait()
+
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+    def test_newer_load_supersedes_older(self):
+        release = threading.Event()
+        results = []
+
+        def slow_fetch():
+            release.wait(5)
+            return 'stale'
+
+        self.loader.load(self.container, slow_fetch, results.append)
+        self.loader.load(self.container, lambda: 'fresh', results.append)
+        release.set()
+        self.loader.wait()
+
+        self.assertEqual(results, ['fresh'])
+
+    def test_navigating_away_cancels_and_returning_reloads(self):
+        release = threading.Event()
+        results = []
+
+        def fetch():
+            release.wait(5)
+            return 'loaded'
+
+        self.loader.load(self.container, fetch, results.append)
+        self.stack.setCurrentWidget(self.other_page)
+        release.set()
+        self.loader.wait()
+        self.assertEqual(results, [])
+
+        self.stack.setCurrentWidget(self.page)
+        self.loader.wait()
+        self.assertEqual(results, ['loaded'])
+
+    def test_run_once_is_not_restarted_by_navigation(self):
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def task():
+            calls.append(threading.get_ident())
+            release.wait(5)
+            return 'imported'
+
+        # A page load from the same owner is unaffected by the job
+        self.loader.load(self.page, lambda: 'page', results.append)
+        self.loader.run_once(task, results.append, owner=self.page)
+        self.stack.setCurrentWidget(self.other_page)
+        self.stack.setCurrentWidget(self.page)
+        release.set()
+        self.loader.wait()
+
+        self.assertEqual(len(calls), 1)
+        self.assertNotEqual(calls[0], threading.get_ident())
+        self.assertEqual(sorted(results), ['imported', 'page'])
+
+    def test_loading_placeholder(self):
+        layout = QtWidgets.QVBoxLayout(self.container)
+        layout.addWidget(QtWidgets.QLabel("old"))
+        nested = QtWidgets.QHBoxLayout()
+        nested.addWidget(QtWidgets.QLineEdit())
+        layout.addLayout(nested)
+
+        label = show_loading(layout, "Loading exams...")
+
+        self.assertEqual(layout.count(), 1)
+        self.assertIs(layout.itemAt(0).widget(), label)
+        clear_layout(layout)
+        self.assertEqual(layout.count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
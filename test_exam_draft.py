@@ -0,0 +1,222 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+from unittest.mock import MagicMock, patch
+from PyQt6 import QtWidgets
+from PyQt6.QtCore import QTime
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from exam_draft import ExamDraft, delete_orphaned_drafts
+from exam_creation import ExamCreation
+from data_loader import DataLoader
+import cleanup_draft_exams
+
+EXAM = {'name': 'Quiz', 'teacher_username': 'teacher', 'duration': 5400, 'exam_date': '2026-03-02',
+        'start_time': '09:00:00', 'end_time': '11:00:00'}
+
+
+def question(text, correct='Option 1'):
+    return {'question_text': text, 'option1': 'a', 'option2': 'b', 'option3': 'c', 'option4': 'd',
+            'correct_answer': correct}
+
+
+class TestExamDraft(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_draft_survives_a_restart(self):
+        self.assertIsNone(ExamDraft.load('teacher', self.tmp.name))
+        draft = ExamDraft('teacher', self.tmp.name)
+        draft.start(EXAM, 3)
+        draft.set_question(1, question('Q1'))
+        draft.set_question(2, {'question_text': 'Half typed'})
+
+        loaded = ExamDraft.load('teacher', self.tmp.name)
+
+        self.assertEqual(loaded.exam, EXAM)
+        self.assertEqual((loaded.total_questions, loaded.current_question, loaded.written_count()), (3, 2, 1))
+        self.assertEqual(loaded.question(1), question('Q1'))
+        self.assertEqual(loaded.question(2)['option1'], '')
+        self.assertIsNone(loaded.question(3))
+        self.assertEqual(os.listdir(self.tmp.name), ['teacher.json'])
+
+        with open(draft.path, 'w') as f:
+            f.write('{"exam": ')
+        self.assertIsNone(ExamDraft.load('teacher', self.tmp.name))
+
+    def test_commit_saves_everything_in_one_call(self):
+        draft = ExamDraft('teacher', self.tmp.name)
+        draft.start(EXAM, 2)
+        draft.set_question(2, question('Q2', 'Option 4'))
+
+        with patch('exam_draft.save_exam_with_questions', return_value=42) as save:
+            with self.assertRaises(ValueError):
+                draft.commit()
+            save.assert_not_called()
+
+            draft.set_question(1, question('Q1'))
+            self.assertEqual(draft.commit(), 42)
+
+        save.assert_called_once_with(dict(EXAM, status='active'), [question('Q1'), question('Q2', 'Option 4')])
+        self.assertFalse(os.path.exists(draft.path))
+
+    def test_delete_orphaned_drafts(self):
+        supabase = MagicMock()
+        supabase.rpc.return_value.execute.return_value.data = 3
+        self.assertEqual(delete_orphaned_drafts(supabase, 12), 3)
+        supabase.rpc.assert_called_once_with('delete_orphaned_draft_exams', {'p_older_than': '12 hours'})
+        supabase.table.assert_not_called()
+
+        # Without the database function: drafts with results are kept
+        supabase = MagicMock()
+        supabase.rpc.return_value.execute.side_effect = Exception("PGRST202")
+        supabase.table.return_value.select.return_value.eq.return_value.lt.return_value.execute.return_value.data = [
+            {'id': 1}, {'id': 2}
+        ]
+        supabase.table.return_value.select.return_value.in_.return_value.execute.return_value.data = [
+            {'exam_id': 2}
+        ]
+        self.assertEqual(delete_orphaned_drafts(supabase), 1)
+        supabase.table.return_value.delete.return_value.in_.assert_any_call('exam_id', [1])
+        supabase.table.return_value.delete.return_value.in_.assert_any_call('id', [1])
+
+    @patch('cleanup_draft_exams.load_dotenv')
+    @patch('cleanup_draft_exams.delete_orphaned_drafts', return_value=2)
+    @patch('cleanup_draft_exams.create_client')
+    def test_cleanup_uses_the_service_key(self, create_client, delete, load_dotenv):
+        env = {'SUPABASE_URL': 'https://example.supabase.co', 'SUPABASE_KEY': 'anon-key'}
+        with patch.dict(os.environ, env, clear=True), patch('builtins.print'):
+            # Never falls back to the app's anon key
+            self.assertEqual(cleanup_draft_exams.main([]), 1)
+            create_client.assert_not_called()
+
+            os.environ['SUPABASE_SERVICE_KEY'] = 'service-key'
+            self.assertEqual(cleanup_draft_exams.main(['--older-than-hours', '6']), 0)
+
+        create_client.assert_called_once_with('https://example.supabase.co', 'service-key')
+        delete.assert_called_once_with(create_client.return_value, 6)
+
+
+class TestExamCreationDraft(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.main_window = MagicMock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_page(self, draft=None):
+        return ExamCreation(self.main_window, 'teacher', draft or ExamDraft('teacher', self.tmp.name))
+
+    def fill(self, page, text, correct='Option 1'):
+        page.question_input.setPlainText(text)
+        for option, value in zip([page.option1, page.option2, page.option3, page.option4], 'abcd'):
+            option.setText(value)
+        page.correct_answer.setCurrentText(correct)
+
+    def test_questions_are_kept_locally_until_finish(self):
+        page = self.make_page()
+        page.exam_name.setText('Quiz')
+        page.start_time.setTime(QTime(9, 0))
+        page.end_time.setTime(QTime(11, 0))
+        page.question_count.setValue(3)
+        page.start_questions()
+        self.assertIs(page.content_stack.currentWidget(), page.question_page)
+
+        self.fill(page, 'Q1')
+        page.next_question()
+        self.fill(page, 'Q2', 'Option 2')
+        page.next_question()
+        self.assertTrue(page.previous_btn.isEnabled())
+        self.assertEqual(page.question_input.toPlainText(), '')
+
+        # Back and forth keeps what was typed
+        page.question_input.setPlainText('Q3 draft')
+        page.previous_question()
+        self.assertEqual((page.current_question, page.question_input.toPlainText()), (2, 'Q2'))
+        self.assertEqual(page.correct_answer.currentText(), 'Option 2')
+        page.question_input.setPlainText('Q2 edited')
+        page.next_question()
+        self.assertEqual((page.current_question, page.question_input.toPlainText()), (3, 'Q3 draft'))
+        self.assertFalse(page.finish_btn.isHidden())
+
+        # A restart picks up where it stopped
+        resumed = self.make_page(ExamDraft.load('teacher', self.tmp.name))
+        self.assertEqual(resumed.exam_name.text(), 'Quiz')
+        self.assertEqual((resumed.start_time.time(), resumed.end_time.time()), (QTime(9, 0), QTime(11, 0)))
+        self.assertEqual((resumed.current_question, resumed.question_input.toPlainText()), (3, 'Q3 draft'))
+
+        self.fill(resumed, 'Q3')
+        with patch('exam_draft.save_exam_with_questions', return_value=7) as save, \
+             patch.object(QtWidgets.QMessageBox, 'exec', return_value=0):
+            resumed.finish_exam()
+
+        exam, questions = save.call_args.args
+        self.assertEqual((exam['name'], exam['status'], exam['duration']), ('Quiz', 'active', 3600))
+        self.assertEqual([q['question_text'] for q in questions], ['Q1', 'Q2 edited', 'Q3'])
+        self.assertEqual(resumed.exam_id, 7)
+        self.assertIsNone(ExamDraft.load('teacher', self.tmp.name))
+
+    def test_finish_goes_to_an_incomplete_question(self):
+        draft = ExamDraft('teacher', self.tmp.name)
+        draft.start(EXAM, 3)
+        draft.set_question(1, question('Q1'))
+        draft.set_question(2, {'question_text': 'Q2'})
+        draft.set_question(3, question('Q3'))
+        page = self.make_page(draft)
+
+        with patch('exam_draft.save_exam_with_questions') as save, \
+             patch.object(ExamCreation, 'show_error') as show_error:
+            page.finish_exam()
+
+        save.assert_not_called()
+        show_error.assert_called_once_with("Question 2: All options must be filled")
+        self.assertEqual(page.current_question, 2)
+
+    def test_import_runs_in_the_background(self):
+        path = os.path.join(self.tmp.name, 'bank.csv')
+        with open(path, 'w') as f:
+            f.write("question_text,option1,option2,option3,option4,correct_answer\n"
+                    "Q1?,a,b,c,d,A\n"
+                    "Q2?,a,b,c,d,B\n")
+        self.main_window.data_loader = DataLoader()
+        page = self.make_page()
+        page.exam_name.setText('Quiz')
+        page.start_time.setTime(QTime(9, 0))
+        page.end_time.setTime(QTime(11, 0))
+        saved_on = []
+
+        def save(exam, questions):
+            saved_on.append(threading.get_ident())
+            return 7
+
+        with patch('exam_creation.save_exam_with_questions', side_effect=save), \
+             patch.object(QtWidgets.QFileDialog, 'getOpenFileName', return_value=(path, '')), \
+             patch.object(QtWidgets.QMessageBox, 'exec', return_value=0), \
+             patch.object(ExamCreation, 'go_back') as go_back:
+            page.import_questions()
+            # Locked until the import is done
+            self.assertFalse(page.setup_page.isEnabled())
+            self.main_window.data_loader.wait()  # Reads the file
+            self.main_window.data_loader.wait()  # Saves the exam
+
+        self.assertEqual(len(saved_on), 1)
+        self.assertNotEqual(saved_on[0], threading.get_ident())
+        self.assertEqual(page.exam_id, 7)
+        self.assertTrue(page.setup_page.isEnabled())
+        go_back.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
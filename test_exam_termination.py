@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock, call, patch
+from PyQt6 import QtWidgets, sip
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from exam_taking import ExamTaking
+from exam_taking_proctored import ProctoredExamTaking
+
+
+class TestZeroScore(unittest.TestCase):
+    def test_terminated_after_answering(self):
+        # The student has answered, so the journal holds answers and the
+        # result row already exists
+        journal = MagicMock()
+        exam_widget = MagicMock(answer_journal=journal)
+        exam_widget.close_answer_journal.side_effect = \
+            lambda flush=True: ExamTaking.close_answer_journal(exam_widget, flush)
+        page = MagicMock(exam_id=5, exam_widget=exam_widget)
+        page.main_window.current_user = 'student'
+
+        supabase = MagicMock()
+        calls = MagicMock()
+        calls.attach_mock(journal.close, 'close_journal')
+        calls.attach_mock(supabase.table, 'table')
+        with patch('supabase_connection.create_connection', return_value=supabase):
+            ProctoredExamTaking.submit_zero_score(page)
+
+        # Buffered answers are dropped before the score is written
+        self.assertEqual(calls.mock_calls[0], call.close_journal(flush=False))
+        self.assertIsNone(exam_widget.answer_journal)
+        supabase.table.assert_called_once_with('exam_results')
+        supabase.table.return_value.insert.assert_not_called()
+        row, = supabase.table.return_value.upsert.call_args.args
+        self.assertEqual((row['exam_id'], row['student_username'], row['score']), (5, 'student', 0))
+        self.assertIn('completed_at', row)
+        self.assertEqual(supabase.table.return_value.upsert.call_args.kwargs,
+                         {'on_conflict': 'exam_id,student_username'})
+
+
+class TestAnswerJournalTeardown(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    @patch.object(ExamTaking, 'fetch_questions')
+    @patch.object(ExamTaking, 'fetch_exam_details')
+    @patch('exam_taking.AnswerJournal')
+    def test_deleted_page_closes_its_journal(self, answer_journal, fetch_exam_details, fetch_questions):
+        page = ExamTaking(MagicMock(), 5)
+        journal = page.get_answer_journal()
+
+        # Navigating away deletes the page without a submit
+        sip.delete(page)
+
+        journal.close.assert_called_once_with(wait=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from frame_scheduler import AdaptiveFrameScheduler, read_latest_frame
+
+COMPLIANT = {'is_camera_clear': True, 'is_face_detected': True, 'is_facing_camera': True,
+             'violation_duration': 0}
+LOOKING_AWAY = dict(COMPLIANT, is_facing_camera=False, violation_duration=2.0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCapture:
+    """Capture whose grab() takes grab_costs[i] seconds on the fake clock"""
+
+    def __init__(self, clock, grab_costs):
+        self.clock = clock
+        self.grab_costs = list(grab_costs)
+        self.grabs = 0
+
+    def grab(self):
+        if not self.grab_costs:
+            return False
+        self.clock.now += self.grab_costs.pop(0)
+        self.grabs += 1
+        return True
+
+    def retrieve(self):
+        return True, f"frame{self.grabs}"
+
+
+class TestReadLatestFrame(unittest.TestCase):
+    def test_skips_buffered_frames(self):
+        clock = FakeClock()
+        # Two stale frames come straight out of the buffer, the third waits for the camera
+        cap = FakeCapture(clock, [0.0, 0.0, 0.03])
+        self.assertEqual(read_latest_frame(cap, clock=clock), (True, "frame3", 2))
+
+    def test_drop_limit(self):
+        clock = FakeClock()
+        cap = FakeCapture(clock, [0.0] * 10)
+        self.assertEqual(read_latest_frame(cap, max_drop=3, clock=clock), (True, "frame4", 3))
+
+    def test_failed_grab(self):
+        clock = FakeClock()
+        ok, frame, _ = read_latest_frame(FakeCapture(clock, []), clock=clock)
+        self.assertFalse(ok)
+        self.assertIsNone(frame)
+
+
+class TestAdaptiveFrameScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = AdaptiveFrameScheduler(target_fps=10, min_fps=2, max_fps=15, calm_seconds=5.0,
+                                                backoff=0.5, clock=self.clock)
+
+    def run_frame(self, result, cost=0.01, dropped=0):
+        self.scheduler.frame_started(dropped)
+        self.clock.now += cost
+        delay = self.scheduler.frame_finished(result)
+        self.clock.now += delay
+        return delay
+
+    def test_backs_off_when_calm(self):
+        self.assertAlmostEqual(self.run_frame(COMPLIANT), 0.09)
+        while self.clock.now < 5.0:
+            self.run_frame(COMPLIANT)
+        self.assertEqual(self.scheduler.current_fps, 10)
+
+        # Past calm_seconds the rate halves per frame down to min_fps
+        self.run_frame(COMPLIANT)
+        self.assertEqual(self.scheduler.current_fps, 5)
+        for _ in range(3):
+            self.run_frame(COMPLIANT)
+        self.assertEqual(self.scheduler.current_fps, 2)
+
+    def test_violation_uses_max_rate_and_resets_calm(self):
+        while self.clock.now < 6.0:
+            self.run_frame(COMPLIANT)
+        self.assertLess(self.scheduler.current_fps, 10)
+
+        self.run_frame(LOOKING_AWAY)
+        self.assertEqual(self.scheduler.current_fps, 15)
+
+        # Compliance has to last calm_seconds again before backing off
+        self.run_frame(COMPLIANT)
+        self.assertEqual(self.scheduler.current_fps, 10)
+
+    def test_rate_limited_by_processing_cost(self):
+        delay = self.run_frame(LOOKING_AWAY, cost=0.2)
+        self.assertEqual(delay, 0.0)
+        self.assertAlmostEqual(self.scheduler.current_fps, 5)
+
+    def test_counts_frames(self):
+        self.run_frame(COMPLIANT, dropped=2)
+        self.run_frame(COMPLIANT, dropped=1)
+        self.assertEqual(self.scheduler.frames, 2)
+        self.assertEqual(self.scheduler.dropped_frames, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,343 @@
+import unittest
+import tempfile
+import sys
+import os
+from unittest.mock import MagicMock, patch
+import numpy as np
+import cv2
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from gaze_detection import GazeDetection, BATCH_FIELDS, batch_quality_metrics, fast_quality_metrics
+from calibrate_quality import calibrate_threshold
+from face_detectors import FaceDetector, create_detector, landmarks_facing
+from benchmark_detectors import benchmark_detector, load_labels
+
+class TestGazeDetectionPipeline(unittest.TestCase):
+    def setUp(self):
+        # The cascades are replaced with mocks, so don't require the XML files
+        with patch('face_detectors.os.path.exists', return_value=True), \
+                patch('face_detectors.cv2.CascadeClassifier', side_effect=lambda path: MagicMock()):
+            self.detector = GazeDetection(timeout_seconds=10, working_width=320, full_search_interval=3,
+                                          detector='haar')
+        self.haar = self.detector.face_detector
+        self.haar.eye_cascade.detectMultiScale.return_value = ()
+        self.frame = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+    def searched_shapes(self):
+        return [c.args[0].shape for c in self.haar.face_cascade.detectMultiScale.call_args_list]
+
+    def test_prepare_frame_downscales_to_working_width(self):
+        gray, scale = self.detector.prepare_frame(self.frame)
+        self.assertEqual(gray.shape, (240, 320))
+        self.assertEqual(scale, 0.5)
+
+        small = self.frame[:120, :160]
+        gray, scale = self.detector.prepare_frame(small)
+        self.assertEqual(gray.shape, (120, 160))
+        self.assertEqual(scale, 1.0)
+
+    def test_clarity_matches_float_laplacian(self):
+        gray, _ = self.detector.prepare_frame(self.frame)
+        expected = cv2.Laplacian(cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY), cv2.CV_64F).var()
+
+        self.detector.clarity_threshold = expected - 1
+        self.assertTrue(self.detector.check_image_quality(self.frame, gray))
+        self.detector.clarity_threshold = expected + 1
+        self.assertFalse(self.detector.check_image_quality(self.frame, gray))
+
+    def test_quality_verdicts_match_full_resolution(self):
+        rng = np.random.default_rng(2)
+        texture = rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+        # Heavily blurred but with sensor noise: clear at camera resolution,
+        # though the noise averages away in the working frame
+        noisy = np.clip(cv2.GaussianBlur(texture, (0, 0), 10) + rng.normal(0, 5, texture.shape), 0, 255)
+        # Slightly blurred: unclear at camera resolution, sharp once downscaled
+        soft = cv2.GaussianBlur(texture, (0, 0), 2)
+        frames = np.stack([noisy.astype(np.uint8), soft])
+
+        def verdict(frame):
+            # The check as tuned, on the full frame with a float Laplacian
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            return cv2.Laplacian(gray, cv2.CV_64F).var() > 100 and gray.mean() > 30
+
+        self.assertEqual([verdict(frame) for frame in frames], [True, False])
+        for frame in frames:
+            gray, _ = self.detector.prepare_frame(frame)
+            self.assertEqual(self.detector.check_image_quality(frame, gray), verdict(frame))
+        batch = GazeDetection(detector=ScriptedDetector()).process_batch(frames, [0.0, 0.1])
+        self.assertEqual(batch['is_camera_clear'].tolist(), [True, False])
+
+    def test_tracks_face_in_padded_window(self):
+        cascade = self.haar.face_cascade.detectMultiScale
+        cascade.return_value = np.array([[100, 60, 80, 80]])
+        self.detector.detect_face_and_gaze(self.frame)
+        self.assertEqual(self.haar.last_search, 'full')
+        self.assertEqual(self.detector.face_box, (200, 120, 160, 160))
+
+        # Next frame only searches around the face: 80px face + 40px padding each side
+        cascade.return_value = np.array([[42, 38, 80, 80]])
+        self.detector.detect_face_and_gaze(self.frame)
+        self.assertEqual(self.haar.last_search, 'roi')
+        self.assertEqual(self.searched_shapes()[-1], (160, 160))
+        self.assertEqual(self.haar.last_face, (102, 58, 80, 80))
+        self.assertTrue(self.detector.is_face_detected)
+
+    def test_min_face_size_follows_the_working_scale(self):
+        cascade = self.haar.face_cascade.detectMultiScale
+        cascade.return_value = ()
+        self.detector.detect_face_and_gaze(self.frame)
+        # 30px at camera resolution, as before frames were downscaled
+        self.assertEqual(cascade.call_args.kwargs['minSize'], (15, 15))
+
+        self.detector.detect_face_and_gaze(self.frame[:240, :320])
+        self.assertEqual(cascade.call_args.kwargs['minSize'], (30, 30))
+
+    def test_falls_back_to_full_search_when_lost(self):
+        cascade = self.haar.face_cascade.detectMultiScale
+        cascade.return_value = np.array([[100, 60, 80, 80]])
+        self.detector.detect_face_and_gaze(self.frame)
+
+        cascade.return_value = ()
+        self.detector.detect_face_and_gaze(self.frame)
+        # The window search failed, so the whole frame was searched in the same call
+        self.assertEqual(self.searched_shapes()[-2:], [(160, 160), (240, 320)])
+        self.assertFalse(self.detector.is_face_detected)
+        self.assertIsNone(self.haar.last_face)
+
+    def test_periodic_full_search(self):
+        cascade = self.haar.face_cascade.detectMultiScale
+        cascade.return_value = np.array([[100, 60, 80, 80]])
+        self.detector.detect_face_and_gaze(self.frame)
+        searches = [self.haar.last_search]
+
+        # Relative to the padded window this keeps the face where it was
+        cascade.return_value = np.array([[40, 40, 80, 80]])
+        for _ in range(4):
+            self.detector.detect_face_and_gaze(self.frame)
+            searches.append(self.haar.last_search)
+        self.assertEqual(searches, ['full', 'roi', 'roi', 'roi', 'full'])
+
+    def test_eye_check_reused_while_face_holds_still(self):
+        self.haar.eye_check_interval = 3
+        # Search the whole frame each time so the cascade's answer is the face position
+        self.haar.full_search_interval = 0
+        self.haar.face_cascade.detectMultiScale.return_value = np.array([[100, 60, 80, 80]])
+        self.haar.eye_cascade.detectMultiScale.return_value = np.array([[20, 40, 30, 30], [100, 42, 30, 30]])
+
+        for _ in range(6):
+            self.detector.detect_face_and_gaze(self.frame)
+            self.assertTrue(self.detector.is_facing_camera)
+        # Checked on the first frame and again once the interval ran out
+        self.assertEqual(self.haar.eye_checks, 2)
+
+        # A face that moved by more than eye_recheck_motion is checked straight away
+        self.haar.face_cascade.detectMultiScale.return_value = np.array([[130, 60, 80, 80]])
+        self.detector.detect_face_and_gaze(self.frame)
+        self.assertEqual(self.haar.eye_checks, 3)
+
+    def test_process_frame_converts_once(self):
+        self.haar.face_cascade.detectMultiScale.return_value = ()
+
+        with patch('gaze_detection.cv2.cvtColor', side_effect=cv2.cvtColor) as cvt_color:
+            result = self.detector.process_frame(self.frame)
+
+        # The downscaled frame is converted once for detection, the full frame once for the quality check
+        self.assertEqual([c.args[0].shape for c in cvt_color.call_args_list], [(240, 320, 3), (480, 640, 3)])
+        self.assertFalse(result['is_face_detected'])
+
+class StubDetector(FaceDetector):
+    name = 'stub'
+
+    def __init__(self, face_box, is_facing):
+        self.face_box = face_box
+        self.is_facing = is_facing
+        self.calls = []
+
+    def detect(self, frame, gray, scale):
+        self.calls.append((gray.shape, scale))
+        return self.face_box, self.is_facing
+
+class TestFaceDetectors(unittest.TestCase):
+    def setUp(self):
+        self.frame = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+    def test_incomplete_detector_fails_when_created(self):
+        class NoDetect(FaceDetector):
+            name = 'incomplete'
+
+        with self.assertRaises(TypeError):
+            NoDetect()
+
+    def test_gaze_detection_uses_given_detector(self):
+        stub = StubDetector((10, 20, 100, 100), np.True_)
+        detector = GazeDetection(detector=stub)
+        detector.detect_face_and_gaze(self.frame)
+
+        self.assertEqual(stub.calls, [((240, 320), 0.5)])
+        self.assertEqual(detector.face_box, (10, 20, 100, 100))
+        self.assertIs(detector.is_facing_camera, True)
+
+        stub.face_box, stub.is_facing = None, False
+        detector.detect_face_and_gaze(self.frame)
+        self.assertFalse(detector.is_face_detected)
+
+    def test_facing_hysteresis(self):
+        stub = StubDetector((10, 20, 100, 100), True)
+        detector = GazeDetection(detector=stub)
+        states = []
+        for facing in [True, True, False, True, True, False, False, True, True]:
+            stub.is_facing = facing
+            detector.detect_face_and_gaze(self.frame)
+            states.append(detector.is_facing_camera)
+            self.assertEqual(detector.raw_facing, facing)
+
+        # A single noisy frame is ignored, two in a row flip it
+        self.assertEqual(states, [True, True, True, True, True, True, False, True, True])
+
+    def test_create_detector_by_name(self):
+        with self.assertRaises(ValueError):
+            create_detector('nope')
+        with patch.dict(os.environ, {'GAZE_DETECTOR': 'dnn', 'GAZE_DNN_MODEL': '/missing.onnx'}):
+            # Picks the DNN detector from the environment; its model isn't installed here
+            with self.assertRaises(FileNotFoundError):
+                create_detector()
+
+    def test_landmarks_facing(self):
+        # Level eyes with the nose between them
+        self.assertTrue(landmarks_facing((60, 40), (40, 40), (50, 55), 100))
+        # Head turned: nose next to one eye
+        self.assertFalse(landmarks_facing((60, 40), (40, 40), (58, 55), 100))
+        # Head tilted: eyes at different heights
+        self.assertFalse(landmarks_facing((60, 52), (40, 40), (50, 55), 100))
+
+    def test_benchmark_reports_latency_and_agreement(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write("video,frame,face_detected,facing_camera\n"
+                    "a.mp4,0,1,1\n"
+                    "a.mp4,1,1,0\n"
+                    "a.mp4,2,0,\n")
+        self.addCleanup(os.remove, f.name)
+        labels = load_labels(f.name)
+        self.assertEqual(labels[('a.mp4', 2)], (False, None))
+
+        stub = StubDetector((10, 20, 100, 100), True)
+        result = benchmark_detector(stub, {'a.mp4': [self.frame] * 4}, labels, warmup=1)
+
+        self.assertEqual(result['frames'], 4)
+        self.assertEqual(result['labeled_frames'], 3)
+        # Always sees a facing face: right on frame 0, wrong about facing on 1, wrong about the face on 2
+        self.assertAlmostEqual(result['face_accuracy'], 2 / 3)
+        self.assertAlmostEqual(result['facing_accuracy'], 1 / 2)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+class TestFastQualityMode(unittest.TestCase):
+    def setUp(self):
+        self.detector = GazeDetection(detector=StubDetector(None, False), quality_mode='fast', fast_clarity_threshold=50,
+                                      quality_max_age=3)
+        self.gray = np.random.default_rng(0).integers(0, 256, (240, 320), dtype=np.uint8)
+
+    def test_static_scene_reuses_measurement(self):
+        with patch('gaze_detection.fast_quality_metrics', side_effect=fast_quality_metrics) as measure:
+            for _ in range(4):
+                self.detector.measure_quality(self.gray)
+            # Measured once, then reused until quality_max_age frames had passed
+            self.assertEqual(measure.call_count, 1)
+            self.detector.measure_quality(self.gray)
+            self.assertEqual(measure.call_count, 2)
+
+            # A scene change is measured straight away
+            self.detector.measure_quality(255 - self.gray)
+            self.assertEqual(measure.call_count, 3)
+        self.assertEqual(self.detector.quality_cache_hits, 3)
+
+    def test_fast_mode_uses_its_own_threshold(self):
+        clarity, _ = fast_quality_metrics(self.gray)
+        self.detector.fast_clarity_threshold = clarity - 1
+        self.assertTrue(self.detector.check_image_quality(None, self.gray))
+        self.detector.fast_clarity_threshold = clarity + 1
+        self.assertFalse(self.detector.check_image_quality(None, self.gray))
+
+    def test_calibrate_threshold(self):
+        verdicts = np.array([False, False, True, False, True, True])
+        fast_clarity = np.array([10.0, 20.0, 30.0, 35.0, 40.0, 50.0])
+        threshold, agreement = calibrate_threshold(verdicts, fast_clarity)
+        # 25 and 37.5 both get 5 of 6; the lower one is found first
+        self.assertEqual(threshold, 25.0)
+        self.assertAlmostEqual(agreement, 5 / 6)
+
+        threshold, agreement = calibrate_threshold(np.array([False, True]), np.array([10.0, 20.0]))
+        self.assertEqual((threshold, agreement), (15.0, 1.0))
+
+class ScriptedDetector(FaceDetector):
+    """Finds a face on frames whose top-left pixel is bright, facing if it is very bright"""
+    name = 'scripted'
+
+    def detect(self, frame, gray, scale):
+        value = frame[0, 0, 0]
+        if value < 100:
+            return None, False
+        return (value, 10, 50, 50), value > 200
+
+class TestProcessBatch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.frames = rng.integers(0, 256, (40, 120, 160, 3), dtype=np.uint8)
+        # Face / no face / looking away in runs long enough for the timers to matter
+        pattern = [250] * 8 + [150] * 14 + [50] * 4 + [250] * 6 + [150] * 8
+        self.frames[:, 0, 0, 0] = pattern
+        # A few dark frames for the quality check
+        self.frames[5:7] //= 8
+        self.timestamps = np.arange(40) * 0.5
+
+    def test_quality_metrics_match_opencv(self):
+        grays = np.stack([cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) for f in self.frames[:5]])
+        brightness, clarity = batch_quality_metrics(grays, chunk_size=2)
+        for gray, b, c in zip(grays, brightness, clarity):
+            self.assertAlmostEqual(b, gray.mean())
+            self.assertAlmostEqual(c, cv2.Laplacian(gray, cv2.CV_64F).var())
+
+    def test_matches_process_frame(self):
+        now = [self.timestamps[0]]
+        live = GazeDetection(timeout_seconds=3, detector=ScriptedDetector(), clock=lambda: now[0])
+        expected = []
+        for frame, timestamp in zip(self.frames, self.timestamps):
+            now[0] = timestamp
+            expected.append(live.process_frame(frame))
+
+        batch = GazeDetection(timeout_seconds=3, detector=ScriptedDetector(), clock=lambda: self.timestamps[0])
+        result = batch.process_batch(self.frames, self.timestamps)
+
+        for field in BATCH_FIELDS:
+            self.assertEqual(list(result[field]), [r[field] for r in expected], field)
+        self.assertTrue(result['is_timeout'].any())
+        self.assertFalse(result['is_camera_clear'][5:7].any())
+        self.assertEqual(result['face_box'][0].tolist(), [250, 10, 50, 50])
+        self.assertEqual(result['face_box'][22].tolist(), [-1, -1, -1, -1])
+
+    def test_parallel_workers_get_own_detectors(self):
+        created = []
+
+        def factory():
+            created.append(ScriptedDetector())
+            return created[-1]
+
+        single = GazeDetection(timeout_seconds=3, detector=ScriptedDetector())
+        expected = single.process_batch(self.frames, self.timestamps)
+
+        parallel = GazeDetection(timeout_seconds=3, detector=ScriptedDetector())
+        parallel.detector_factory = factory
+        result = parallel.process_batch(self.frames, self.timestamps, workers=3)
+
+        self.assertEqual(len(created), 3)
+        for field in BATCH_FIELDS + ('face_box', 'clarity'):
+            np.testing.assert_array_equal(result[field], expected[field])
+
+    def test_timestamps_must_match_frames(self):
+        detector = GazeDetection(detector=ScriptedDetector())
+        with self.assertRaises(ValueError):
+            detector.process_batch(self.frames, self.timestamps[:-1])
+
+if __name__ == '__main__':
+    unittest.main()
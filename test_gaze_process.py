@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from gaze_process import GazeProcess, GazeProcessError
+
+
+class FakeDetector:
+    """Stands in for GazeDetection; reports the mean brightness of each frame"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+
+    def process_frame(self, frame):
+        brightness = int(frame.mean())
+        if brightness == self.fail_on:
+            raise RuntimeError("bad frame")
+        return {
+            "frame": frame,
+            "status": f"brightness {brightness}",
+            "is_timeout": False,
+            "is_camera_clear": True,
+            "is_face_detected": True,
+            "is_facing_camera": True,
+            "violation_triggered": False,
+            "violation_type": None,
+            "violation_duration": 0,
+        }
+
+
+def broken_detector():
+    raise RuntimeError("no cascades")
+
+
+class TestGazeProcess(unittest.TestCase):
+    shape = (48, 64, 3)
+
+    def setUp(self):
+        self.worker = GazeProcess(detector_factory=FakeDetector, fail_on=13)
+        self.worker.start(self.shape)
+        self.addCleanup(self.worker.stop)
+
+    def frame(self, value):
+        return np.full(self.shape, value, dtype=np.uint8)
+
+    def test_round_trip_through_shared_memory(self):
+        for value in (10, 20, 30):
+            result = self.worker.process_frame(self.frame(value), timeout=10)
+            self.assertEqual(result["status"], f"brightness {value}")
+            # Only the compact status comes back
+            self.assertNotIn("frame", result)
+        self.assertEqual(sorted(self.worker._free_slots), [0, 1])
+
+    def test_ring_slots_limit_frames_in_flight(self):
+        first = self.worker.submit(self.frame(1))
+        second = self.worker.submit(self.frame(2))
+        self.assertIsNone(self.worker.submit(self.frame(3)))
+
+        # Waiting for the second frame also frees the first one's slot
+        self.assertEqual(self.worker.wait_result(second, timeout=10)["status"], "brightness 2")
+        self.assertIsNotNone(first)
+        self.assertEqual(len(self.worker._free_slots), 2)
+
+    def test_frame_failure_is_reported(self):
+        with self.assertRaises(GazeProcessError):
+            self.worker.process_frame(self.frame(13), timeout=10)
+        # The worker keeps going after a bad frame
+        self.assertEqual(self.worker.process_frame(self.frame(5), timeout=10)["status"], "brightness 5")
+
+    def test_wrong_frame_shape(self):
+        with self.assertRaises(ValueError):
+            self.worker.submit(np.zeros((10, 10, 3), dtype=np.uint8))
+
+    def test_stop_shuts_down_process(self):
+        process = self.worker.process
+        self.worker.stop()
+        self.assertFalse(process.is_alive())
+        self.assertFalse(self.worker.is_running())
+
+
+class TestGazeProcessStartup(unittest.TestCase):
+    def test_detector_failure_raises(self):
+        worker = GazeProcess(detector_factory=broken_detector)
+        with self.assertRaises(GazeProcessError):
+            worker.start((48, 64, 3))
+        self.assertIsNone(worker.process)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+import numpy as np
+import cv2
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from face_detectors import FaceDetector
+from gaze_detection import GazeDetection
+from gaze_replay import ReplayClock, read_frames, replay
+
+
+class LookingAwayDetector(FaceDetector):
+    """Always finds a face that isn't facing the camera"""
+    name = 'stub'
+
+    def detect(self, frame, gray, scale):
+        return (10, 10, 100, 100), False
+
+
+class TestGazeReplay(unittest.TestCase):
+    def setUp(self):
+        self.frames = [np.random.default_rng(i).integers(0, 256, (240, 320, 3), dtype=np.uint8) for i in range(3)]
+
+    def run_replay(self, frames):
+        clock = ReplayClock(fps=10)
+        detector = GazeDetection(timeout_seconds=1, detector=LookingAwayDetector(), clock=clock)
+        trace = io.StringIO()
+        summary = replay(frames, detector, clock, trace)
+        return summary, [json.loads(line) for line in trace.getvalue().splitlines()]
+
+    def test_timers_follow_simulated_clock(self):
+        summary, records = self.run_replay(self.frames[:1] * 15)
+
+        self.assertEqual(summary['frames'], 15)
+        self.assertEqual(summary['timeouts'], 1)
+        # 1 second timeout at 10 fps: the 11th frame (1.1s) is the first past it
+        self.assertEqual([r['frame'] for r in records if r['is_timeout']], [10])
+        self.assertAlmostEqual(records[4]['time'], 0.5)
+        self.assertAlmostEqual(records[4]['violation_duration'], 0.4)
+        self.assertEqual(records[4]['status'], "Not facing camera directly")
+        self.assertGreaterEqual(records[4]['processing_ms'], 0)
+
+    def test_replay_is_deterministic(self):
+        _, first = self.run_replay(self.frames * 5)
+        _, second = self.run_replay(self.frames * 5)
+        strip = lambda records: [{k: v for k, v in r.items() if k != 'processing_ms'} for r in records]
+        self.assertEqual(strip(first), strip(second))
+
+    def test_reads_image_directory_in_order(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for i, frame in enumerate(self.frames):
+                cv2.imwrite(os.path.join(directory, f"frame_{2 - i:03d}.png"), frame)
+            with open(os.path.join(directory, "notes.txt"), 'w') as f:
+                f.write("not an image")
+
+            frames = list(read_frames(directory))
+            self.assertEqual(len(frames), 3)
+            # frame_000.png holds the last frame written
+            np.testing.assert_array_equal(frames[0], self.frames[2])
+            self.assertEqual(len(list(read_frames(directory, max_frames=2))), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
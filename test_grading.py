@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from grading import fetch_answer_key, grade_answers, build_answer_rows, is_correct_answer
+
+def make_question(question_id, correct_answer):
+    return {
+        'id': question_id,
+        'correct_answer': correct_answer,
+        'option1': f'{question_id}-a',
+        'option2': f'{question_id}-b',
+        'option3': f'{question_id}-c',
+        'option4': f'{question_id}-d',
+    }
+
+class TestGrading(unittest.TestCase):
+    def setUp(self):
+        self.answer_key = {
+            1: make_question(1, 'Option 1'),
+            2: make_question(2, 'Option 3'),
+            3: make_question(3, '3-d'),  # correct answer stored as the option text
+        }
+
+    def test_is_correct_answer(self):
+        self.assertTrue(is_correct_answer(self.answer_key[1], '1-a'))
+        self.assertFalse(is_correct_answer(self.answer_key[1], '1-b'))
+        self.assertTrue(is_correct_answer(self.answer_key[3], '3-d'))
+
+    def test_grade_answers(self):
+        graded = grade_answers(self.answer_key, {1: 0, 2: 1, 3: 3})
+        self.assertEqual(graded, {1: ('1-a', True), 2: ('2-b', False), 3: ('3-d', True)})
+
+    def test_grade_answers_skips_unknown_questions(self):
+        graded = grade_answers(self.answer_key, {1: 0, 99: 2})
+        self.assertEqual(list(graded), [1])
+
+    def test_build_answer_rows(self):
+        rows = build_answer_rows(7, 'divyansh', {2: ('2-c', True)})
+        self.assertEqual(rows, [{
+            'exam_id': 7,
+            'question_id': 2,
+            'student_username': 'divyansh',
+            'selected_answer': '2-c',
+            'is_correct': True
+        }])
+
+    def test_fetch_answer_key_uses_single_query(self):
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+            self.answer_key[1], self.answer_key[2]
+        ]
+
+        answer_key = fetch_answer_key(mock_supabase, 7)
+
+        self.assertEqual(set(answer_key), {1, 2})
+        mock_supabase.table.assert_called_once_with('questions')
+        mock_supabase.table.return_value.select.return_value.eq.assert_called_once_with('exam_id', 7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+import unittest
+import sys
+import os
+import re
+import uuid
+from unittest.mock import MagicMock, patch
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import psycopg2
+    from psycopg2.extras import Json
+except ImportError:
+    psycopg2 = None
+
+# Point this at a throwaway local Postgres, e.g. postgresql://postgres@localhost/postgres
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+import supabase_connection
+
+
+def read_schema():
+    """Returns the schema SQL block from the README"""
+    with open(os.path.join(BASE_DIR, 'README.md')) as f:
+        return re.search(r"```sql\n(.*?)```", f.read(), re.S).group(1)
+
+
+def read_migrations():
+    migrations_dir = os.path.join(BASE_DIR, 'migrations')
+    for name in sorted(os.listdir(migrations_dir)):
+        if name.endswith('.sql'):
+            with open(os.path.join(migrations_dir, name)) as f:
+                yield f.read()
+
+
+@unittest.skipUnless(psycopg2 and TEST_DATABASE_URL, "needs psycopg2 and TEST_DATABASE_URL")
+class MigratedDatabaseTestCase(unittest.TestCase):
+    """Builds the README schema plus every migration in a throwaway Postgres schema"""
+
+    def setUp(self):
+        self.conn = psycopg2.connect(TEST_DATABASE_URL)
+        self.conn.autocommit = True
+        self.schema = f"test_{uuid.uuid4().hex[:8]}"
+        with self.conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {self.schema}")
+            cur.execute(f"SET search_path TO {self.schema}")
+            # The Supabase API roles the migrations grant to
+            for role in ('anon', 'authenticated', 'service_role'):
+                cur.execute("SELECT 1 FROM pg_roles WHERE rolname = %s", (role,))
+                if not cur.fetchone():
+                    cur.execute(f"CREATE ROLE {role}")
+            cur.execute(read_schema())
+            for migration in read_migrations():
+                cur.execute(migration)
+
+            cur.execute("INSERT INTO users (username, password, user_type) VALUES "
+                        "('teacher', 'x', 'Teacher'), ('student', 'x', 'Student')")
+            cur.execute("INSERT INTO exams (name, teacher_username, duration) "
+                        "VALUES ('Quiz', 'teacher', 600) RETURNING id")
+            self.exam_id = cur.fetchone()[0]
+            self.question_ids = []
+            for correct_answer in ('Option 1', 'Option 3', 'd'):
+                cur.execute("INSERT INTO questions (exam_id, question_text, option1, option2, option3, "
+                            "option4, correct_answer) VALUES (%s, 'Q', 'a', 'b', 'c', 'd', %s) RETURNING id",
+                            (self.exam_id, correct_answer))
+                self.question_ids.append(cur.fetchone()[0])
+
+    def tearDown(self):
+        with self.conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {self.schema} CASCADE")
+        self.conn.close()
+
+class TestRecordAnswersFunction(MigratedDatabaseTestCase):
+    def record(self, answers, completed=False):
+        payload = Json([
+            {'question_id': question_id, 'selected_answer': selected}
+            for question_id, selected in answers
+        ])
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT record_answers(%s, %s, %s, %s)",
+                        (self.exam_id, 'student', payload, completed))
+            return cur.fetchone()[0]
+
+    def fetch_result(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT score, completed_at FROM exam_results WHERE exam_id = %s", (self.exam_id,))
+            return cur.fetchall()
+
+    def test_grades_answers_and_maintains_score(self):
+        q1, q2, q3 = self.question_ids
+        self.assertEqual(self.record([(q1, 'a')]), 1)
+        self.assertEqual(self.record([(q2, 'b'), (q3, 'd')]), 2)
+        # Changing an answer updates it in place instead of adding a row
+        self.assertEqual(self.record([(q2, 'c')]), 3)
+        self.assertEqual(self.record([(q1, 'b')]), 2)
+
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT question_id, selected_answer, is_correct FROM student_answers ORDER BY question_id")
+            self.assertEqual(cur.fetchall(), [(q1, 'b', False), (q2, 'c', True), (q3, 'd', True)])
+        self.assertEqual([score for score, _ in self.fetch_result()], [2])
+
+    def test_last_entry_for_a_question_wins(self):
+        q1 = self.question_ids[0]
+        self.assertEqual(self.record([(q1, 'a'), (q1, 'c')]), 0)
+        self.assertEqual(self.record([(q1, 'c'), (q1, 'a')]), 1)
+
+    def test_ignores_questions_from_other_exams(self):
+        self.assertEqual(self.record([(self.question_ids[0] + 1000, 'a')]), 0)
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM student_answers")
+            self.assertEqual(cur.fetchone()[0], 0)
+
+    def test_completed_stamps_completion_time(self):
+        q1 = self.question_ids[0]
+        self.record([(q1, 'a')])
+        (_, completed_at), = self.fetch_result()
+        self.assertIsNone(completed_at)
+
+        self.record([], completed=True)
+        (score, completed_at), = self.fetch_result()
+        self.assertEqual(score, 1)
+        self.assertIsNotNone(completed_at)
+
+    def test_completed_attempts_are_not_rescored(self):
+        q1, q2, _ = self.question_ids
+        self.assertEqual(self.record([(q1, 'a')], completed=True), 1)
+        (_, completed_at), = self.fetch_result()
+
+        # Changing answers after submitting does nothing
+        self.assertEqual(self.record([(q1, 'b'), (q2, 'c')]), 1)
+        self.assertEqual(self.record([(q2, 'c')], completed=True), 1)
+        self.assertEqual(self.fetch_result(), [(1, completed_at)])
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT question_id, selected_answer FROM student_answers")
+            self.assertEqual(cur.fetchall(), [(q1, 'a')])
+
+    def test_terminated_zero_score_is_kept(self):
+        # What submit_zero_score() writes when an exam is terminated
+        with self.conn.cursor() as cur:
+            cur.execute("INSERT INTO exam_results (exam_id, student_username, score, completed_at) "
+                        "VALUES (%s, 'student', 0, CURRENT_TIMESTAMP)", (self.exam_id,))
+        self.assertEqual(self.record([(self.question_ids[0], 'a')]), 0)
+        self.assertEqual([score for score, _ in self.fetch_result()], [0])
+
+class TestQuestionCountColumn(MigratedDatabaseTestCase):
+    def question_count(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT question_count FROM exams WHERE id = %s", (self.exam_id,))
+            return cur.fetchone()[0]
+
+    def test_counts_follow_question_changes(self):
+        self.assertEqual(self.question_count(), 3)
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM questions WHERE id = %s", (self.question_ids[0],))
+            self.assertEqual(self.question_count(), 2)
+
+            cur.execute("INSERT INTO exams (name, teacher_username, duration) "
+                        "VALUES ('Other', 'teacher', 600) RETURNING id")
+            other_exam_id = cur.fetchone()[0]
+            cur.execute("UPDATE questions SET exam_id = %s WHERE id = %s", (other_exam_id, self.question_ids[1]))
+            cur.execute("UPDATE questions SET question_text = 'Edited' WHERE id = %s", (self.question_ids[2],))
+            self.assertEqual(self.question_count(), 1)
+            cur.execute("SELECT question_count FROM exams WHERE id = %s", (other_exam_id,))
+            self.assertEqual(cur.fetchone()[0], 1)
+
+class TestCreateExamWithQuestionsFunction(MigratedDatabaseTestCase):
+    exam = {'name': 'Bank', 'teacher_username': 'teacher', 'duration': 1800,
+            'exam_date': '2026-01-15', 'start_time': '09:00:00', 'end_time': '10:00:00'}
+
+    def create(self, questions):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT create_exam_with_questions(%s, %s)", (Json(self.exam), Json(questions)))
+            return cur.fetchone()[0]
+
+    def test_inserts_exam_and_questions_in_order(self):
+        questions = [{'question_text': f"Q{i}", 'option1': 'a', 'option2': 'b', 'option3': 'c',
+                      'option4': 'd', 'correct_answer': 'Option 2'} for i in range(200)]
+        exam_id = self.create(questions)
+
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT name, status, duration, start_time::text, question_count FROM exams WHERE id = %s",
+                        (exam_id,))
+            self.assertEqual(cur.fetchone(), ('Bank', 'active', 1800, '09:00:00', 200))
+            cur.execute("SELECT question_text FROM questions WHERE exam_id = %s ORDER BY id", (exam_id,))
+            self.assertEqual([row[0] for row in cur.fetchall()], [f"Q{i}" for i in range(200)])
+
+    def test_invalid_question_rolls_back_the_exam(self):
+        with self.assertRaises(psycopg2.Error):
+            self.create([{'question_text': 'Q', 'option1': 'a', 'option2': 'b', 'option3': 'c',
+                          'option4': 'd', 'correct_answer': 'Option 1'},
+                         {'question_text': 'Missing options'}])
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM exams WHERE name = 'Bank'")
+            self.assertEqual(cur.fetchone()[0], 0)
+
+class TestDeleteOrphanedDraftExamsFunction(MigratedDatabaseTestCase):
+    def add_exam(self, cur, status, age):
+        cur.execute("INSERT INTO exams (name, teacher_username, duration, status, created_at) "
+                    "VALUES ('Draft', 'teacher', 600, %s, CURRENT_TIMESTAMP - %s::interval) RETURNING id",
+                    (status, age))
+        exam_id = cur.fetchone()[0]
+        cur.execute("INSERT INTO questions (exam_id, question_text, option1, option2, option3, option4, "
+                    "correct_answer) VALUES (%s, 'Q', 'a', 'b', 'c', 'd', 'Option 1')", (exam_id,))
+        return exam_id
+
+    def test_deletes_only_old_unused_drafts(self):
+        with self.conn.cursor() as cur:
+            orphaned = self.add_exam(cur, 'draft', '3 days')
+            recent = self.add_exam(cur, 'draft', '1 hour')
+            active = self.add_exam(cur, 'active', '3 days')
+            taken = self.add_exam(cur, 'draft', '3 days')
+            cur.execute("INSERT INTO exam_results (student_username, exam_id, score) VALUES ('student', %s, 0)",
+                        (taken,))
+
+            cur.execute("SELECT delete_orphaned_draft_exams('24 hours')")
+            self.assertEqual(cur.fetchone()[0], 1)
+
+            cur.execute("SELECT id FROM exams WHERE id = ANY(%s) ORDER BY id", ([orphaned, recent, active, taken],))
+            self.assertEqual([row[0] for row in cur.fetchall()], [recent, active, taken])
+            cur.execute("SELECT COUNT(*) FROM questions WHERE exam_id = %s", (orphaned,))
+            self.assertEqual(cur.fetchone()[0], 0)
+
+    def test_only_the_service_role_may_delete(self):
+        with self.conn.cursor() as cur:
+            allowed = {}
+            for role in ('anon', 'authenticated', 'service_role'):
+                cur.execute("SELECT has_function_privilege(%s, 'delete_orphaned_draft_exams(interval)', 'EXECUTE')",
+                            (role,))
+                allowed[role] = cur.fetchone()[0]
+
+        self.assertEqual(allowed, {'anon': False, 'authenticated': False, 'service_role': True})
+
+class TestRecordAnswersWrapper(unittest.TestCase):
+    @patch('supabase_connection.create_connection')
+    def test_single_rpc_call(self, mock_create_connection):
+        mock_supabase = MagicMock()
+        mock_create_connection.return_value = mock_supabase
+        mock_supabase.rpc.return_value.execute.return_value.data = 2
+
+        score = supabase_connection.record_answers(7, 'divyansh', {1: 'a', 2: 'c'}, completed=True)
+
+        self.assertEqual(score, 2)
+        mock_supabase.table.assert_not_called()
+        mock_supabase.rpc.assert_called_once_with('record_answers', {
+            'p_exam_id': 7,
+            'p_student_username': 'divyansh',
+            'p_answers': [
+                {'question_id': 1, 'selected_answer': 'a'},
+                {'question_id': 2, 'selected_answer': 'c'}
+            ],
+            'p_completed': True
+        })
+
+    @patch('supabase_connection.create_connection')
+    def test_create_exam_with_questions_is_one_rpc_call(self, mock_create_connection):
+        mock_supabase = MagicMock()
+        mock_create_connection.return_value = mock_supabase
+        mock_supabase.rpc.return_value.execute.return_value.data = 12
+
+        exam_id = supabase_connection.create_exam_with_questions({'name': 'Bank'}, [{'question_text': 'Q'}])
+
+        self.assertEqual(exam_id, 12)
+        mock_supabase.table.assert_not_called()
+        mock_supabase.rpc.assert_called_once_with('create_exam_with_questions', {
+            'p_exam': {'name': 'Bank'},
+            'p_questions': [{'question_text': 'Q'}]
+        })
+
+    def test_is_missing_rpc_error(self):
+        missing = Exception("Could not find the function public.record_answers")
+        missing.code = 'PGRST202'
+        self.assertTrue(supabase_connection.is_missing_rpc_error(missing))
+        self.assertFalse(supabase_connection.is_missing_rpc_error(Exception("timed out")))
+
+if __name__ == '__main__':
+    unittest.main()
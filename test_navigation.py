@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+from PyQt6 import QtWidgets, QtCore, sip
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from navigation import NavigationManager
+
+
+def process_deletes():
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete.value)
+
+
+class TestNavigationManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    def setUp(self):
+        self.stack = QtWidgets.QStackedWidget()
+        self.navigation = NavigationManager(self.stack)
+        self.dashboard = QtWidgets.QWidget()
+        self.stack.addWidget(self.dashboard)
+        self.stack.setCurrentWidget(self.dashboard)
+        self.builds = 0
+        self.refreshes = 0
+
+    def build(self):
+        self.builds += 1
+        page = QtWidgets.QWidget()
+        QtWidgets.QVBoxLayout(page).addWidget(QtWidgets.QLabel("Results"))
+        return page
+
+    def refresh(self):
+        self.refreshes += 1
+
+    def test_subpage_is_reused(self):
+        for _ in range(5):
+            page = self.navigation.show_subpage(self.dashboard, 'results', self.build, self.refresh)
+            self.assertIs(self.stack.currentWidget(), page)
+            self.stack.setCurrentWidget(self.dashboard)
+
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(self.refreshes, 4)
+        self.assertEqual(self.stack.count(), 2)
+        self.assertEqual(self.navigation.counts()['subpages'], 1)
+
+    def test_transient_page_is_deleted_when_left(self):
+        for _ in range(3):
+            disclaimer = self.navigation.show_transient(QtWidgets.QWidget())
+            exam = self.navigation.show_transient(QtWidgets.QWidget())
+            self.assertEqual(self.stack.indexOf(disclaimer), -1)
+            self.stack.setCurrentWidget(self.dashboard)
+            self.assertEqual(self.stack.indexOf(exam), -1)
+
+        process_deletes()
+        self.assertTrue(sip.isdeleted(exam))
+        self.assertEqual(self.navigation.counts()['pages'], 1)
+        self.assertEqual(self.navigation.counts()['transient'], 0)
+
+    def test_removing_owner_removes_its_subpages(self):
+        results = self.navigation.show_subpage(self.dashboard, 'results', self.build)
+        login = QtWidgets.QWidget()
+        self.stack.addWidget(login)
+        self.stack.setCurrentWidget(login)
+
+        self.assertTrue(self.navigation.remove(self.dashboard))
+        self.assertEqual(self.stack.count(), 1)
+        process_deletes()
+        self.assertTrue(sip.isdeleted(results))
+        self.assertFalse(self.navigation.remove(QtWidgets.QWidget()))
+
+    def test_counts_widgets(self):
+        self.navigation.show_subpage(self.dashboard, 'results', self.build)
+        counts = self.navigation.counts()
+        self.assertEqual(counts['pages'], 2)
+        # Both pages and the label on the results page
+        self.assertGreaterEqual(counts['widgets'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import types
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import proctoring_loader
+from startup_importtime import parse_importtime, measure_imports
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       206 |        206 |   _io
+import time:       440 |       1156 | _frozen_importlib_external
+import time:       300 |        300 |     numpy.core
+import time:       500 |        800 |   numpy
+import time:       100 |        900 | gaze_detection
+some other stderr line
+"""
+
+
+class TestProctoringLoader(unittest.TestCase):
+    def setUp(self):
+        # A cheap stand-in for exam_taking_proctored
+        self.module = types.ModuleType('fake_proctoring_module')
+        sys.modules['fake_proctoring_module'] = self.module
+        proctoring_loader.load_seconds = None
+        proctoring_loader._prewarm_thread = None
+
+    def tearDown(self):
+        sys.modules.pop('fake_proctoring_module', None)
+        proctoring_loader.load_seconds = None
+        proctoring_loader._prewarm_thread = None
+
+    def test_prewarm_then_load_returns_module(self):
+        thread = proctoring_loader.prewarm_proctoring('fake_proctoring_module')
+        # A second call while the first is loading or loaded doesn't start another thread
+        self.assertIs(proctoring_loader.prewarm_proctoring('fake_proctoring_module'), thread)
+        thread.join(5)
+
+        self.assertIsNotNone(proctoring_loader.load_seconds)
+        self.assertIs(proctoring_loader.load_proctoring('fake_proctoring_module'), self.module)
+
+    def test_prewarm_failure_is_reported_on_load(self):
+        with self.assertLogs(level='WARNING'):
+            proctoring_loader.prewarm_proctoring('missing_proctoring_module').join(5)
+        with self.assertRaises(ImportError):
+            proctoring_loader.load_proctoring('missing_proctoring_module')
+
+    def test_parse_importtime(self):
+        total, times = parse_importtime(IMPORTTIME_OUTPUT)
+        self.assertEqual(total, 1156 + 900)
+        self.assertEqual(times['numpy'], 800)
+        self.assertEqual(times['gaze_detection'], 900)
+        self.assertNotIn('numpy.core', times)
+
+    def test_startup_does_not_import_proctoring_stack(self):
+        _, times = measure_imports(['main'])
+        self.assertIn('main', times)
+        for name in ('cv2', 'numpy', 'mediapipe', 'exam_taking_proctored'):
+            self.assertNotIn(name, times)
+
+
+if __name__ == '__main__':
+    unittest.main()
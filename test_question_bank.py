@@ -0,0 +1,157 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from question_bank import (parse_gift_question, parse_question_file, validate_question, resolve_correct_answer,
+                           export_questions, iter_exam_questions, insert_exam_in_chunks, save_exam_with_questions)
+
+GIFT = """// Week 1
+$CATEGORY: physics
+
+::Q1:: What is 2 + 2? {
+=4 # Right
+~3
+~5
+~22
+}
+
+Which symbol escapes \\{braces\\} in GIFT? {~/ =\\\\ ~\\# ~\\=}
+
+Capital of France? {=Paris ~London ~Rome}
+"""
+
+
+def stored_questions(count):
+    return [{'id': i, 'question_text': f"Question {i}, \"quoted\"", 'option1': 'a', 'option2': 'b=c',
+             'option3': 'd{e}', 'option4': 'f', 'correct_answer': f"Option {i % 4 + 1}"}
+            for i in range(1, count + 1)]
+
+
+def paged_supabase(rows):
+    """Client whose questions table serves rows to keyset-paginated queries"""
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value.eq.return_value
+
+    def page(after=None):
+        def limit(size):
+            result = MagicMock()
+            result.execute.return_value.data = [r for r in rows if after is None or r['id'] > after][:size]
+            return result
+        ordered = MagicMock()
+        ordered.limit.side_effect = limit
+        return ordered
+
+    query.order.side_effect = lambda column: page()
+    query.gt.side_effect = lambda column, after: MagicMock(order=lambda column: page(after))
+    return supabase
+
+
+class TestQuestionBank(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', newline='') as f:
+            f.write(text)
+        return path
+
+    def test_resolve_correct_answer(self):
+        options = ['red', 'green', 'blue', 'grey']
+        for value in ('Option 3', 'option 3', '3', 'C', 'c', 'blue'):
+            self.assertEqual(resolve_correct_answer(value, options), 'Option 3')
+        for value in ('', 'Option 5', 'E', 'purple', None):
+            self.assertIsNone(resolve_correct_answer(value, options))
+
+    def test_gift_questions(self):
+        path = self.write('bank.gift', GIFT)
+
+        questions, errors = parse_question_file(path)
+
+        self.assertEqual(questions[0], {'question_text': 'What is 2 + 2?', 'option1': '4', 'option2': '3',
+                                        'option3': '5', 'option4': '22', 'correct_answer': 'Option 1'})
+        self.assertEqual(questions[1]['question_text'], 'Which symbol escapes {braces} in GIFT?')
+        self.assertEqual([questions[1][f"option{i}"] for i in range(1, 5)], ['/', '\\', '#', '='])
+        self.assertEqual(questions[1]['correct_answer'], 'Option 2')
+        # Three answers only; reported by the line the question starts on
+        self.assertEqual(errors, [(13, "All options must be filled")])
+        self.assertIsNone(parse_gift_question("No answers here"))
+
+    def test_invalid_csv_rows_are_reported_by_line(self):
+        path = self.write('bank.csv', "question_text,option1,option2,option3,option4,correct_answer\n"
+                                      "Fine?,a,b,c,d,B\n"
+                                      ",a,b,c,d,A\n"
+                                      "Missing option?,a,b,,d,A\n"
+                                      "Unknown answer?,a,b,c,d,Z\n")
+
+        questions, errors = parse_question_file(path)
+
+        self.assertEqual([q['correct_answer'] for q in questions], ['Option 2'])
+        self.assertEqual([line for line, _ in errors], [3, 4, 5])
+        self.assertEqual(validate_question({'question_text': 'Q', 'option1': 'a', 'option2': 'b', 'option3': 'c',
+                                            'option4': 'd', 'option5': 'e', 'correct_answer': 'a'})[1],
+                         "Questions must have exactly 4 options")
+        with self.assertRaises(ValueError):
+            parse_question_file(self.write('bank.xlsx', ''))
+
+    def test_export_is_paginated_and_reads_back(self):
+        rows = stored_questions(7)
+        supabase = paged_supabase(rows)
+        self.assertEqual([row['id'] for row in iter_exam_questions(supabase, 1, page_size=3)], list(range(1, 8)))
+        # Pages of 3: ids 1-3, after 3, after 6
+        self.assertEqual([call.args for call in supabase.table.return_value.select.return_value.eq.return_value.gt.call_args_list],
+                         [('id', 3), ('id', 6)])
+
+        expected = [{field: row[field] for field in row if field != 'id'} for row in rows]
+        for name in ('bank.csv', 'bank.jsonl', 'bank.gift'):
+            path = os.path.join(self.tmp.name, name)
+            self.assertEqual(export_questions(paged_supabase(rows), 1, path, page_size=3), 7)
+            questions, errors = parse_question_file(path)
+            self.assertEqual(errors, [], name)
+            self.assertEqual(questions, expected, name)
+
+    def test_chunked_fallback(self):
+        supabase = MagicMock()
+        supabase.table.return_value.insert.return_value.execute.return_value.data = [{'id': 9}]
+        questions = [validate_question({'question_text': f"Q{i}", 'option1': 'a', 'option2': 'b',
+                                        'option3': 'c', 'option4': 'd', 'correct_answer': 'A'})[0]
+                     for i in range(5)]
+
+        with patch('question_bank.create_exam_with_questions', side_effect=Exception("PGRST202")), \
+             patch('question_bank.create_connection', return_value=supabase):
+            exam_id = save_exam_with_questions({'name': 'Quiz', 'status': 'active'}, questions)
+
+        self.assertEqual(exam_id, 9)
+        inserts = [call.args[0] for call in supabase.table.return_value.insert.call_args_list]
+        # The exam as a draft, then the questions
+        self.assertEqual(inserts[0], {'name': 'Quiz', 'status': 'draft'})
+        self.assertEqual([len(chunk) for chunk in inserts[1:]], [5])
+        self.assertTrue(all(q['exam_id'] == 9 for q in inserts[1]))
+        supabase.table.return_value.update.assert_called_once_with({'status': 'active'})
+
+        supabase.reset_mock()
+        supabase.table.return_value.update.return_value.eq.return_value.execute.side_effect = Exception("timeout")
+        with self.assertRaises(Exception):
+            insert_exam_in_chunks(supabase, {'name': 'Quiz'}, questions, chunk_size=2)
+        # One insert per chunk of two, then both tables are cleaned up
+        self.assertEqual(supabase.table.return_value.insert.call_count, 4)
+        self.assertEqual(supabase.table.return_value.delete.call_count, 2)
+
+    def test_other_rpc_errors_are_raised(self):
+        with patch('question_bank.create_exam_with_questions', side_effect=Exception("permission denied")), \
+             patch('question_bank.insert_exam_in_chunks') as fallback:
+            with self.assertRaises(Exception):
+                save_exam_with_questions({'name': 'Quiz'}, [])
+        fallback.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+import random
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1)
+        # A small alphabet so short and long queries both have matches
+        self.strings = [''.join(rng.choice('abcé_1') for _ in range(rng.randint(0, 8))) for _ in range(2000)]
+        self.strings += ['Alice', 'ÉCOLE', 'bob']
+        self.index = SearchIndex(self.strings)
+        self.queries = ['a', 'é', 'ab', 'abc', 'abca', 'cé_1a', '_1_1', 'ALI', 'école', 'zz', 'bobby']
+        self.queries += [''.join(rng.choice('abcé_1') for _ in range(rng.randint(1, 6))) for _ in range(200)]
+
+    def scan(self, query):
+        return [i for i, string in enumerate(self.strings) if query.lower() in string.lower()]
+
+    def test_find_matches_linear_scan(self):
+        for query in self.queries:
+            self.assertEqual(list(self.index.find(query)), self.scan(query), query)
+        self.assertIsNone(self.index.find(''))
+
+    def test_search_narrows_as_query_grows(self):
+        for query in self.queries[:20]:
+            for end in range(1, len(query) + 1):
+                self.assertEqual(list(self.index.search(query[:end])), self.scan(query[:end]), query[:end])
+            # Deleting characters goes back to a full lookup
+            self.assertEqual(list(self.index.search(query[:1])), self.scan(query[:1]))
+
+    def test_empty_index(self):
+        self.assertEqual(len(SearchIndex([]).find('a')), 0)
+        self.assertEqual(len(SearchIndex(['']).search('abc')), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
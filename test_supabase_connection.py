@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import supabase_connection
+from supabase_connection import create_connection, reset_connection
+
+
+def fake_client(url, key):
+    return supabase_connection._PooledClient(MagicMock(name='client'), None)
+
+
+@patch.dict(os.environ, {'SUPABASE_URL': 'https://example.supabase.co', 'SUPABASE_KEY': 'key'})
+@patch('supabase_connection._open_client', side_effect=fake_client)
+class TestCreateConnection(unittest.TestCase):
+    def tearDown(self):
+        reset_connection()
+
+    def make_idle(self):
+        for pooled in supabase_connection._clients.values():
+            pooled.last_used -= supabase_connection.HEALTH_CHECK_INTERVAL + 1
+
+    def test_health_check_does_not_block_other_callers(self, open_client):
+        client = create_connection()
+        self.make_idle()
+        checking = threading.Event()
+        release = threading.Event()
+
+        def slow_check(checked):
+            checking.set()
+            release.wait(5)
+            return True
+
+        with patch('supabase_connection._is_healthy', side_effect=slow_check):
+            checker = threading.Thread(target=create_connection)
+            checker.start()
+            self.assertTrue(checking.wait(5))
+            # Another thread gets the client while the check is still running
+            other = []
+            caller = threading.Thread(target=lambda: other.append(create_connection()))
+            caller.start()
+            caller.join(1)
+            finished_during_check = not caller.is_alive()
+            release.set()
+            caller.join(5)
+            checker.join(5)
+
+        self.assertTrue(finished_during_check)
+        self.assertEqual(other, [client])
+        self.assertEqual(open_client.call_count, 1)
+
+    def test_failed_health_check_reopens_the_client(self, open_client):
+        client = create_connection()
+        self.make_idle()
+
+        with patch('supabase_connection._is_healthy', return_value=False):
+            reopened = create_connection()
+
+        self.assertIsNot(reopened, client)
+        self.assertIs(create_connection(), reopened)
+        self.assertEqual(open_client.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
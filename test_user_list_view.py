@@ -0,0 +1,170 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+from PyQt6 import QtWidgets, QtCore
+from PyQt6.QtTest import QTest
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import DataLoader
+from search_index import SearchIndex
+from user_list_view import UserListView, UserListPager, CARD_HEIGHT
+
+
+class TestUserListView(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    def setUp(self):
+        self.users = [{'username': f"student{i:05d}"} for i in range(20000)]
+        self.users.append({'username': 'Alice'})
+        self.view = UserListView(self.users)
+        self.view.resize(600, 10 * CARD_HEIGHT)
+        self.view.show()
+        QTest.qWaitForWindowExposed(self.view)
+
+    def tearDown(self):
+        self.view.close()
+
+    def test_no_widgets_per_user(self):
+        self.assertEqual(self.view.visible_count(), 20001)
+        self.assertLess(len(self.view.findChildren(QtWidgets.QWidget)), 20)
+
+    def test_filter_ignores_case(self):
+        self.view.set_filter('ALI')
+        self.assertEqual(self.view.visible_count(), 1)
+        self.assertEqual(self.view.model().index(0, 0).data(), 'Alice')
+
+        self.view.set_filter('student1999')
+        self.assertEqual(self.view.visible_count(), 10)
+        self.view.set_filter('')
+        self.assertEqual(self.view.visible_count(), 20001)
+
+    def test_button_clicks_emit_user(self):
+        edited, removed = [], []
+        self.view.edit_requested.connect(edited.append)
+        self.view.remove_requested.connect(removed.append)
+        self.view.set_filter('student00001')
+
+        rect = self.view.visualRect(self.view.model().index(0, 0))
+        edit_rect, remove_rect = self.view.delegate.button_rects(rect)
+        QTest.mouseClick(self.view.viewport(), QtCore.Qt.MouseButton.LeftButton, pos=edit_rect.center())
+        QTest.mouseClick(self.view.viewport(), QtCore.Qt.MouseButton.LeftButton, pos=remove_rect.center())
+        # Clicking the card outside the buttons does nothing
+        QTest.mouseClick(self.view.viewport(), QtCore.Qt.MouseButton.LeftButton, pos=rect.topLeft() + QtCore.QPoint(20, 20))
+
+        self.assertEqual(edited, [{'username': 'student00001'}])
+        self.assertEqual(removed, [{'username': 'student00001'}])
+
+    def test_set_users_replaces_rows(self):
+        self.view.set_users([{'username': 'bob'}])
+        self.assertEqual(self.view.visible_count(), 1)
+
+    def test_appended_users_are_filtered(self):
+        self.view.set_filter('ali')
+        with patch('search_index.SearchIndex', side_effect=SearchIndex) as build:
+            self.view.user_model.append_users([{'username': 'bob'}, {'username': 'Khalid'}])
+            self.view.user_model.append_users([{'username': 'alina'}])
+            # The pages are checked on their own, without rebuilding the index
+            build.assert_not_called()
+            self.view.set_filter('alin')
+            self.view.set_filter('ali')
+            self.assertEqual(build.call_count, 1)
+
+        model = self.view.model()
+        self.assertEqual([model.index(row, 0).data() for row in range(model.rowCount())], ['Alice', 'Khalid', 'alina'])
+        source_index = self.view.user_model.index(20002, 0)
+        self.assertEqual(model.mapFromSource(source_index).row(), 1)
+        # Rows hidden by the filter have no proxy index
+        self.assertFalse(model.mapFromSource(self.view.user_model.index(20001, 0)).isValid())
+
+
+class TestUserListPager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    def setUp(self):
+        self.usernames = sorted(f"user{i:04d}" for i in range(250))
+        self.calls = []
+        self.loader = DataLoader()
+        self.view = UserListView()
+        self.view.resize(600, 10 * CARD_HEIGHT)
+        self.pager = UserListPager(self.view, self.loader, self.fetch_page, page_size=50, debounce_ms=0)
+        self.counts = []
+        self.pager.count_changed.connect(self.counts.append)
+        self.view.show()
+        QTest.qWaitForWindowExposed(self.view)
+
+    def tearDown(self):
+        self.loader.cancel_all()
+        self.loader.wait()
+        self.view.close()
+
+    def fetch_page(self, search, after, limit):
+        """Stands in for fetch_users_page() over self.usernames"""
+        self.calls.append((search, after))
+        matches = [u for u in self.usernames if search in u and (after is None or u > after)]
+        return [{'username': u} for u in matches[:limit]], len(matches) if after is None else None
+
+    def usernames_shown(self):
+        return [user['username'] for user in self.view.user_model.users]
+
+    def test_scrolling_near_the_end_fetches_next_page(self):
+        self.pager.show_first_page(self.fetch_page('', None, 50))
+        self.assertEqual(self.counts, [250])
+
+        # Scrolling within the first rows doesn't fetch anything
+        self.view.verticalScrollBar().setValue(CARD_HEIGHT)
+        self.loader.wait()
+        self.assertEqual(len(self.usernames_shown()), 50)
+
+        while self.view.user_model.has_more:
+            scroll_bar = self.view.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum())
+            self.loader.wait()
+
+        self.assertEqual(self.usernames_shown(), self.usernames)
+        # Each page starts after the last username of the one before; the
+        # last page was full, so one more (empty) page was asked for
+        self.assertEqual([after for _, after in self.calls[1:]],
+                         ['user0049', 'user0099', 'user0149', 'user0199', 'user0249'])
+
+    def test_search_is_debounced(self):
+        self.pager.show_first_page(self.fetch_page('', None, 50))
+        self.calls.clear()
+        for text in ('u', 'us', 'user01 '):
+            self.pager.search(text)
+        QTest.qWait(20)
+        self.loader.wait()
+
+        self.assertEqual(self.calls, [('user01', None)])
+        self.assertEqual(len(self.usernames_shown()), 50)
+        self.assertTrue(self.view.user_model.has_more)
+        self.assertEqual(self.counts[-1], 100)
+
+    def test_next_page_keeps_its_search_until_the_new_one_starts(self):
+        self.pager.show_first_page(self.fetch_page('', None, 50))
+        self.pager.search_timer.setInterval(60000)
+        self.pager.search('user01')
+
+        # Scrolled to the end while the search is still waiting to run
+        QtWidgets.QApplication.processEvents()
+        scroll_bar = self.view.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
+        self.loader.wait()
+        self.assertEqual(self.calls[-1], ('', 'user0049'))
+        self.assertEqual(len(self.usernames_shown()), 100)
+
+        self.pager.reload()
+        self.loader.wait()
+        self.assertEqual(self.calls[-1], ('user01', None))
+        self.assertEqual(self.usernames_shown()[0], 'user0100')
+        self.assertEqual(self.pager.search_text, 'user01')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,366 @@
+import bisect
+import functools
+import logging
+from PyQt6 import QtWidgets, QtCore, QtGui
+
+# Height of one user card; every row is the same so the view can lay out
+# and scroll without measuring rows
+CARD_HEIGHT = 64
+CARD_MARGIN = 5
+BUTTON_WIDTH = 80
+BUTTON_HEIGHT = 32
+BUTTON_SPACING = 10
+
+# Wait this long after the last keystroke before searching
+SEARCH_DEBOUNCE_MS = 300
+# Fetch the next page once the list is scrolled within this many rows of its end
+PREFETCH_ROWS = 10
+
+UserRole = QtCore.Qt.ItemDataRole.UserRole
+
+
+class UserListModel(QtCore.QAbstractListModel):
+    """
+    Users shown in an admin list, one row per user dict (at least a
+    'username' key). When more pages are available on the server,
+    fetchMore() emits more_requested and the pages are added with
+    append_users().
+    """
+    more_requested = QtCore.pyqtSignal()
+
+    def __init__(self, users=None, parent=None):
+        super().__init__(parent)
+        self.users = list(users or [])
+        self.has_more = False
+        self.loading = False  # A page is being fetched
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.users)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        user = self.users[index.row()]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return user['username']
+        if role == UserRole:
+            return user
+        return None
+
+    def set_users(self, users, has_more=False):
+        self.beginResetModel()
+        self.users = list(users)
+        self.has_more = has_more
+        self.loading = False
+        self.endResetModel()
+
+    def append_users(self, users, has_more=False):
+        if users:
+            self.beginInsertRows(QtCore.QModelIndex(), len(self.users), len(self.users) + len(users) - 1)
+            self.users.extend(users)
+            self.endInsertRows()
+        self.has_more = has_more
+        self.loading = False
+
+    def usernames(self):
+        return [user['username'] for user in self.users]
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and self.has_more and not self.loading
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if self.canFetchMore(parent):
+            self.loading = True
+            self.more_requested.emit()
+
+
+class UserSearchProxyModel(QtCore.QAbstractProxyModel):
+    """
+    Shows the rows of a UserListModel whose username contains the query,
+    ignoring case. Matches come from a SearchIndex built on the first
+    search after users are loaded, so a keystroke costs an index lookup
+    rather than a pass over every row, and growing the query narrows the
+    previous matches. Pages appended while a query is active are checked
+    on their own; the index is rebuilt once, when the query next changes.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.query = ''
+        self.search_index = None  # Built on first use after the users change
+        self.matches = range(0)  # Source rows shown, ascending
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_source_reset)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        self._on_source_reset()
+
+    def set_query(self, query):
+        self.beginResetModel()
+        self.query = query
+        self.matches = self._match()
+        self.endResetModel()
+
+    def _match(self):
+        """Source rows matching the query"""
+        if not self.query:
+            return range(self.sourceModel().rowCount())
+        if self.search_index is None:
+            # Imported here because it needs NumPy, which the app doesn't load at startup
+            from search_index import SearchIndex
+            self.search_index = SearchIndex(self.sourceModel().usernames())
+        return self.search_index.search(self.query)
+
+    def _on_source_reset(self):
+        self.search_index = None
+        self.matches = self._match()
+        self.endResetModel()
+
+    def _on_rows_inserted(self, parent, first, last):
+        # Users are only appended; rows matching the query go at the end
+        self.search_index = None
+        if not self.query:
+            self.beginInsertRows(QtCore.QModelIndex(), first, last)
+            self.matches = self._match()
+            self.endInsertRows()
+            return
+
+        # Check just the new rows, the same way the index matches
+        import numpy as np
+        query = self.query.lower()
+        users = self.sourceModel().users
+        new_matches = np.array([row for row in range(first, last + 1)
+                                if query in users[row]['username'].lower()], dtype=np.int64)
+        if len(new_matches):
+            self.beginInsertRows(QtCore.QModelIndex(), len(self.matches), len(self.matches) + len(new_matches) - 1)
+            self.matches = np.concatenate((self.matches, new_matches))
+            self.endInsertRows()
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if parent.isValid() or column != 0 or not 0 <= row < len(self.matches):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QtCore.QModelIndex()):
+        return QtCore.QModelIndex()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.matches)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QtCore.QModelIndex()
+        return self.sourceModel().index(int(self.matches[proxy_index.row()]), 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QtCore.QModelIndex()
+        row = bisect.bisect_left(self.matches, source_index.row())
+        if row < len(self.matches) and self.matches[row] == source_index.row():
+            return self.index(row, 0)
+        return QtCore.QModelIndex()
+
+
+class UserCardDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints a user row as a card with Edit and Remove buttons. Only rows in
+    view are painted, and no widgets are created per row.
+    """
+    edit_clicked = QtCore.pyqtSignal(dict)
+    remove_clicked = QtCore.pyqtSignal(dict)
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(option.rect.width(), CARD_HEIGHT)
+
+    def button_rects(self, rect):
+        """Returns the (edit, remove) button rectangles of the card in rect"""
+        card = rect.adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN)
+        top = card.top() + (card.height() - BUTTON_HEIGHT) // 2
+        remove = QtCore.QRect(card.right() - 15 - BUTTON_WIDTH, top, BUTTON_WIDTH, BUTTON_HEIGHT)
+        edit = remove.translated(-(BUTTON_WIDTH + BUTTON_SPACING), 0)
+        return edit, remove
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        hovered = bool(option.state & QtWidgets.QStyle.StateFlag.State_MouseOver)
+
+        # Card
+        card = QtCore.QRectF(option.rect.adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN))
+        painter.setPen(QtGui.QPen(QtGui.QColor("#E0E0E0")))
+        painter.setBrush(QtGui.QColor("#F5F5F5" if hovered else "white"))
+        painter.drawRoundedRect(card, 10, 10)
+
+        # Username
+        font = QtGui.QFont(option.font)
+        font.setPixelSize(16)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor("#333"))
+        edit_rect, remove_rect = self.button_rects(option.rect)
+        text_rect = QtCore.QRect(int(card.left()) + 15, int(card.top()),
+                                 edit_rect.left() - int(card.left()) - 25, int(card.height()))
+        text = painter.fontMetrics().elidedText(f"Username: {index.data()}",
+                                                QtCore.Qt.TextElideMode.ElideRight, text_rect.width())
+        painter.drawText(text_rect, QtCore.Qt.AlignmentFlag.AlignVCenter, text)
+
+        # Buttons, matching the secondary and red remove button styles
+        font.setPixelSize(14)
+        painter.setFont(font)
+        painter.setPen(QtGui.QPen(QtGui.QColor("#6C63FF")))
+        painter.setBrush(QtGui.QColor("#FFFFFF"))
+        painter.drawRoundedRect(QtCore.QRectF(edit_rect), 5, 5)
+        painter.drawText(edit_rect, QtCore.Qt.AlignmentFlag.AlignCenter, "Edit")
+
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        painter.setBrush(QtGui.QColor("#FF5252"))
+        painter.drawRoundedRect(QtCore.QRectF(remove_rect), 4, 4)
+        painter.setPen(QtGui.QColor("white"))
+        painter.drawText(remove_rect, QtCore.Qt.AlignmentFlag.AlignCenter, "Remove")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QtCore.QEvent.Type.MouseButtonRelease
+                and event.button() == QtCore.Qt.MouseButton.LeftButton):
+            edit_rect, remove_rect = self.button_rects(option.rect)
+            position = event.position().toPoint()
+            if edit_rect.contains(position):
+                self.edit_clicked.emit(index.data(UserRole))
+                return True
+            if remove_rect.contains(position):
+                self.remove_clicked.emit(index.data(UserRole))
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class UserListView(QtWidgets.QListView):
+    """
+    Scrollable list of user cards for the admin dashboard, backed by a
+    UserListModel. Loaded rows are filtered instantly through a
+    UserSearchProxyModel, and rows can be loaded from the server page by
+    page with a UserListPager. Neither scrolling nor searching creates
+    widgets per user.
+    """
+    edit_requested = QtCore.pyqtSignal(dict)
+    remove_requested = QtCore.pyqtSignal(dict)
+
+    def __init__(self, users=None, parent=None):
+        super().__init__(parent)
+        self.user_model = UserListModel(users, self)
+        self.proxy_model = UserSearchProxyModel(self)
+        self.proxy_model.setSourceModel(self.user_model)
+        self.setModel(self.proxy_model)
+
+        self.delegate = UserCardDelegate(self)
+        self.delegate.edit_clicked.connect(self.edit_requested)
+        self.delegate.remove_clicked.connect(self.remove_requested)
+        self.setItemDelegate(self.delegate)
+
+        # Rows are all CARD_HEIGHT tall, so layout doesn't need to measure them
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.setMouseTracking(True)  # For the hover highlight
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
+
+    def set_users(self, users, has_more=False):
+        self.user_model.set_users(users, has_more)
+
+    def set_filter(self, text):
+        """Shows only users whose username contains text, ignoring case"""
+        self.proxy_model.set_query(text.strip())
+
+    def visible_count(self):
+        """Returns how many users pass the filter"""
+        return self.proxy_model.rowCount()
+
+
+class UserListPager(QtCore.QObject):
+    """
+    Fills a UserListView from a paginated server-side query.
+
+    fetch_page(search, after, limit) runs on a DataLoader worker thread and
+    returns (users, estimated count or None) for up to limit users matching
+    search whose username sorts after `after`. Searching is debounced, and
+    because every load is owned by the view a new search cancels the one
+    still in flight. The next page is fetched when the list is scrolled
+    near its end.
+    """
+    count_changed = QtCore.pyqtSignal(object)  # Estimated matches for search_text, or None
+
+    def __init__(self, view, data_loader, fetch_page, page_size, debounce_ms=SEARCH_DEBOUNCE_MS):
+        super().__init__(view)
+        self.view = view
+        self.data_loader = data_loader
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.search_text = ''  # Search the loaded pages belong to
+        self.pending_search_text = ''  # Typed, searched for once the debounce timer fires
+
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(debounce_ms)
+        self.search_timer.timeout.connect(self.reload)
+
+        view.user_model.more_requested.connect(self.load_next_page)
+        view.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    def show_first_page(self, result):
+        """Shows a first page, e.g. one fetched by the page's initial load"""
+        users, count = result
+        self.view.set_users(users, has_more=len(users) >= self.page_size)
+        self.count_changed.emit(count)
+
+    def search(self, text):
+        """Searches for text once typing pauses"""
+        # Next pages of the results shown keep using their own search until then
+        self.pending_search_text = text.strip()
+        self.search_timer.start()
+
+    def reload(self):
+        """Fetches the first page for the latest search"""
+        self.search_timer.stop()
+        self.search_text = self.pending_search_text
+        # Starts again from the first page; no next pages of the old results
+        self.view.user_model.loading = True
+        self.data_loader.load(
+            self.view,
+            functools.partial(self.fetch_page, self.search_text, None, self.page_size),
+            self._on_first_page,
+            self._on_error
+        )
+
+    def load_next_page(self):
+        model = self.view.user_model
+        model.loading = True
+        after = model.users[-1]['username'] if model.users else None
+        self.data_loader.load(
+            self.view,
+            functools.partial(self.fetch_page, self.search_text, after, self.page_size),
+            self._on_next_page,
+            self._on_error
+        )
+
+    def _on_first_page(self, result):
+        self.show_first_page(result)
+        self.view.scrollToTop()
+
+    def _on_next_page(self, result):
+        users, _ = result
+        self.view.user_model.append_users(users, has_more=len(users) >= self.page_size)
+
+    def _on_error(self, error):
+        # Scrolling again retries
+        logging.error(f"Failed to load users: {error}")
+        self.view.user_model.loading = False
+
+    def _on_scrolled(self, value):
+        scroll_bar = self.view.verticalScrollBar()
+        if scroll_bar.maximum() - value <= PREFETCH_ROWS * CARD_HEIGHT:
+            self.view.user_model.fetchMore()